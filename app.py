@@ -8,9 +8,10 @@ import logging
 import streamlit as st
 from dotenv import load_dotenv
 
-from src.document_loader import DocumentLoader
 from src.vector_store import VectorStoreManager
 from src.rag_chain import ConversationalRAGChain
+from src.answer_cache import AnswerCache
+from src.metrics import start_metrics_server
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -108,97 +109,141 @@ def initialize_session_state():
     
     if "selected_question" not in st.session_state:
         st.session_state.selected_question = None
+    
+    # 세션별 대화 히스토리 (공유 RAG 엔진에 호출마다 전달)
+    if "conversation_history" not in st.session_state:
+        st.session_state.conversation_history = []
+
+
+@st.cache_resource(show_spinner="RAG 시스템을 초기화하는 중...")
+def load_rag_engine(use_cloud: bool, model_name: str) -> ConversationalRAGChain:
+    """
+    프로세스 전체에서 공유하는 RAG 엔진을 생성합니다.
+    
+    세션마다 새로 만들지 않고 ChromaDB 클라이언트, 임베딩, LLM 클라이언트를 모든 세션이
+    함께 사용합니다. 대화 히스토리는 세션 상태에 두고 호출마다 전달합니다.
+    실패 시 예외가 발생하며, 실패한 결과는 캐시되지 않습니다.
+    """
+    if use_cloud:
+        # 벡터 스토어 관리자 초기화 (ChromaDB Cloud)
+        vs_manager = VectorStoreManager(
+            chunk_strategy=get_env("CHUNK_STRATEGY", "regulation"),
+            chunk_tokens=1000,
+            chunk_overlap_percent=10.0,  # 더 많은 오버랩 (4% -> 10%)
+            use_cloud=True,
+            cloud_api_key=get_env("CHROMA_API_KEY"),
+            cloud_tenant=get_env("CHROMA_TENANT"),
+            cloud_database=get_env("CHROMA_DATABASE"),
+            collection_name=get_env("CHROMA_COLLECTION", "niceinfo-rules"),
+            embedding_provider=get_env("EMBEDDING_PROVIDER", "openai"),
+            embedding_model=get_env("EMBEDDING_MODEL")
+        )
+    else:
+        # 벡터 스토어 관리자 초기화 (로컬)
+        vs_manager = VectorStoreManager(
+            persist_directory="./chroma_db",
+            chunk_strategy=get_env("CHUNK_STRATEGY", "regulation"),
+            chunk_tokens=1000,
+            chunk_overlap_percent=10.0,  # 더 많은 오버랩 (4% -> 10%)
+            use_cloud=False,
+            embedding_provider=get_env("EMBEDDING_PROVIDER", "openai"),
+            embedding_model=get_env("EMBEDDING_MODEL"),
+            vector_backend=get_env("VECTOR_BACKEND", "chroma"),
+            vector_index=get_env("VECTOR_INDEX", "flat")
+        )
+    
+    # 기존 벡터 스토어 로드
+    vs_manager.load_vectorstore()
+    logger.info("벡터 스토어를 로드했습니다. (프로세스 공유)")
+    
+    # 답변 캐시 초기화 (인덱스가 바뀌면 자동으로 무효화)
+    answer_cache = AnswerCache(
+        path="./answer_cache.db",
+        index_version=vs_manager.get_index_version()
+    )
+    
+    # Prometheus 지표 서버 (METRICS_PORT를 지정한 경우에만, 프로세스당 한 번)
+    metrics_port = get_env("METRICS_PORT")
+    if metrics_port:
+        start_metrics_server(port=int(metrics_port), host=get_env("METRICS_HOST", "127.0.0.1"))
+    
+    # RAG 체인 초기화
+    return ConversationalRAGChain(
+        vector_store_manager=vs_manager,
+        model_name=model_name,
+        temperature=0,
+        similarity_threshold=1.2,  # 더 관대하게 (0.5 -> 1.2)
+        top_k=6,  # 더 많은 컨텍스트 (4 -> 6)
+        answer_cache=answer_cache
+    )
 
 
 def initialize_rag_system():
     """RAG 시스템 초기화"""
+    # API 키 확인
+    if not get_env("OPENAI_API_KEY"):
+        st.error("⚠️ OPENAI_API_KEY가 설정되지 않았습니다. .env 파일 또는 Streamlit Secrets를 확인하세요.")
+        st.stop()
+    
+    # ChromaDB Cloud 설정 확인
+    use_cloud = get_env("CHROMA_API_KEY") is not None
+    
+    if not use_cloud and not Path("./chroma_db").exists():
+        # 로컬 ChromaDB가 없는 경우
+        st.error("❌ 벡터 데이터베이스를 찾을 수 없습니다.")
+        st.warning("⚠️ 먼저 문서를 인덱싱해야 합니다!")
+        st.info("💡 다음 명령어를 실행하세요:")
+        st.code("python setup_db.py", language="bash")
+        st.stop()
+    
     try:
-        with st.spinner("RAG 시스템을 초기화하는 중..."):
-            # API 키 확인
-            if not get_env("OPENAI_API_KEY"):
-                st.error("⚠️ OPENAI_API_KEY가 설정되지 않았습니다. .env 파일 또는 Streamlit Secrets를 확인하세요.")
-                st.stop()
-            
-            # ChromaDB Cloud 설정 확인
-            use_cloud = get_env("CHROMA_API_KEY") is not None
-            
-            if use_cloud:
-                # st.info("🌐 ChromaDB Cloud를 사용합니다.")
-                # 벡터 스토어 관리자 초기화 (ChromaDB Cloud)
-                vs_manager = VectorStoreManager(
-                    chunk_size=1500,  # 더 큰 청크로 변경 (1000 -> 1500)
-                    chunk_overlap_percent=10.0,  # 더 많은 오버랩 (4% -> 10%)
-                    use_cloud=True,
-                    cloud_api_key=get_env("CHROMA_API_KEY"),
-                    cloud_tenant=get_env("CHROMA_TENANT"),
-                    cloud_database=get_env("CHROMA_DATABASE"),
-                    collection_name=get_env("CHROMA_COLLECTION", "niceinfo-rules")
-                )
-            else:
-                # st.info("💻 로컬 ChromaDB를 사용합니다.")
-                # 벡터 스토어 관리자 초기화 (로컬)
-                vs_manager = VectorStoreManager(
-                    persist_directory="./chroma_db",
-                    chunk_size=1500,  # 더 큰 청크로 변경 (1000 -> 1500)
-                    chunk_overlap_percent=10.0,  # 더 많은 오버랩 (4% -> 10%)
-                    use_cloud=False
-                )
-            
-            # 기존 벡터 스토어 로드 시도
-            if use_cloud:
-                # ChromaDB Cloud에서 로드
-                try:
-                    vs_manager.load_vectorstore()
-                    st.session_state.vectorstore_loaded = True
-                    logger.info("ChromaDB Cloud에서 벡터 스토어를 로드했습니다.")
-                    # st.success("✅ ChromaDB Cloud에서 데이터를 로드했습니다!")
-                except Exception as e:
-                    logger.error(f"벡터 스토어 로드 실패: {e}")
-                    st.error(f"❌ ChromaDB Cloud에서 데이터를 로드할 수 없습니다.")
-                    st.error(f"오류: {str(e)}")
-                    st.warning("⚠️ 먼저 문서를 업로드해야 합니다!")
-                    st.info("💡 다음 명령어를 실행하세요:")
-                    st.code("python upload_to_chromadb.py", language="bash")
-                    st.stop()
-            elif Path("./chroma_db").exists():
-                # 로컬 ChromaDB 로드
-                try:
-                    vs_manager.load_vectorstore()
-                    st.session_state.vectorstore_loaded = True
-                    logger.info("로컬 벡터 스토어를 로드했습니다.")
-                    st.success("✅ 로컬 ChromaDB에서 데이터를 로드했습니다!")
-                except Exception as e:
-                    logger.error(f"벡터 스토어 로드 실패: {e}")
-                    st.error(f"❌ 로컬 ChromaDB에서 데이터를 로드할 수 없습니다.")
-                    st.warning("⚠️ 먼저 문서를 인덱싱해야 합니다!")
-                    st.info("💡 다음 명령어를 실행하세요:")
-                    st.code("python setup_db.py", language="bash")
-                    st.stop()
-            else:
-                # 로컬 ChromaDB가 없는 경우
-                st.error("❌ 벡터 데이터베이스를 찾을 수 없습니다.")
-                st.warning("⚠️ 먼저 문서를 인덱싱해야 합니다!")
-                st.info("💡 다음 명령어를 실행하세요:")
-                st.code("python setup_db.py", language="bash")
-                st.stop()
-            
-            # RAG 체인 초기화
-            rag_chain = ConversationalRAGChain(
-                vector_store_manager=vs_manager,
-                model_name=get_env("OPENAI_MODEL", "gpt-4-turbo-preview"),
-                temperature=0,
-                similarity_threshold=1.2,  # 더 관대하게 (0.5 -> 1.2)
-                top_k=6  # 더 많은 컨텍스트 (4 -> 6)
-            )
-            
-            st.session_state.rag_chain = rag_chain
-            
-            return True
-            
+        rag_chain = load_rag_engine(
+            use_cloud=use_cloud,
+            model_name=get_env("OPENAI_MODEL", "gpt-4-turbo-preview")
+        )
     except Exception as e:
-        st.error(f"❌ 초기화 중 오류 발생: {str(e)}")
-        logger.error(f"초기화 오류: {e}", exc_info=True)
-        return False
+        logger.error(f"벡터 스토어 로드 실패: {e}", exc_info=True)
+        if use_cloud:
+            st.error(f"❌ ChromaDB Cloud에서 데이터를 로드할 수 없습니다.")
+            st.error(f"오류: {str(e)}")
+            st.warning("⚠️ 먼저 문서를 업로드해야 합니다!")
+            st.info("💡 다음 명령어를 실행하세요:")
+            st.code("python upload_to_chromadb.py", language="bash")
+        else:
+            st.error(f"❌ 로컬 ChromaDB에서 데이터를 로드할 수 없습니다.")
+            st.warning("⚠️ 먼저 문서를 인덱싱해야 합니다!")
+            st.info("💡 다음 명령어를 실행하세요:")
+            st.code("python setup_db.py", language="bash")
+        st.stop()
+    
+    st.session_state.rag_chain = rag_chain
+    st.session_state.vectorstore_loaded = True
+    if not use_cloud:
+        st.success("✅ 로컬 ChromaDB에서 데이터를 로드했습니다!")
+    
+    return True
+
+
+def assistant_message_html(content: str) -> str:
+    """어시스턴트 메시지 HTML"""
+    return f"""
+        <div class="chat-message assistant-message">
+            <strong>🤖 AI 어시스턴트:</strong><br>
+            {content}
+        </div>
+        """
+
+
+def display_sources(sources: list):
+    """출처 표시"""
+    if sources and st.session_state.show_sources:
+        with st.expander("📄 참고 문서 보기", expanded=False):
+            for i, source in enumerate(sources, 1):
+                st.markdown(f"""
+                **{i}. {source['filename']}**{f" (p.{source['page']})" if source.get('page') else ""}{f" {source['article']}" if source.get('article') else ""} (카테고리: {source['category']})
+                
+                *미리보기:* {source['content_preview']}
+                """)
 
 
 def display_message(role: str, content: str, sources: list = None):
@@ -211,22 +256,93 @@ def display_message(role: str, content: str, sources: list = None):
         </div>
         """, unsafe_allow_html=True)
     else:
-        st.markdown(f"""
-        <div class="chat-message assistant-message">
-            <strong>🤖 AI 어시스턴트:</strong><br>
-            {content}
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(assistant_message_html(content), unsafe_allow_html=True)
         
         # 출처 표시
-        if sources and st.session_state.show_sources:
-            with st.expander("📄 참고 문서 보기", expanded=False):
-                for i, source in enumerate(sources, 1):
-                    st.markdown(f"""
-                    **{i}. {source['filename']}** (카테고리: {source['category']})
-                    
-                    *미리보기:* {source['content_preview']}
-                    """)
+        display_sources(sources)
+
+
+def display_streaming_answer(result: dict) -> str:
+    """
+    답변을 토큰 단위로 표시합니다.
+    
+    범위 밖 여부와 출처는 검색 직후 바로 표시하고, 답변은 도착하는 대로 이어 씁니다.
+    
+    Returns:
+        전체 답변 문자열
+    """
+    answer_placeholder = st.empty()
+    answer_placeholder.markdown(assistant_message_html("▌"), unsafe_allow_html=True)
+    
+    # 범위 밖 경고
+    if result["is_out_of_scope"]:
+        st.warning("⚠️ 이 질문은 제공된 문서 범위를 벗어납니다.")
+    
+    display_sources(result["sources"])
+    
+    answer = ""
+    stream = result["answer_stream"]
+    try:
+        for token in stream:
+            answer += token
+            answer_placeholder.markdown(assistant_message_html(answer + "▌"), unsafe_allow_html=True)
+    finally:
+        # 중지/재실행으로 중단되면 스트림을 바로 닫아 중단된 답변으로 기록
+        close = getattr(stream, "close", None)
+        if close:
+            close()
+    
+    answer_placeholder.markdown(assistant_message_html(answer), unsafe_allow_html=True)
+    return answer
+
+
+def answer_question(prompt: str):
+    """사용자 질문을 처리하고 답변을 스트리밍으로 표시합니다."""
+    # 사용자 메시지 추가
+    st.session_state.messages.append({
+        "role": "user",
+        "content": prompt
+    })
+    display_message("user", prompt)
+    
+    # AI 응답 생성
+    try:
+        with st.spinner("관련 문서를 검색하는 중..."):
+            result = st.session_state.rag_chain.query_with_history_stream(
+                prompt,
+                history=st.session_state.conversation_history
+            )
+        
+        answer = display_streaming_answer(result)
+        logger.info(f"질의 단계별 소요 시간(ms): {result.get('timings')}, 토큰: {result.get('tokens')}")
+        
+        # 세션 대화 히스토리에 추가
+        st.session_state.conversation_history.append({
+            "question": prompt,
+            "answer": answer
+        })
+        
+        # 어시스턴트 메시지 추가
+        st.session_state.messages.append({
+            "role": "assistant",
+            "content": answer,
+            "sources": result["sources"],
+            "is_out_of_scope": result["is_out_of_scope"],
+            "confidence": result["confidence"]
+        })
+        
+    except Exception as e:
+        error_msg = f"죄송합니다. 답변 생성 중 오류가 발생했습니다: {str(e)}"
+        st.error(error_msg)
+        logger.error(f"쿼리 처리 오류: {e}", exc_info=True)
+        
+        st.session_state.messages.append({
+            "role": "assistant",
+            "content": error_msg,
+            "sources": [],
+            "is_out_of_scope": False,
+            "confidence": 0.0
+        })
 
 
 def sidebar():
@@ -246,8 +362,7 @@ def sidebar():
         # 대화 초기화 버튼
         if st.button("🗑️ 대화 내역 지우기", use_container_width=True):
             st.session_state.messages = []
-            if st.session_state.rag_chain:
-                st.session_state.rag_chain.clear_history()
+            st.session_state.conversation_history = []
             st.rerun()
         
         # 문서 재업로드 안내
@@ -368,49 +483,7 @@ def main():
         prompt = st.session_state.selected_question
         st.session_state.selected_question = None  # 한 번만 처리
         
-        # 사용자 메시지 추가
-        st.session_state.messages.append({
-            "role": "user",
-            "content": prompt
-        })
-        display_message("user", prompt)
-        
-        # AI 응답 생성
-        with st.spinner("답변을 생성하는 중..."):
-            try:
-                result = st.session_state.rag_chain.query_with_history(prompt)
-                
-                # 어시스턴트 메시지 추가
-                st.session_state.messages.append({
-                    "role": "assistant",
-                    "content": result["answer"],
-                    "sources": result["sources"],
-                    "is_out_of_scope": result["is_out_of_scope"],
-                    "confidence": result["confidence"]
-                })
-                
-                display_message(
-                    "assistant",
-                    result["answer"],
-                    result["sources"]
-                )
-                
-                # 범위 밖 경고
-                if result["is_out_of_scope"]:
-                    st.warning("⚠️ 이 질문은 제공된 문서 범위를 벗어납니다.")
-                
-            except Exception as e:
-                error_msg = f"죄송합니다. 답변 생성 중 오류가 발생했습니다: {str(e)}"
-                st.error(error_msg)
-                logger.error(f"쿼리 처리 오류: {e}", exc_info=True)
-                
-                st.session_state.messages.append({
-                    "role": "assistant",
-                    "content": error_msg,
-                    "sources": [],
-                    "is_out_of_scope": False,
-                    "confidence": 0.0
-                })
+        answer_question(prompt)
         
         st.rerun()
     
@@ -424,49 +497,7 @@ def main():
     
     # 사용자 입력
     if prompt := st.chat_input("내규에 대해 궁금한 점을 물어보세요..."):
-        # 사용자 메시지 추가
-        st.session_state.messages.append({
-            "role": "user",
-            "content": prompt
-        })
-        display_message("user", prompt)
-        
-        # AI 응답 생성
-        with st.spinner("답변을 생성하는 중..."):
-            try:
-                result = st.session_state.rag_chain.query_with_history(prompt)
-                
-                # 어시스턴트 메시지 추가
-                st.session_state.messages.append({
-                    "role": "assistant",
-                    "content": result["answer"],
-                    "sources": result["sources"],
-                    "is_out_of_scope": result["is_out_of_scope"],
-                    "confidence": result["confidence"]
-                })
-                
-                display_message(
-                    "assistant",
-                    result["answer"],
-                    result["sources"]
-                )
-                
-                # 범위 밖 경고
-                if result["is_out_of_scope"]:
-                    st.warning("⚠️ 이 질문은 제공된 문서 범위를 벗어납니다.")
-                
-            except Exception as e:
-                error_msg = f"죄송합니다. 답변 생성 중 오류가 발생했습니다: {str(e)}"
-                st.error(error_msg)
-                logger.error(f"쿼리 처리 오류: {e}", exc_info=True)
-                
-                st.session_state.messages.append({
-                    "role": "assistant",
-                    "content": error_msg,
-                    "sources": [],
-                    "is_out_of_scope": False,
-                    "confidence": 0.0
-                })
+        answer_question(prompt)
 
 
 if __name__ == "__main__":
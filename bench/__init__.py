@@ -0,0 +1 @@
+"""오프라인 성능 벤치마크 패키지"""
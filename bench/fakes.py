@@ -0,0 +1,125 @@
+"""오프라인 벤치마크용 결정적 가짜 임베딩/채팅 모델"""
+
+import hashlib
+import threading
+import time
+from typing import Any, Iterator, List, Optional
+
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from src.lexical_index import char_ngrams
+
+
+class FakeEmbeddings(Embeddings):
+    """
+    문자 2-gram 해싱으로 벡터를 만드는 결정적 임베딩 모델
+
+    같은 텍스트는 프로세스와 실행이 달라도 항상 같은 벡터가 되고, 글자가 겹치는 텍스트끼리
+    가까워지므로 검색 결과도 의미가 있습니다. 지연 시간을 지정하면 API 호출을 흉내 냅니다.
+    """
+
+    def __init__(self, dimensions: int = 256, latency_ms: float = 0.0, per_text_ms: float = 0.0):
+        """
+        Args:
+            dimensions: 벡터 차원
+            latency_ms: 호출당 고정 지연 시간 (밀리초)
+            per_text_ms: 텍스트당 추가 지연 시간 (밀리초)
+        """
+        self.dimensions = dimensions
+        self.latency_ms = latency_ms
+        self.per_text_ms = per_text_ms
+        self.model = f"fake-hash-{dimensions}"
+        self.calls = 0
+        self.texts = 0
+        self._lock = threading.Lock()
+
+    def _vector(self, text: str) -> List[float]:
+        """텍스트 하나를 단위 벡터로 변환합니다."""
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for term in char_ngrams(text) or [text]:
+            digest = hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest()
+            slot = int.from_bytes(digest[:4], "little") % self.dimensions
+            vector[slot] += 1.0 if digest[4] & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector.tolist()
+
+    def _simulate_call(self, count: int):
+        """호출 통계를 기록하고 지정된 지연 시간만큼 대기합니다."""
+        with self._lock:
+            self.calls += 1
+            self.texts += count
+        delay = (self.latency_ms + self.per_text_ms * count) / 1000
+        if delay > 0:
+            time.sleep(delay)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """문서 임베딩"""
+        self._simulate_call(len(texts))
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        """쿼리 임베딩"""
+        self._simulate_call(1)
+        return self._vector(text)
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    고정된 형식의 답변을 지연 시간과 함께 돌려주는 채팅 모델
+
+    첫 토큰까지 latency_ms, 이후 토큰마다 token_ms만큼 대기하여 스트리밍 응답도 흉내 냅니다.
+    """
+
+    latency_ms: float = 0.0
+    token_ms: float = 0.0
+    answer_tokens: int = 64
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-bench-chat"
+
+    def _tokens(self, messages: List[BaseMessage]) -> List[str]:
+        """프롬프트 길이가 반영된 결정적 답변 토큰을 만듭니다."""
+        prompt_chars = sum(len(str(message.content)) for message in messages)
+        header = f"[벤치마크 답변: 프롬프트 {prompt_chars}자] "
+        return [header] + [f"토큰{i} " for i in range(self.answer_tokens)]
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        self.calls += 1
+        tokens = self._tokens(messages)
+        delay = (self.latency_ms + self.token_ms * len(tokens)) / 1000
+        if delay > 0:
+            time.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="".join(tokens)))])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> Iterator[ChatGenerationChunk]:
+        self.calls += 1
+        if self.latency_ms > 0:
+            time.sleep(self.latency_ms / 1000)
+        for token in self._tokens(messages):
+            if self.token_ms > 0:
+                time.sleep(self.token_ms / 1000)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
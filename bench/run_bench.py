@@ -0,0 +1,511 @@
+"""
+오프라인 성능 벤치마크
+
+가짜 임베딩/채팅 모델을 주입하여 네트워크나 API 키 없이 파싱, 분할, 인덱싱, 검색,
+질의 응답 단계의 처리량과 지연 시간을 측정하고 JSON으로 저장합니다.
+
+사용 예:
+    python bench/run_bench.py
+    python bench/run_bench.py --scales 1,4,16 --backends chroma,numpy
+    python bench/run_bench.py --compare bench/results/baseline.json --fail-on-regression
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from langchain_core.documents import Document
+
+from bench.fakes import FakeChatModel, FakeEmbeddings
+from src.document_loader import DocumentLoader
+from src.rag_chain import RAGChain
+from src.vector_store import VectorStoreManager
+
+logger = logging.getLogger("bench")
+
+# 결과 파일 형식 버전 (지표 이름이나 구조가 바뀌면 올림)
+RESULT_VERSION = 1
+
+# 합성 코퍼스 생성용 어휘
+SYNTHETIC_TOPICS = [
+    "연차휴가", "출장비", "급여", "복리후생", "징계", "채용", "교육훈련", "보안",
+    "개인정보", "회계", "구매", "계약", "인사평가", "재택근무", "경조금", "퇴직금",
+]
+SYNTHETIC_PHRASES = [
+    "회사는 {topic}에 관한 사항을 별도로 정할 수 있다",
+    "직원은 {topic} 신청 시 소속 부서장의 승인을 받아야 한다",
+    "{topic}의 지급 기준은 직급 및 근속 연수에 따른다",
+    "{topic}와 관련된 세부 절차는 인사부서에서 정한다",
+    "이 규정에서 정하지 아니한 {topic} 사항은 관계 법령에 따른다",
+    "{topic} 관련 서류는 5년간 보관하여야 한다",
+]
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """지연 시간 샘플(초)의 요약 통계를 밀리초로 반환합니다."""
+    if not samples:
+        return {}
+    values = np.asarray(samples) * 1000
+    return {
+        "count": len(samples),
+        "mean_ms": float(values.mean()),
+        "p50_ms": float(np.percentile(values, 50)),
+        "p90_ms": float(np.percentile(values, 90)),
+        "p95_ms": float(np.percentile(values, 95)),
+        "p99_ms": float(np.percentile(values, 99)),
+        "max_ms": float(values.max()),
+    }
+
+
+def timed(func: Callable, *args, **kwargs) -> Tuple[object, float]:
+    """함수를 실행하고 (결과, 소요 시간)을 반환합니다."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def git_info() -> Dict[str, object]:
+    """현재 커밋과 작업 트리 변경 여부를 반환합니다. (git이 없으면 빈 값)"""
+    def run(*args: str) -> str:
+        return subprocess.run(
+            ["git", *args], cwd=ROOT_DIR, capture_output=True, text=True, timeout=30
+        ).stdout.strip()
+
+    try:
+        return {"commit": run("rev-parse", "HEAD"), "dirty": bool(run("status", "--porcelain", "--untracked-files=no"))}
+    except (OSError, subprocess.SubprocessError):
+        return {"commit": "", "dirty": None}
+
+
+def bench_parse(corpus_dir: str) -> Tuple[List[Document], Dict[str, object]]:
+    """
+    코퍼스를 파싱하고 형식별 처리량을 측정합니다.
+
+    Args:
+        corpus_dir: 문서 루트 디렉토리
+
+    Returns:
+        (파싱된 문서 리스트, 형식별 지표)
+    """
+    loader = DocumentLoader(corpus_dir)
+    file_paths = loader.find_documents()
+    documents, elapsed = timed(loader.load_documents, file_paths)
+    chars_by_source = {doc.metadata["source"]: len(doc.page_content) for doc in documents}
+
+    formats: Dict[str, Dict[str, float]] = {}
+    for file_path, (_, seconds) in zip(file_paths, loader.file_timings):
+        stats = formats.setdefault(file_path.suffix.lower(), {
+            "files": 0, "parsed": 0, "bytes": 0, "chars": 0, "seconds": 0.0
+        })
+        stats["files"] += 1
+        stats["bytes"] += file_path.stat().st_size
+        stats["seconds"] += seconds
+        if str(file_path) in chars_by_source:
+            stats["parsed"] += 1
+            stats["chars"] += chars_by_source[str(file_path)]
+
+    for stats in formats.values():
+        seconds = stats["seconds"] or 1e-9
+        stats["files_per_s"] = stats["files"] / seconds
+        stats["mb_per_s"] = stats["bytes"] / 1024 / 1024 / seconds
+
+    return documents, {
+        "files": len(file_paths),
+        "documents": len(documents),
+        "seconds": elapsed,
+        "formats": formats,
+    }
+
+
+def synthetic_documents(count: int, rng: random.Random) -> List[Document]:
+    """
+    규정 형식(제N조)의 합성 문서를 생성합니다. (코퍼스가 없을 때 사용)
+
+    Args:
+        count: 문서 수
+        rng: 난수 생성기
+
+    Returns:
+        문서 리스트
+    """
+    documents = []
+    for doc_index in range(count):
+        topic = rng.choice(SYNTHETIC_TOPICS)
+        lines = [f"{topic} 규정 {doc_index}"]
+        for article in range(1, rng.randint(10, 40) + 1):
+            lines.append(f"제{article}조({rng.choice(SYNTHETIC_TOPICS)})")
+            for _ in range(rng.randint(2, 6)):
+                lines.append(rng.choice(SYNTHETIC_PHRASES).format(topic=rng.choice(SYNTHETIC_TOPICS)) + ".")
+        documents.append(Document(
+            page_content="\n".join(lines),
+            metadata={
+                "source": f"synthetic/{doc_index:05d}.docx",
+                "filename": f"{topic}_규정_{doc_index}.docx",
+                "category": topic,
+                "file_type": ".docx",
+            }
+        ))
+    return documents
+
+
+def scale_documents(documents: List[Document], scale: int, rng: random.Random) -> List[Document]:
+    """
+    문서를 scale배로 늘린 합성 코퍼스를 만듭니다.
+
+    복사본마다 문단 순서를 섞고 소스 경로를 바꿔 청크 ID와 벡터가 원본과 겹치지 않게 합니다.
+
+    Args:
+        documents: 원본 문서 리스트
+        scale: 배율 (1이면 원본 그대로)
+        rng: 난수 생성기
+
+    Returns:
+        문서 리스트
+    """
+    scaled = list(documents)
+    for copy_index in range(1, scale):
+        for doc in documents:
+            lines = doc.page_content.split("\n")
+            rng.shuffle(lines)
+            metadata = dict(doc.metadata)
+            # 문단을 섞으면 페이지 위치가 맞지 않으므로 페이지 구분 없이 분할
+            metadata.pop("page_starts", None)
+            metadata["source"] = f"{metadata.get('source', '')}#copy{copy_index}"
+            scaled.append(Document(page_content="\n".join(lines), metadata=metadata))
+    return scaled
+
+
+def sample_queries(chunks: List[Document], count: int, rng: random.Random) -> List[str]:
+    """
+    청크 본문에서 단어 구간을 잘라 질문을 만듭니다.
+
+    절반은 원문 구간 그대로(어휘 색인 적중), 절반은 단어 일부를 빼고 순서를 섞어
+    벡터 검색 경로를 타도록 합니다.
+    """
+    queries = []
+    candidates = [chunk for chunk in chunks if len(chunk.page_content.split()) >= 4]
+    if not candidates:
+        return queries
+
+    while len(queries) < count:
+        words = rng.choice(candidates).page_content.split()
+        start = rng.randrange(0, max(1, len(words) - 8))
+        window = words[start:start + rng.randint(3, 8)]
+        if len(queries) % 2:
+            window = [word for word in window if rng.random() > 0.3] or window[:1]
+            rng.shuffle(window)
+            window.append(rng.choice(SYNTHETIC_TOPICS))
+        queries.append(" ".join(window))
+    return queries
+
+
+def bench_backend(
+    backend: str,
+    documents: List[Document],
+    queries: List[str],
+    args: argparse.Namespace,
+    work_dir: str
+) -> Dict[str, object]:
+    """
+    한 벡터 백엔드에 대해 인덱싱, 검색, 질의 응답 지연 시간을 측정합니다.
+
+    Args:
+        backend: "chroma" 또는 "numpy"
+        documents: 문서 리스트
+        queries: 질문 리스트
+        args: 명령행 인자
+        work_dir: 벡터 스토어를 만들 임시 디렉토리
+
+    Returns:
+        백엔드별 지표
+    """
+    embeddings = FakeEmbeddings(
+        dimensions=args.dim,
+        latency_ms=args.embed_latency_ms,
+        per_text_ms=args.embed_per_text_ms
+    )
+    vs_manager = VectorStoreManager(
+        persist_directory=os.path.join(work_dir, backend),
+        chunk_size=args.chunk_size,
+        chunk_overlap_percent=args.chunk_overlap_percent,
+        chunk_strategy=args.chunk_strategy,
+        chunk_tokens=args.chunk_tokens,
+        query_cache_size=0,
+        embeddings=embeddings,
+        vector_backend=backend
+    )
+
+    _, index_seconds = timed(vs_manager.create_vectorstore, documents, force_recreate=True)
+    chunk_count = vs_manager._count_chunks()
+    result: Dict[str, object] = {
+        "index": {
+            "chunks": chunk_count,
+            "seconds": index_seconds,
+            "chunks_per_s": chunk_count / (index_seconds or 1e-9),
+            "embedding_calls": embeddings.calls,
+        }
+    }
+
+    query_vectors = [embeddings.embed_query(query) for query in queries]
+    vector_samples = [
+        timed(vs_manager.similarity_search_by_vector, vector, k=args.top_k)[1]
+        for vector in query_vectors
+    ]
+    lexical_samples = [timed(vs_manager.lexical_search, query, k=args.top_k)[1] for query in queries]
+    result["vector_search"] = percentiles(vector_samples)
+    result["lexical_search"] = percentiles(lexical_samples)
+
+    llm = FakeChatModel(
+        latency_ms=args.llm_latency_ms,
+        token_ms=args.llm_token_ms,
+        answer_tokens=args.answer_tokens
+    )
+    rag_chain = RAGChain(
+        vs_manager,
+        top_k=args.top_k,
+        lexical_min_coverage=args.lexical_min_coverage,
+        llm=llm
+    )
+
+    embedding_calls = embeddings.calls
+    query_samples = []
+    errors = 0
+    for query in queries:
+        answer, seconds = timed(rag_chain.query, query)
+        query_samples.append(seconds)
+        errors += int(answer["answer"].startswith("죄송합니다. 답변 생성 중 오류"))
+    result["query"] = percentiles(query_samples)
+    result["query"].update({
+        "errors": errors,
+        "llm_calls": llm.calls,
+        "embedding_calls": embeddings.calls - embedding_calls,
+    })
+
+    memory = vs_manager.get_vector_memory_report()
+    if memory:
+        result["memory"] = memory
+    return result
+
+
+def run(args: argparse.Namespace) -> Dict[str, object]:
+    """전체 벤치마크를 실행하고 결과 딕셔너리를 반환합니다."""
+    rng = random.Random(args.seed)
+    report: Dict[str, object] = {
+        "version": RESULT_VERSION,
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git": git_info(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": vars(args),
+        },
+        "runs": [],
+    }
+
+    documents: List[Document] = []
+    if args.corpus and os.path.isdir(args.corpus):
+        documents, report["parse"] = bench_parse(args.corpus)
+    if not documents:
+        logger.warning("코퍼스에서 문서를 읽지 못해 합성 문서를 사용합니다.")
+        documents = synthetic_documents(args.synthetic_docs, rng)
+    report["corpus"] = {"documents": len(documents), "chars": sum(len(doc.page_content) for doc in documents)}
+
+    splitter = VectorStoreManager(
+        chunk_size=args.chunk_size,
+        chunk_overlap_percent=args.chunk_overlap_percent,
+        chunk_strategy=args.chunk_strategy,
+        chunk_tokens=args.chunk_tokens,
+        use_lexical_index=False,
+        embeddings=FakeEmbeddings(dimensions=args.dim)
+    )
+
+    for scale in args.scales:
+        scaled = scale_documents(documents, scale, random.Random(args.seed + scale))
+        chunks, split_seconds = timed(splitter.split_documents, scaled)
+        queries = sample_queries(chunks, args.queries, random.Random(args.seed))
+        chars = sum(len(doc.page_content) for doc in scaled)
+        logger.info(f"배율 {scale}: 문서 {len(scaled)}개, 청크 {len(chunks)}개")
+
+        entry: Dict[str, object] = {
+            "scale": scale,
+            "documents": len(scaled),
+            "chars": chars,
+            "split": {
+                "chunks": len(chunks),
+                "seconds": split_seconds,
+                "chars_per_s": chars / (split_seconds or 1e-9),
+            },
+            "backends": {},
+        }
+        for backend in args.backends:
+            with tempfile.TemporaryDirectory(prefix="rag-bench-") as work_dir:
+                entry["backends"][backend] = bench_backend(backend, scaled, queries, args, work_dir)
+        report["runs"].append(entry)
+
+    return report
+
+
+def flatten(data: object, prefix: str = "") -> Dict[str, float]:
+    """중첩 딕셔너리의 숫자 값을 "a.b.c" 키로 펼칩니다."""
+    if isinstance(data, dict):
+        flat: Dict[str, float] = {}
+        for key, value in data.items():
+            flat.update(flatten(value, f"{prefix}.{key}" if prefix else str(key)))
+        return flat
+    if isinstance(data, list):
+        flat = {}
+        for item in data:
+            label = f"scale{item['scale']}" if isinstance(item, dict) and "scale" in item else str(len(flat))
+            flat.update(flatten(item, f"{prefix}.{label}"))
+        return flat
+    if isinstance(data, (int, float)) and not isinstance(data, bool):
+        return {prefix: float(data)}
+    return {}
+
+
+def compare(report: Dict[str, object], baseline: Dict[str, object], threshold: float) -> List[str]:
+    """
+    기준 결과와 비교하여 변화량을 출력하고 회귀한 지표 목록을 반환합니다.
+
+    시간(seconds, _ms)은 낮을수록, 처리량(_per_s)은 높을수록 좋은 지표로 봅니다.
+
+    Args:
+        report: 현재 결과
+        baseline: 기준 결과
+        threshold: 회귀로 판단할 상대 변화율 (0.2 = 20%)
+
+    Returns:
+        회귀한 지표 이름 리스트
+    """
+    current = flatten({"parse": report.get("parse", {}), "runs": report["runs"]})
+    previous = flatten({"parse": baseline.get("parse", {}), "runs": baseline.get("runs", [])})
+    regressions = []
+
+    print(f"\n=== 기준 결과와 비교 ({baseline.get('meta', {}).get('git', {}).get('commit', '')[:10]}) ===")
+    for key in sorted(current.keys() & previous.keys()):
+        lower_is_better = key.endswith("seconds") or key.endswith("_ms")
+        higher_is_better = key.endswith("_per_s")
+        if not (lower_is_better or higher_is_better) or previous[key] == 0:
+            continue
+
+        change = (current[key] - previous[key]) / previous[key]
+        worse = change > threshold if lower_is_better else change < -threshold
+        if worse:
+            regressions.append(key)
+        marker = "  <-- 회귀" if worse else ""
+        print(f"{key:70s} {previous[key]:12.3f} -> {current[key]:12.3f} ({change:+.1%}){marker}")
+
+    return regressions
+
+
+def print_summary(report: Dict[str, object]):
+    """주요 지표를 사람이 읽기 쉬운 형태로 출력합니다."""
+    parse = report.get("parse")
+    if parse:
+        print(f"\n=== 파싱: 파일 {parse['files']}개, 문서 {parse['documents']}개, {parse['seconds']:.2f}초 ===")
+        for ext, stats in sorted(parse["formats"].items()):
+            print(
+                f"  {ext:6s} {stats['parsed']:4d}/{stats['files']:<4d} "
+                f"{stats['files_per_s']:8.1f} 파일/초 {stats['mb_per_s']:8.2f} MB/초"
+            )
+
+    for entry in report["runs"]:
+        split = entry["split"]
+        print(
+            f"\n=== 배율 {entry['scale']}: 문서 {entry['documents']}개, "
+            f"청크 {split['chunks']}개 (분할 {split['seconds']:.2f}초) ==="
+        )
+        for backend, stats in entry["backends"].items():
+            print(
+                f"  [{backend}] 인덱싱 {stats['index']['seconds']:.2f}초 "
+                f"({stats['index']['chunks_per_s']:.0f} 청크/초) | "
+                f"벡터 검색 p50 {stats['vector_search']['p50_ms']:.2f}ms p95 {stats['vector_search']['p95_ms']:.2f}ms | "
+                f"어휘 검색 p50 {stats['lexical_search']['p50_ms']:.2f}ms | "
+                f"질의 p50 {stats['query']['p50_ms']:.1f}ms p95 {stats['query']['p95_ms']:.1f}ms"
+            )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """명령행 인자를 파싱합니다."""
+    parser = argparse.ArgumentParser(description="오프라인 RAG 성능 벤치마크 (API 키 불필요)")
+    parser.add_argument("--corpus", default=str(ROOT_DIR / "reference"), help="파싱할 문서 디렉토리")
+    parser.add_argument("--synthetic-docs", type=int, default=100, help="코퍼스가 없을 때 생성할 합성 문서 수")
+    parser.add_argument("--scales", default="1,4", help="코퍼스 배율 목록 (쉼표 구분)")
+    parser.add_argument("--backends", default="chroma,numpy", help="벡터 백엔드 목록 (chroma, numpy)")
+    parser.add_argument("--queries", type=int, default=50, help="측정할 질문 수")
+    parser.add_argument("--top-k", type=int, default=6)
+    parser.add_argument("--chunk-size", type=int, help="recursive 분할 방식의 청크 크기 (글자 수, 기본 1000)")
+    parser.add_argument("--chunk-overlap-percent", type=float, default=10.0)
+    parser.add_argument("--chunk-strategy", choices=["regulation", "recursive"], help="분할 방식 (기본: CHUNK_STRATEGY 환경 변수)")
+    parser.add_argument("--chunk-tokens", type=int, default=1000, help="regulation 분할 방식의 청크 최대 토큰 수")
+    parser.add_argument("--lexical-min-coverage", type=float, default=1.0,
+                        help="어휘 색인 단독 응답 기준 (1보다 크면 항상 벡터 검색)")
+    parser.add_argument("--dim", type=int, default=256, help="가짜 임베딩 차원")
+    parser.add_argument("--embed-latency-ms", type=float, default=0.0, help="임베딩 호출당 지연 시간")
+    parser.add_argument("--embed-per-text-ms", type=float, default=0.0, help="임베딩 텍스트당 지연 시간")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="LLM 첫 토큰까지 지연 시간")
+    parser.add_argument("--llm-token-ms", type=float, default=0.0, help="LLM 토큰당 지연 시간")
+    parser.add_argument("--answer-tokens", type=int, default=64, help="가짜 답변 토큰 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: bench/results/bench-<커밋>-<시각>.json)")
+    parser.add_argument("--compare", help="비교할 기준 결과 JSON 경로")
+    parser.add_argument("--threshold", type=float, default=0.2, help="회귀 판단 상대 변화율")
+    parser.add_argument("--fail-on-regression", action="store_true", help="회귀가 있으면 종료 코드 1")
+    parser.add_argument("--verbose", action="store_true", help="모듈 로그 출력")
+
+    args = parser.parse_args(argv)
+    args.scales = [int(scale) for scale in args.scales.split(",") if scale.strip()]
+    args.backends = [backend.strip() for backend in args.backends.split(",") if backend.strip()]
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """벤치마크 진입점"""
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    if not args.verbose:
+        # 모듈별 진행 로그는 측정 결과를 가리므로 경고 이상만 출력
+        for name in ("src", "chromadb", "httpx"):
+            logging.getLogger(name).setLevel(logging.WARNING)
+
+    report = run(args)
+    print_summary(report)
+
+    output = args.output
+    if not output:
+        commit = report["meta"]["git"]["commit"][:10] or "nogit"
+        output = str(ROOT_DIR / "bench" / "results" / f"bench-{commit}-{datetime.now():%Y%m%d-%H%M%S}.json")
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n회귀 {len(regressions)}건 (기준 {args.threshold:.0%} 초과)")
+            if args.fail_on_regression:
+                return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
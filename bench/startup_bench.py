@@ -0,0 +1,362 @@
+"""
+콜드 스타트(프로세스 시작) 시간 벤치마크
+
+새 Python 프로세스를 반복 실행하여 app.py와 CLI 스크립트가 사용하는 모듈의 import 시간,
+무거운 의존성(chromadb, langchain_openai, 문서 파서 등)의 로드 여부, 최대 메모리를 측정합니다.
+engine 시나리오는 NumPy 백엔드 인덱스를 열고 첫 답변을 받기까지의 시간을 측정합니다.
+
+각 시나리오는 lazy(현재 코드 그대로)와 eager(지연 로드 이전처럼 무거운 의존성을 먼저 import)
+두 방식으로 실행하여 지연 로드로 줄어든 시간을 함께 보여줍니다.
+
+사용 예:
+    python bench/startup_bench.py
+    python bench/startup_bench.py --repeat 10 --scenarios app_imports,engine
+    python bench/startup_bench.py --compare bench/results/startup-baseline.json --fail-on-regression
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+# 측정 프로세스에서 바로 import하는 모듈은 표준 라이브러리로 한정
+# (bench.run_bench, src.* 는 부모 프로세스에서만 필요할 때 로드)
+
+# 결과 파일 형식 버전
+RESULT_VERSION = 1
+
+# 로드 여부를 기록할 무거운 의존성
+HEAVY_MODULES = [
+    "chromadb",
+    "langchain_community",
+    "langchain_openai",
+    "langchain_text_splitters",
+    "openai",
+    "tiktoken",
+    "docx",
+    "docx2txt",
+    "openpyxl",
+    "PyPDF2",
+    "onnxruntime",
+    "streamlit",
+]
+
+# 지연 로드 이전에 모듈 import 시점에 함께 로드되던 의존성 (eager 방식 재현용)
+LOADER_DEPENDENCIES = ["docx2txt", "docx", "openpyxl", "PyPDF2"]
+STORE_DEPENDENCIES = ["chromadb", "langchain_text_splitters", "langchain_community.vectorstores"]
+EAGER_DEPENDENCIES = {
+    "src.document_loader": LOADER_DEPENDENCIES,
+    "src.vector_store": STORE_DEPENDENCIES,
+    "src.rag_chain": STORE_DEPENDENCIES + ["langchain_openai"],
+    "src.indexer": LOADER_DEPENDENCIES + STORE_DEPENDENCIES,
+    "src.indexing_report": STORE_DEPENDENCIES,
+}
+
+# 시나리오별 import 모듈 (설치되지 않은 모듈은 건너뜀)
+SCENARIOS = {
+    # Streamlit 앱 (app.py 최상단 import)
+    "app_imports": ["dotenv", "streamlit", "src.vector_store", "src.rag_chain", "src.answer_cache", "src.metrics"],
+    # 인덱싱 스크립트 (setup_db.py, upload_to_chromadb.py 최상단 import)
+    "cli_imports": ["dotenv", "src.document_loader", "src.vector_store", "src.indexer", "src.indexing_report"],
+    "document_loader": ["src.document_loader"],
+    "vector_store": ["src.vector_store"],
+    "rag_chain": ["src.rag_chain"],
+    # app_imports + NumPy 인덱스 열기 + 첫 답변 (가짜 임베딩/LLM)
+    "engine": ["dotenv", "streamlit", "src.vector_store", "src.rag_chain", "src.answer_cache", "src.metrics"],
+}
+
+
+def eager_modules(modules: List[str]) -> List[str]:
+    """시나리오 모듈이 지연 로드 이전에 함께 로드하던 의존성 목록을 반환합니다."""
+    preload: List[str] = []
+    for module in modules:
+        for dependency in EAGER_DEPENDENCIES.get(module, []):
+            if dependency not in preload:
+                preload.append(dependency)
+    return preload
+
+
+def installed(module: str) -> bool:
+    """모듈이 설치되어 있는지 import 없이 확인합니다."""
+    try:
+        return find_spec(module) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def probe(scenario: str, eager: bool, index_dir: Optional[str]) -> Dict[str, object]:
+    """
+    측정 프로세스 안에서 시나리오를 실행합니다. (--probe로 호출된 새 프로세스)
+
+    Args:
+        scenario: 시나리오 이름
+        eager: 무거운 의존성을 먼저 import할지 여부
+        index_dir: engine 시나리오에서 열 NumPy 인덱스 디렉토리
+
+    Returns:
+        단계별 소요 시간과 로드된 무거운 모듈 목록
+    """
+    import importlib
+    import resource
+
+    started = time.perf_counter()
+    modules = [module for module in SCENARIOS[scenario] if installed(module)]
+    result: Dict[str, object] = {"skipped": [module for module in SCENARIOS[scenario] if module not in modules]}
+
+    if eager:
+        start = time.perf_counter()
+        for module in eager_modules(modules):
+            if installed(module):
+                importlib.import_module(module)
+        result["preload_ms"] = (time.perf_counter() - start) * 1000
+
+    imports = {}
+    for module in modules:
+        start = time.perf_counter()
+        importlib.import_module(module)
+        imports[module] = (time.perf_counter() - start) * 1000
+    result["import_ms"] = imports
+    result["imports_total_ms"] = (time.perf_counter() - started) * 1000
+
+    if scenario == "engine":
+        logging.disable(logging.WARNING)
+        from bench.fakes import FakeChatModel, FakeEmbeddings
+        from src.rag_chain import RAGChain
+        from src.vector_store import VectorStoreManager
+
+        start = time.perf_counter()
+        vs_manager = VectorStoreManager(
+            persist_directory=index_dir,
+            vector_backend="numpy",
+            embeddings=FakeEmbeddings(),
+            use_lexical_index=True
+        )
+        vs_manager.load_vectorstore()
+        chain = RAGChain(vector_store_manager=vs_manager, llm=FakeChatModel(), hybrid_search=True)
+        result["engine_init_ms"] = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        chain.query("연차휴가 신청 절차는 어떻게 되나요?")
+        result["first_query_ms"] = (time.perf_counter() - start) * 1000
+
+    result["ready_ms"] = (time.perf_counter() - started) * 1000
+    result["heavy_modules"] = [module for module in HEAVY_MODULES if module in sys.modules]
+    result["module_count"] = len(sys.modules)
+    # Linux는 KB, macOS는 바이트 단위
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    result["max_rss_mb"] = max_rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return result
+
+
+def build_engine_index(index_dir: str, documents: int):
+    """engine 시나리오에서 사용할 NumPy 인덱스를 가짜 임베딩으로 생성합니다."""
+    import random
+
+    from bench.fakes import FakeEmbeddings
+    from bench.run_bench import synthetic_documents
+    from src.vector_store import VectorStoreManager
+
+    vs_manager = VectorStoreManager(
+        persist_directory=index_dir,
+        vector_backend="numpy",
+        embeddings=FakeEmbeddings(),
+        use_lexical_index=True
+    )
+    chunks = vs_manager.split_documents(synthetic_documents(documents, random.Random(0)))
+    vs_manager.create_vectorstore(chunks)
+
+
+def run_probe(scenario: str, eager: bool, index_dir: Optional[str]) -> Dict[str, object]:
+    """새 Python 프로세스에서 시나리오를 한 번 실행하고 프로세스 전체 소요 시간을 더해 반환합니다."""
+    command = [sys.executable, str(Path(__file__).resolve()), "--probe", scenario]
+    if eager:
+        command.append("--eager")
+    if index_dir:
+        command += ["--index-dir", index_dir]
+
+    start = time.perf_counter()
+    completed = subprocess.run(command, cwd=ROOT_DIR, capture_output=True, text=True, timeout=600)
+    wall_ms = (time.perf_counter() - start) * 1000
+    if completed.returncode != 0:
+        raise RuntimeError(f"{scenario} 측정 실패:\n{completed.stderr[-2000:]}")
+
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["process_ms"] = wall_ms
+    return result
+
+
+def summarize(samples: List[Dict[str, object]]) -> Dict[str, object]:
+    """반복 측정 결과에서 시간 지표의 중앙값/최솟값을 구합니다."""
+    from bench.run_bench import percentiles
+
+    summary: Dict[str, object] = {}
+    for key in ("process_ms", "imports_total_ms", "preload_ms", "engine_init_ms", "first_query_ms", "ready_ms"):
+        values = [sample[key] / 1000 for sample in samples if key in sample]
+        if values:
+            stats = percentiles(values)
+            summary[key] = {"p50_ms": stats["p50_ms"], "min_ms": min(values) * 1000, "max_ms": stats["max_ms"]}
+
+    import_keys = samples[0].get("import_ms", {}).keys()
+    summary["import_p50_ms"] = {
+        module: percentiles([sample["import_ms"][module] / 1000 for sample in samples])["p50_ms"]
+        for module in import_keys
+    }
+    summary["max_rss_mb"] = max(sample["max_rss_mb"] for sample in samples)
+    summary["module_count"] = samples[-1]["module_count"]
+    summary["heavy_modules"] = samples[-1]["heavy_modules"]
+    summary["skipped"] = samples[-1]["skipped"]
+    return summary
+
+
+def run(args: argparse.Namespace) -> Dict[str, object]:
+    """선택한 시나리오를 lazy/eager 방식으로 반복 측정합니다."""
+    from bench.run_bench import git_info
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        raise ValueError(f"알 수 없는 시나리오: {unknown} (지원: {', '.join(SCENARIOS)})")
+    modes = ["lazy"] if args.no_eager else ["lazy", "eager"]
+
+    report: Dict[str, object] = {
+        "meta": {
+            "version": RESULT_VERSION,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git": git_info(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeat": args.repeat,
+        },
+        "scenarios": {},
+    }
+
+    with tempfile.TemporaryDirectory(prefix="startup-bench-") as temp_dir:
+        index_dir = None
+        if "engine" in scenarios:
+            index_dir = os.path.join(temp_dir, "index")
+            logging.disable(logging.WARNING)
+            build_engine_index(index_dir, args.engine_docs)
+            logging.disable(logging.NOTSET)
+
+        # 첫 실행은 .pyc 생성과 디스크 캐시 적재가 섞이므로 버림
+        for scenario in scenarios:
+            run_probe(scenario, False, index_dir)
+
+        for scenario in scenarios:
+            report["scenarios"][scenario] = {}
+            for mode in modes:
+                samples = [run_probe(scenario, mode == "eager", index_dir) for _ in range(args.repeat)]
+                report["scenarios"][scenario][mode] = summarize(samples)
+
+    return report
+
+
+def print_summary(report: Dict[str, object]):
+    """측정 결과 요약을 출력합니다."""
+    print(f"\n=== 콜드 스타트 (반복 {report['meta']['repeat']}회, 중앙값) ===")
+    print(f"{'시나리오':18s} {'방식':6s} {'프로세스':>10s} {'import':>10s} {'준비 완료':>10s} {'RSS':>8s}  무거운 모듈")
+    for scenario, modes in report["scenarios"].items():
+        for mode, summary in modes.items():
+            print(
+                f"{scenario:18s} {mode:6s} {summary['process_ms']['p50_ms']:8.0f}ms "
+                f"{summary['imports_total_ms']['p50_ms']:8.0f}ms {summary['ready_ms']['p50_ms']:8.0f}ms "
+                f"{summary['max_rss_mb']:6.0f}MB  {', '.join(summary['heavy_modules']) or '-'}"
+            )
+        if "lazy" in modes and "eager" in modes:
+            saved = modes["eager"]["process_ms"]["p50_ms"] - modes["lazy"]["process_ms"]["p50_ms"]
+            print(f"{'':18s} 지연 로드로 단축: {saved:.0f}ms")
+
+
+def compare(report: Dict[str, object], baseline: Dict[str, object], threshold: float) -> List[str]:
+    """
+    기준 결과와 lazy 방식의 프로세스 시간을 비교하여 회귀한 시나리오 목록을 반환합니다.
+
+    Args:
+        report: 현재 결과
+        baseline: 기준 결과
+        threshold: 회귀로 판단할 상대 변화율 (0.2 = 20%)
+
+    Returns:
+        회귀한 시나리오 이름 리스트
+    """
+    regressions = []
+    print(f"\n=== 기준 결과와 비교 ({baseline.get('meta', {}).get('git', {}).get('commit', '')[:10]}) ===")
+    for scenario, modes in report["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(scenario, {}).get("lazy")
+        if not previous or "lazy" not in modes:
+            continue
+        before = previous["process_ms"]["p50_ms"]
+        after = modes["lazy"]["process_ms"]["p50_ms"]
+        change = (after - before) / before
+        worse = change > threshold
+        if worse:
+            regressions.append(scenario)
+        marker = "  <-- 회귀" if worse else ""
+        print(f"{scenario:18s} {before:10.0f}ms -> {after:10.0f}ms ({change:+.1%}){marker}")
+    return regressions
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """명령행 인자를 파싱합니다."""
+    parser = argparse.ArgumentParser(description="콜드 스타트 시간 벤치마크")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="측정할 시나리오 목록 (쉼표 구분)")
+    parser.add_argument("--repeat", type=int, default=5, help="시나리오별 반복 횟수")
+    parser.add_argument("--no-eager", action="store_true", help="eager 방식 비교 측정을 생략")
+    parser.add_argument("--engine-docs", type=int, default=50, help="engine 시나리오 인덱스의 합성 문서 수")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: bench/results/startup-<커밋>-<시각>.json)")
+    parser.add_argument("--compare", help="비교할 기준 결과 JSON 경로")
+    parser.add_argument("--threshold", type=float, default=0.2, help="회귀 판단 상대 변화율")
+    parser.add_argument("--fail-on-regression", action="store_true", help="회귀가 있으면 종료 코드 1")
+    # 측정 프로세스 내부용
+    parser.add_argument("--probe", help=argparse.SUPPRESS)
+    parser.add_argument("--eager", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--index-dir", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """벤치마크 진입점"""
+    args = parse_args(argv)
+    if args.probe:
+        print(json.dumps(probe(args.probe, args.eager, args.index_dir)))
+        return 0
+
+    logging.basicConfig(level=logging.INFO)
+    report = run(args)
+    print_summary(report)
+
+    output = args.output
+    if not output:
+        commit = report["meta"]["git"]["commit"][:10] or "nogit"
+        output = str(ROOT_DIR / "bench" / "results" / f"startup-{commit}-{datetime.now():%Y%m%d-%H%M%S}.json")
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n회귀 {len(regressions)}건 (기준 {args.threshold:.0%} 초과)")
+            if args.fail_on_regression:
+                return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,7 @@
 
 import os
 import sys
+from importlib.util import find_spec
 from pathlib import Path
 
 
@@ -29,16 +30,18 @@ def check_dependencies():
         ('streamlit', 'streamlit'),
         ('docx', 'python-docx'),
         ('openpyxl', 'openpyxl'),
+        ('xlrd', 'xlrd'),
         ('PyPDF2', 'PyPDF2'),
+        ('olefile', 'olefile'),
         ('dotenv', 'python-dotenv'),
     ]
     
     all_installed = True
     for module_name, package_name in required_packages:
-        try:
-            __import__(module_name)
+        # 설치 여부만 확인 (모듈을 실제로 import하지 않으므로 chromadb 등도 즉시 확인)
+        if find_spec(module_name) is not None:
             print(f"  ✓ {package_name}")
-        except ImportError:
+        else:
             print(f"  ❌ {package_name} (설치 필요)")
             all_installed = False
     
@@ -124,11 +127,10 @@ def check_windows_specific():
     if sys.platform == 'win32':
         print("\nWindows 환경 확인:")
         
-        try:
-            import win32com.client
+        if find_spec("win32com") is not None:
             print("  ✓ win32com 설치됨 (.doc 파일 지원)")
             return True
-        except ImportError:
+        else:
             print("  ⚠️  win32com 미설치 (.doc 파일 처리 불가)")
             print("     pip install pywin32 실행 권장")
             return False
@@ -2,13 +2,17 @@
 
 import os
 import sys
+import argparse
 from pathlib import Path
+import time
 import logging
 
 from dotenv import load_dotenv
 
 from src.document_loader import DocumentLoader
 from src.vector_store import VectorStoreManager
+from src.indexer import IndexManifest, full_index, incremental_index
+from src.indexing_report import IndexingReport, create_dry_run_manager, dry_run
 
 # 로깅 설정
 logging.basicConfig(
@@ -17,9 +21,129 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 파싱 결과 캐시 경로 (청크/임베딩 설정을 바꿔도 원본 문서를 다시 파싱하지 않음)
+PARSE_CACHE_DIR = "./.parse_cache"
+
+# 인덱싱 매니페스트 경로 (벡터 DB와 함께 삭제되도록 DB 폴더 안에 저장)
+MANIFEST_PATH = "./chroma_db/index_manifest.json"
+
+# 청크 최대 토큰 수 (regulation 분할 방식, CHUNK_STRATEGY=recursive면 1000자 단위)
+CHUNK_TOKENS = 1000
+
+
+def parse_args():
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="NICE평가정보 내규 챗봇 - 데이터베이스 설정")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="추가/변경/삭제된 문서만 벡터 데이터베이스에 반영합니다"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="문서 파싱 병렬 프로세스 수 (기본: CPU 코어 수)"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="API를 호출하지 않고 파싱/분할만 하여 토큰 수, 예상 비용, 예상 소요 시간을 출력합니다"
+    )
+    parser.add_argument(
+        "--report",
+        nargs="?",
+        const="./indexing_report.json",
+        help="파일별 파싱 시간, 글자 수, 청크 수, 토큰 수, 최대 메모리를 JSON 리포트로 저장합니다 "
+             "(경로 생략 시 ./indexing_report.json)"
+    )
+    parser.add_argument(
+        "--no-parse-cache",
+        action="store_true",
+        help="파싱 캐시를 사용하지 않습니다 (리포트에 실제 파싱 시간을 기록할 때)"
+    )
+    parser.add_argument(
+        "--tokens-per-second",
+        type=float,
+        help="--dry-run 시간 추정에 사용할 임베딩 요청당 처리 속도 (토큰/초)"
+    )
+    return parser.parse_args()
+
+
+def create_vs_manager() -> VectorStoreManager:
+    """벡터 스토어 관리자 생성"""
+    return VectorStoreManager(
+        persist_directory="./chroma_db",
+        chunk_strategy=os.getenv("CHUNK_STRATEGY", "regulation"),
+        chunk_tokens=CHUNK_TOKENS,
+        chunk_overlap_percent=4.0,  # 4% 오버랩 (40토큰)
+        embedding_cache_path="./embedding_cache.db"  # 변경 없는 청크는 재임베딩하지 않음
+    )
+
+
+def get_parse_cache_dir(args) -> str:
+    """파싱 캐시 경로 (--no-parse-cache면 None)"""
+    return None if args.no_parse_cache else PARSE_CACHE_DIR
+
+
+def run_dry_run(reference_dir: Path, args):
+    """API 호출 없이 토큰 수, 예상 비용, 예상 소요 시간 계산"""
+    print()
+    print("-" * 60)
+    print("드라이 런: 파싱/분할만 수행 (임베딩 API와 벡터 DB를 사용하지 않음)")
+    print("-" * 60)
+    
+    try:
+        loader = DocumentLoader(str(reference_dir), max_workers=args.workers, cache_dir=get_parse_cache_dir(args))
+        vs_manager = create_dry_run_manager(
+            chunk_overlap_percent=4.0,
+            chunk_strategy=os.getenv("CHUNK_STRATEGY", "regulation"),
+            chunk_tokens=CHUNK_TOKENS,
+            embedding_cache_path="./embedding_cache.db"
+        )
+        
+        report = dry_run(loader, vs_manager, tokens_per_second=args.tokens_per_second)
+        report.print_summary()
+        if args.report:
+            report.save(args.report)
+        report.stop()
+        
+    except Exception as e:
+        logger.error(f"❌ 드라이 런 중 오류 발생: {e}")
+        sys.exit(1)
+
+
+def run_incremental(reference_dir: Path, workers: int):
+    """증분 인덱싱 실행"""
+    print()
+    print("-" * 60)
+    print("증분 인덱싱: 변경된 문서만 반영")
+    print("-" * 60)
+    
+    try:
+        loader = DocumentLoader(str(reference_dir), max_workers=workers, cache_dir=PARSE_CACHE_DIR)
+        vs_manager = create_vs_manager()
+        manifest = IndexManifest(MANIFEST_PATH)
+        
+        summary = incremental_index(loader, vs_manager, manifest)
+        
+        print(f"\n  - 추가된 파일: {summary['added']}개")
+        print(f"  - 변경된 파일: {summary['changed']}개")
+        print(f"  - 삭제된 파일: {summary['deleted']}개")
+        print(f"  - 변경 없는 파일: {summary['unchanged']}개")
+        print(f"  - 청크: +{summary['chunks_added']} / -{summary['chunks_deleted']}")
+        
+        logger.info("✓ 증분 인덱싱 완료!")
+        
+    except Exception as e:
+        logger.error(f"❌ 증분 인덱싱 중 오류 발생: {e}")
+        sys.exit(1)
+
 
 def main():
     """메인 함수"""
+    args = parse_args()
+    
     print("=" * 60)
     print("NICE평가정보 내규 챗봇 - 데이터베이스 설정")
     print("=" * 60)
@@ -28,8 +152,17 @@ def main():
     # 환경 변수 로드
     load_dotenv()
     
-    # API 키 확인
-    if not os.getenv("OPENAI_API_KEY"):
+    # 드라이 런은 API 키 없이 실행
+    if args.dry_run:
+        reference_dir = Path("./reference")
+        if not reference_dir.exists():
+            logger.error(f"❌ {reference_dir} 폴더가 존재하지 않습니다.")
+            sys.exit(1)
+        run_dry_run(reference_dir, args)
+        return
+    
+    # API 키 확인 (로컬 임베딩을 사용하면 인덱싱에는 필요 없음)
+    if os.getenv("EMBEDDING_PROVIDER", "openai") == "openai" and not os.getenv("OPENAI_API_KEY"):
         logger.error("❌ OPENAI_API_KEY가 설정되지 않았습니다.")
         logger.error("   .env 파일을 생성하고 API 키를 설정하세요.")
         logger.error("   자세한 내용은 README.md를 참고하세요.")
@@ -47,7 +180,14 @@ def main():
     
     # 기존 벡터 스토어 확인
     chroma_db_dir = Path("./chroma_db")
-    if chroma_db_dir.exists():
+    if args.incremental:
+        if chroma_db_dir.exists():
+            if args.report:
+                logger.warning("--report는 전체 생성과 --dry-run에서만 기록됩니다.")
+            run_incremental(reference_dir, args.workers)
+            return
+        logger.info("기존 벡터 데이터베이스가 없어 전체 생성을 진행합니다.")
+    elif chroma_db_dir.exists():
         response = input("\n⚠️  기존 벡터 데이터베이스가 존재합니다. 삭제하고 재생성하시겠습니까? (y/N): ")
         if response.lower() != 'y':
             logger.info("작업이 취소되었습니다.")
@@ -60,59 +200,45 @@ def main():
     
     print()
     print("-" * 60)
-    print("1단계: 문서 로딩")
+    print("1-2단계: 문서 로딩 및 벡터 데이터베이스 생성 (스트리밍)")
     print("-" * 60)
     
+    # 인덱싱 리포트 (파일별 파싱 시간/청크/토큰, 최대 메모리)
+    report = IndexingReport() if args.report else None
+    if report:
+        report.start()
+    
     try:
-        # 문서 로더 초기화
-        loader = DocumentLoader(str(reference_dir))
+        # 문서 로더와 벡터 스토어 관리자 초기화
+        loader = DocumentLoader(str(reference_dir), max_workers=args.workers, cache_dir=get_parse_cache_dir(args))
+        vs_manager = create_vs_manager()
+        file_paths = loader.find_documents()
         
-        # 문서 로드
-        logger.info("문서를 로드하는 중...")
-        documents = loader.load_documents()
+        # 파싱되는 문서를 바로 분할/임베딩하여 저장 (파싱과 임베딩 API 호출이 겹쳐 진행)
+        logger.info("문서를 로드하면서 벡터 임베딩을 생성하고 데이터베이스에 저장하는 중...")
+        logger.info("(문서 크기에 따라 5-10분 정도 걸릴 수 있습니다)")
+        start = time.perf_counter()
+        stats = full_index(loader, vs_manager, file_paths, manifest=IndexManifest(MANIFEST_PATH), report=report)
         
-        if not documents:
+        if not stats["documents"]:
             logger.error("❌ 로드된 문서가 없습니다.")
             sys.exit(1)
         
-        logger.info(f"✓ 총 {len(documents)}개의 문서가 로드되었습니다.")
+        logger.info(f"✓ 총 {stats['documents']}개의 문서, {stats['chunks']}개의 청크를 저장했습니다.")
         
         # 카테고리별 통계
-        categories = {}
-        for doc in documents:
-            category = doc.metadata.get('category', '기타')
-            categories[category] = categories.get(category, 0) + 1
-        
         print("\n카테고리별 문서 수:")
-        for category, count in sorted(categories.items()):
+        for category, count in sorted(stats["categories"].items()):
             print(f"  - {category}: {count}개")
         
-    except Exception as e:
-        logger.error(f"❌ 문서 로딩 중 오류 발생: {e}")
-        sys.exit(1)
-    
-    print()
-    print("-" * 60)
-    print("2단계: 벡터 데이터베이스 생성")
-    print("-" * 60)
-    
-    try:
-        # 벡터 스토어 관리자 초기화
-        vs_manager = VectorStoreManager(
-            persist_directory="./chroma_db",
-            chunk_size=1000,
-            chunk_overlap_percent=4.0  # 4% 오버랩 (40자)
-        )
-        
-        # 벡터 스토어 생성
-        logger.info("벡터 임베딩을 생성하고 데이터베이스에 저장하는 중...")
-        logger.info("청크 설정: size=1000, overlap=40 (4%)")
-        logger.info("(문서 크기에 따라 5-10분 정도 걸릴 수 있습니다)")
-        
-        vectorstore = vs_manager.create_vectorstore(documents, force_recreate=True)
-        
         logger.info("✓ 벡터 데이터베이스 생성 완료!")
         
+        if report:
+            report.record_stage("parse_split_embed_store", time.perf_counter() - start)
+            report.print_summary()
+            report.save(args.report)
+            report.stop()
+        
     except Exception as e:
         logger.error(f"❌ 벡터 데이터베이스 생성 중 오류 발생: {e}")
         sys.exit(1)
@@ -0,0 +1,247 @@
+"""답변 캐시 모듈 (정확 일치 + 의미 유사도 2단계, SQLite 기반)"""
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def normalize_question(question: str) -> str:
+    """
+    정확 일치 비교용으로 질문을 정규화합니다.
+
+    유니코드 정규화(NFKC), 소문자 변환, 문장부호 제거, 공백 정리를 수행합니다.
+    """
+    text = unicodedata.normalize("NFKC", question).lower()
+    text = re.sub(r"[^\w\s]", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class AnswerCache:
+    """RAG 답변 캐시 클래스"""
+
+    def __init__(
+        self,
+        path: str = "./answer_cache.db",
+        index_version: str = "",
+        semantic_threshold: float = 0.95,
+        ttl_seconds: float = 7 * 24 * 3600,
+        max_entries: int = 1000
+    ):
+        """
+        Args:
+            path: SQLite 캐시 파일 경로
+            index_version: 현재 벡터 인덱스 버전 (이 버전으로 만든 항목만 조회, 다른 버전의 항목은 삭제)
+            semantic_threshold: 의미 유사도 적중 기준 (코사인 유사도)
+            ttl_seconds: 항목 유효 시간 (초)
+            max_entries: 최대 항목 수 (초과 시 오래 사용되지 않은 항목부터 삭제)
+        """
+        self.path = path
+        self.index_version = index_version
+        self.semantic_threshold = semantic_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS answers (
+                key TEXT PRIMARY KEY,
+                index_version TEXT NOT NULL,
+                embedding BLOB,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+        # 의미 유사도 비교용 임베딩 행렬 (정규화된 벡터)
+        self._keys: List[str] = []
+        self._matrix: Optional[np.ndarray] = None
+        self.set_index_version(index_version)
+
+    def set_index_version(self, index_version: str):
+        """
+        인덱스 버전을 설정합니다. 다른 버전으로 만들어진 항목은 모두 삭제됩니다.
+
+        Args:
+            index_version: 벡터 인덱스 버전
+        """
+        with self._lock:
+            self.index_version = index_version
+            deleted = self._conn.execute(
+                "DELETE FROM answers WHERE index_version != ?", (index_version,)
+            ).rowcount
+            self._conn.execute(
+                "DELETE FROM answers WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            )
+            self._conn.commit()
+            self._reload_matrix()
+
+        if deleted:
+            logger.info(f"인덱스 버전이 바뀌어 답변 캐시 {deleted}개 항목을 삭제했습니다.")
+
+    def _make_key(self, question: str) -> str:
+        """정규화된 질문으로 캐시 키를 생성합니다."""
+        return hashlib.sha256(normalize_question(question).encode("utf-8")).hexdigest()
+
+    def _reload_matrix(self):
+        """의미 유사도 비교용 임베딩 행렬을 다시 읽습니다. (현재 인덱스 버전 항목만)"""
+        rows = self._conn.execute(
+            "SELECT key, embedding FROM answers WHERE embedding IS NOT NULL AND index_version = ?",
+            (self.index_version,)
+        ).fetchall()
+
+        self._keys = [key for key, _ in rows]
+        if rows:
+            self._matrix = np.vstack([np.frombuffer(blob, dtype=np.float32) for _, blob in rows])
+        else:
+            self._matrix = None
+
+    def _load(self, key: str) -> Optional[Dict[str, any]]:
+        """
+        키로 현재 인덱스 버전의 항목을 읽고, 만료되었으면 삭제합니다. (잠금 상태에서 호출)
+
+        캐시 파일을 공유하는 다른 프로세스가 이전 버전으로 쓴 항목은 읽지 않습니다.
+        """
+        row = self._conn.execute(
+            "SELECT result, created_at FROM answers WHERE key = ? AND index_version = ?",
+            (key, self.index_version)
+        ).fetchone()
+        if row is None:
+            return None
+
+        result, created_at = row
+        if time.time() - created_at > self.ttl_seconds:
+            self._conn.execute("DELETE FROM answers WHERE key = ?", (key,))
+            self._conn.commit()
+            self._reload_matrix()
+            return None
+
+        self._conn.execute("UPDATE answers SET last_used = ? WHERE key = ?", (time.time(), key))
+        self._conn.commit()
+        return json.loads(result)
+
+    def get_exact(self, question: str) -> Optional[Dict[str, any]]:
+        """
+        정규화된 질문이 정확히 같은 답변을 조회합니다.
+
+        Args:
+            question: 사용자 질문
+
+        Returns:
+            캐시된 결과 딕셔너리 또는 None
+        """
+        with self._lock:
+            result = self._load(self._make_key(question))
+            if result is not None:
+                self.exact_hits += 1
+        return result
+
+    def get_similar(self, embedding: List[float]) -> Optional[Dict[str, any]]:
+        """
+        질문 임베딩과 코사인 유사도가 기준 이상인 답변을 조회합니다.
+
+        Args:
+            embedding: 질문 임베딩
+
+        Returns:
+            캐시된 결과 딕셔너리 또는 None
+        """
+        with self._lock:
+            result = None
+            if self._matrix is not None:
+                query = self._normalize(embedding)
+                if query.shape[0] == self._matrix.shape[1]:
+                    scores = self._matrix @ query
+                    best = int(np.argmax(scores))
+                    if scores[best] >= self.semantic_threshold:
+                        result = self._load(self._keys[best])
+
+            if result is not None:
+                self.semantic_hits += 1
+            else:
+                self.misses += 1
+        return result
+
+    def put(self, question: str, embedding: Optional[List[float]], result: Dict[str, any]):
+        """
+        답변을 캐시에 저장합니다.
+
+        Args:
+            question: 사용자 질문
+            embedding: 질문 임베딩 (None이면 정확 일치로만 조회 가능)
+            result: 저장할 결과 딕셔너리
+        """
+        now = time.time()
+        blob = self._normalize(embedding).tobytes() if embedding is not None else None
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO answers (key, index_version, embedding, result, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self._make_key(question), self.index_version, blob,
+                 json.dumps(result, ensure_ascii=False), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+            self._reload_matrix()
+
+    def _evict(self):
+        """최대 항목 수를 초과하면 가장 오래 사용되지 않은 항목부터 삭제합니다."""
+        count = self._conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM answers WHERE key IN "
+                "(SELECT key FROM answers ORDER BY last_used ASC LIMIT ?)",
+                (overflow,)
+            )
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        """코사인 유사도 계산을 위해 벡터를 단위 길이로 정규화합니다."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def stats(self) -> Dict[str, float]:
+        """캐시 적중/미스 통계를 반환합니다."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+
+        lookups = self.exact_hits + self.semantic_hits + self.misses
+        return {
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": (self.exact_hits + self.semantic_hits) / lookups if lookups else 0.0,
+            "entries": entries,
+        }
+
+    def clear(self):
+        """캐시를 비웁니다."""
+        with self._lock:
+            self._conn.execute("DELETE FROM answers")
+            self._conn.commit()
+            self._reload_matrix()
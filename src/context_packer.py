@@ -0,0 +1,236 @@
+"""RAG 프롬프트 컨텍스트 구성 모듈 (토큰 예산 기반)"""
+
+import logging
+import math
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+from langchain_core.documents import Document
+
+from .regulation_splitter import format_article
+from .utils import count_tokens
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 문장 경계 (줄바꿈 또는 마침표/물음표/느낌표 뒤 공백)
+SENTENCE_SPLIT_PATTERN = re.compile(r"\n+|(?<=[.。!?])\s+")
+
+
+def _char_bigrams(text: str) -> Set[str]:
+    """공백을 제거한 문자 2-gram 집합 (한국어 질의-문장 겹침 판단용)"""
+    compact = re.sub(r"\s+", "", text)
+    return {compact[i:i + 2] for i in range(len(compact) - 1)}
+
+
+def _source_label(filename: str, docs: List[Document]) -> str:
+    """구절 머리글 (예: "파일명 p.3-4 제2조(정의)", 페이지/조문 정보가 없으면 파일명만)"""
+    label = filename
+    pages = sorted({doc.metadata["page"] for doc in docs if doc.metadata.get("page")})
+    if len(pages) == 1:
+        label += f" p.{pages[0]}"
+    elif pages:
+        label += f" p.{pages[0]}-{pages[-1]}"
+
+    # 병합된 구절은 첫 청크의 첫 조부터 마지막 청크의 마지막 조까지
+    articles = [doc.metadata for doc in docs if doc.metadata.get("article")]
+    if articles:
+        first = articles[0]["article"]
+        last = articles[-1].get("article_end") or articles[-1]["article"]
+        if first == last:
+            label += f" {format_article(articles[0])}"
+        else:
+            label += f" {format_article({'article': first, 'article_end': last})}"
+    return label
+
+
+class ContextPacker:
+    """검색된 청크를 토큰 예산에 맞춰 프롬프트 컨텍스트로 조립하는 클래스"""
+
+    def __init__(
+        self,
+        max_tokens: int = 3000,
+        max_score_gap: float = 0.3,
+        min_chunks: int = 1,
+        trim_sentences: bool = True,
+        sentence_window: int = 1,
+        model_name: str = "gpt-4-turbo-preview"
+    ):
+        """
+        Args:
+            max_tokens: 컨텍스트 최대 토큰 수
+            max_score_gap: 최고 점수와의 거리 차이가 이보다 큰 하위 청크는 제외
+            min_chunks: 점수와 관계없이 유지할 최소 청크 수
+            trim_sentences: 질문과 겹치는 내용이 없는 문장을 제거할지 여부
+            sentence_window: 관련 문장 앞뒤로 함께 유지할 문장 수
+            model_name: 토큰 수 계산에 사용할 모델 이름
+        """
+        self.max_tokens = max_tokens
+        self.max_score_gap = max_score_gap
+        self.min_chunks = max(1, min_chunks)
+        self.trim_sentences = trim_sentences
+        self.sentence_window = sentence_window
+        self.model_name = model_name
+
+    def pack(
+        self,
+        question: str,
+        search_results: List[Tuple[Document, float]]
+    ) -> Tuple[str, List[Document]]:
+        """
+        검색 결과로 프롬프트 컨텍스트를 구성합니다.
+
+        1. 최고 점수와 차이가 큰 하위 청크 제외
+        2. 같은 파일의 인접/중복 청크 병합
+        3. 질문과 관련 없는 문장 제거
+        4. 토큰 예산에 맞게 순위 순으로 채움 (넘치는 구절은 잘라 넣고 남은 예산에 들어가는 구절을 계속 추가)
+
+        Args:
+            question: 사용자 질문
+            search_results: (문서, 거리) 튜플 리스트 (순위 순, 어휘 검색으로만 찾은 청크는 거리 inf)
+
+        Returns:
+            (컨텍스트 문자열, 컨텍스트에 사용된 원본 청크 리스트)
+        """
+        kept = self._drop_low_scores(search_results)
+        passages = self._merge_chunks(kept)
+
+        query_bigrams = _char_bigrams(question)
+        parts: List[str] = []
+        used_docs: List[Document] = []
+        remaining = self.max_tokens
+
+        for filename, text, docs in passages:
+            if self.trim_sentences:
+                text = self._trim_irrelevant(text, query_bigrams)
+
+            part = f"[{_source_label(filename, docs)}]\n{text}"
+            tokens = count_tokens(part, self.model_name)
+
+            if tokens > remaining:
+                # 남은 예산만큼 문장 단위로 잘라서 넣고, 뒤 순위의 짧은 구절로 계속 채움
+                part = self._truncate_to_budget(part, remaining)
+                if not part:
+                    continue
+                tokens = count_tokens(part, self.model_name)
+
+            parts.append(part)
+            used_docs.extend(docs)
+            remaining -= tokens
+            if remaining <= 0:
+                break
+
+        context = "\n\n".join(parts)
+        logger.debug(
+            f"컨텍스트 구성: 검색 {len(search_results)}개 → 사용 {len(used_docs)}개 청크, "
+            f"{self.max_tokens - remaining} 토큰"
+        )
+        return context, used_docs
+
+    def _drop_low_scores(self, search_results: List[Tuple[Document, float]]) -> List[Tuple[Document, float]]:
+        """
+        최고 점수와의 거리 차이로 하위 청크를 제외합니다.
+
+        하이브리드 검색 결과는 RRF 순이라 거리가 순위대로 늘어나지 않으므로 청크마다 비교하고,
+        벡터 거리가 없는(inf, 어휘 검색으로만 찾은) 청크는 제외하지 않습니다.
+        """
+        if not search_results:
+            return []
+
+        finite = [score for _, score in search_results if math.isfinite(score)]
+        best_score = min(finite) if finite else 0.0
+        kept = []
+        for i, (doc, score) in enumerate(search_results):
+            if i >= self.min_chunks and math.isfinite(score) and score - best_score > self.max_score_gap:
+                continue
+            kept.append((doc, score))
+        return kept
+
+    def _merge_chunks(self, results: List[Tuple[Document, float]]) -> List[Tuple[str, str, List[Document]]]:
+        """
+        같은 파일에서 나온 인접/중복 청크를 하나의 구절로 병합합니다.
+
+        Returns:
+            순위 순 (파일명, 구절 텍스트, 원본 청크 리스트) 리스트 (구절의 순위는 포함된 청크 중 최고 순위)
+        """
+        # 파일별로 (검색 순위, 청크)를 묶음
+        groups: Dict[str, List[Tuple[int, Document]]] = {}
+        for rank, (doc, _) in enumerate(results):
+            groups.setdefault(doc.metadata.get("source", ""), []).append((rank, doc))
+
+        # (최고 순위, 파일명, 구절 텍스트, 원본 청크 리스트)
+        passages: List[Tuple[int, str, str, List[Document]]] = []
+        for ranked in groups.values():
+            filename = ranked[0][1].metadata.get("filename", "Unknown")
+            if all("start_index" in doc.metadata for _, doc in ranked):
+                ranked = sorted(ranked, key=lambda item: item[1].metadata["start_index"])
+
+            best_rank, first = ranked[0]
+            merged_text = first.page_content
+            merged_docs = [first]
+            merged_end = first.metadata.get("start_index", 0) + len(first.page_content)
+
+            for rank, doc in ranked[1:]:
+                joined = self._join_if_adjacent(merged_text, merged_end, doc)
+                if joined is None:
+                    passages.append((best_rank, filename, merged_text, merged_docs))
+                    best_rank = rank
+                    merged_text = doc.page_content
+                    merged_docs = [doc]
+                else:
+                    best_rank = min(best_rank, rank)
+                    merged_text = joined
+                    merged_docs.append(doc)
+                merged_end = max(merged_end, doc.metadata.get("start_index", 0) + len(doc.page_content))
+
+            passages.append((best_rank, filename, merged_text, merged_docs))
+
+        passages.sort(key=lambda passage: passage[0])
+        return [(filename, text, docs) for _, filename, text, docs in passages]
+
+    @staticmethod
+    def _join_if_adjacent(text: str, end: int, doc: Document) -> Optional[str]:
+        """두 청크가 이어지거나 겹치면 중복 없이 이어붙인 텍스트를, 아니면 None을 반환합니다."""
+        start = doc.metadata.get("start_index")
+        if start is not None:
+            if start > end:
+                return None
+            return text + doc.page_content[end - start:]
+
+        # start_index가 없는 기존 인덱스: 앞 청크의 끝과 뒤 청크의 시작이 겹치는지 확인
+        content = doc.page_content
+        for size in range(min(len(text), len(content)) // 2, 10, -1):
+            if text.endswith(content[:size]):
+                return text + content[size:]
+        return None
+
+    def _trim_irrelevant(self, text: str, query_bigrams: Set[str]) -> str:
+        """질문과 겹치는 문장과 그 주변 문장만 남깁니다. (겹치는 문장이 없으면 그대로 유지)"""
+        sentences = [s for s in SENTENCE_SPLIT_PATTERN.split(text) if s and s.strip()]
+        if not sentences or not query_bigrams:
+            return text
+
+        relevant = [i for i, s in enumerate(sentences) if _char_bigrams(s) & query_bigrams]
+        if not relevant:
+            return text
+
+        keep = set()
+        for i in relevant:
+            keep.update(range(max(0, i - self.sentence_window), min(len(sentences), i + self.sentence_window + 1)))
+
+        return "\n".join(sentences[i] for i in sorted(keep))
+
+    def _truncate_to_budget(self, text: str, budget: int) -> str:
+        """문장 단위로 앞에서부터 예산 안에 들어가는 만큼만 남깁니다."""
+        kept = []
+        used = 0
+        for sentence in text.split("\n"):
+            tokens = count_tokens(sentence + "\n", self.model_name)
+            if used + tokens > budget:
+                break
+            kept.append(sentence)
+            used += tokens
+
+        # 파일명 헤더만 남은 경우는 제외
+        return "\n".join(kept) if len(kept) > 1 else ""
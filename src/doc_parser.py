@@ -0,0 +1,159 @@
+"""
+레거시 Word(.doc, Word 97-2003 바이너리) 텍스트 추출 모듈
+
+MS-DOC 형식의 조각 테이블(piece table)을 직접 읽어 본문 텍스트를 추출합니다.
+Word나 외부 변환 프로세스 없이 동작하므로 Linux/클라우드에서도 .doc 파일을 처리할 수 있습니다.
+"""
+
+import logging
+import re
+import struct
+from pathlib import Path
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# FIB(File Information Block) 필드 위치
+WORD_IDENT = 0xA5EC
+FIB_FLAGS_OFFSET = 0x0A
+FIB_ENCRYPTED = 0x0100
+FIB_WHICH_TABLE = 0x0200
+FIB_CCP_TEXT_OFFSET = 0x4C
+FIB_FC_CLX_OFFSET = 0x01A2
+# Word 97 이상 (nFib 193 이상)
+MIN_NFIB = 0x00C1
+
+# 압축(8비트) 조각에서 cp1252와 다르게 해석하는 문자 (MS-DOC 2.4.1)
+COMPRESSED_OVERRIDES = {
+    0x82: "‚", 0x83: "ƒ", 0x84: "„", 0x85: "…", 0x86: "†", 0x87: "‡",
+    0x88: "ˆ", 0x89: "‰", 0x8A: "Š", 0x8B: "‹", 0x8C: "Œ", 0x91: "‘",
+    0x92: "’", 0x93: "“", 0x94: "”", 0x95: "•", 0x96: "–", 0x97: "—",
+    0x98: "˜", 0x99: "™", 0x9A: "š", 0x9B: "›", 0x9C: "œ", 0x9F: "Ÿ",
+}
+
+# 필드 구분 문자 (\x13 코드 \x14 결과 \x15)
+FIELD_BEGIN, FIELD_SEPARATOR, FIELD_END = "\x13", "\x14", "\x15"
+# 그림/개체/각주 참조 등 텍스트가 아닌 특수 문자
+CONTROL_PATTERN = re.compile(r"[\x00-\x06\x08\x0e-\x12\x14-\x1d\x1f]")
+
+
+def _decode_compressed(data: bytes) -> str:
+    """압축(8비트) 조각을 디코딩합니다."""
+    text = data.decode("cp1252", errors="replace")
+    if any(byte in COMPRESSED_OVERRIDES for byte in data):
+        text = "".join(COMPRESSED_OVERRIDES.get(byte, char) for byte, char in zip(data, text))
+    return text
+
+
+def _read_pieces(clx: bytes):
+    """
+    CLX 구조에서 조각 테이블(PlcPcd)을 찾아 (시작 CP, 끝 CP, fc, 압축 여부) 목록을 반환합니다.
+    """
+    pos = 0
+    # 서식 정보(Prc)는 건너뜀
+    while pos < len(clx) and clx[pos] == 0x01:
+        (cb_grpprl,) = struct.unpack_from("<h", clx, pos + 1)
+        pos += 3 + cb_grpprl
+    if pos >= len(clx) or clx[pos] != 0x02:
+        raise ValueError("조각 테이블(Pcdt)을 찾을 수 없습니다.")
+
+    (lcb,) = struct.unpack_from("<I", clx, pos + 1)
+    plc = clx[pos + 5:pos + 5 + lcb]
+    count = (lcb - 4) // 12
+    cps = struct.unpack_from(f"<{count + 1}I", plc, 0)
+
+    pieces = []
+    for index in range(count):
+        (fc,) = struct.unpack_from("<I", plc, 4 * (count + 1) + 8 * index + 2)
+        compressed = bool(fc & 0x40000000)
+        fc &= 0x3FFFFFFF
+        pieces.append((cps[index], cps[index + 1], fc // 2 if compressed else fc, compressed))
+    return pieces
+
+
+def extract_doc_text(file_path: Path) -> str:
+    """
+    .doc 파일의 본문 텍스트를 추출합니다.
+
+    단락은 줄바꿈, 표의 셀은 " | "로 구분합니다. 머리글/바닥글/각주는 제외합니다.
+
+    Args:
+        file_path: .doc 파일 경로
+
+    Returns:
+        본문 텍스트
+
+    Raises:
+        ValueError: Word 97-2003 형식이 아니거나 암호화된 파일
+    """
+    import olefile
+
+    if not olefile.isOleFile(str(file_path)):
+        raise ValueError("OLE 복합 문서가 아닙니다.")
+
+    with olefile.OleFileIO(str(file_path)) as ole:
+        if not ole.exists("WordDocument"):
+            raise ValueError("WordDocument 스트림이 없습니다.")
+        word_document = ole.openstream("WordDocument").read()
+
+        ident, nfib = struct.unpack_from("<HH", word_document, 0)
+        (flags,) = struct.unpack_from("<H", word_document, FIB_FLAGS_OFFSET)
+        if ident != WORD_IDENT or nfib < MIN_NFIB:
+            raise ValueError(f"지원하지 않는 Word 버전입니다 (nFib={nfib}).")
+        if flags & FIB_ENCRYPTED:
+            raise ValueError("암호화된 문서입니다.")
+
+        table_name = "1Table" if flags & FIB_WHICH_TABLE else "0Table"
+        if not ole.exists(table_name):
+            raise ValueError(f"{table_name} 스트림이 없습니다.")
+        table = ole.openstream(table_name).read()
+
+    (ccp_text,) = struct.unpack_from("<i", word_document, FIB_CCP_TEXT_OFFSET)
+    fc_clx, lcb_clx = struct.unpack_from("<II", word_document, FIB_FC_CLX_OFFSET)
+
+    # 본문은 CP 0 ~ ccpText 구간 (이후는 각주, 머리글 등)
+    parts = []
+    for cp_start, cp_end, fc, compressed in _read_pieces(table[fc_clx:fc_clx + lcb_clx]):
+        cp_end = min(cp_end, ccp_text)
+        if cp_start >= cp_end:
+            continue
+        length = cp_end - cp_start
+        if compressed:
+            parts.append(_decode_compressed(word_document[fc:fc + length]))
+        else:
+            parts.append(word_document[fc:fc + 2 * length].decode("utf-16-le", errors="replace"))
+
+    return _normalize("".join(parts))
+
+
+def _strip_field_codes(text: str) -> str:
+    """필드 코드(예: PAGE, HYPERLINK)는 버리고 표시되는 결과만 남깁니다. (중첩 필드 지원)"""
+    if FIELD_BEGIN not in text:
+        return text
+
+    output = []
+    # 열린 필드마다 코드 부분을 읽는 중인지 여부
+    in_code = []
+    for char in text:
+        if char == FIELD_BEGIN:
+            in_code.append(True)
+        elif char == FIELD_SEPARATOR and in_code:
+            in_code[-1] = False
+        elif char == FIELD_END and in_code:
+            in_code.pop()
+        elif not any(in_code):
+            output.append(char)
+    return "".join(output)
+
+
+def _normalize(text: str) -> str:
+    """Word 특수 문자를 일반 텍스트로 바꿉니다."""
+    text = _strip_field_codes(text)
+
+    # 표: 셀 끝(\x07)은 구분자, 행 끝은 셀 끝 두 개가 이어짐
+    text = text.replace("\x07\x07", "\n").replace("\x07", " | ")
+    text = text.replace("\r", "\n").replace("\x0b", "\n").replace("\x0c", "\n")
+    text = text.replace("\x1e", "-").replace("\xa0", " ")
+    text = CONTROL_PATTERN.sub("", text)
+    return text
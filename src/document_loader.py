@@ -1,77 +1,346 @@
 """문서 로딩 및 파싱 모듈"""
 
 import os
+import math
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, Deque, Iterator, List, Dict, Optional, Tuple
 import logging
 
-import docx2txt
-from docx import Document
-import openpyxl
-from PyPDF2 import PdfReader
 from langchain_core.documents import Document as LangchainDocument
 
-from .utils import get_all_documents, extract_category_from_path, clean_text
+from .utils import get_all_documents, extract_category_from_path, clean_text, compute_file_hash
+from .parse_cache import ParsedTextCache
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 페이지 구분 문자 (파서 출력과 파싱 캐시에서 PDF 페이지 경계를 표시)
+PAGE_BREAK = "\f"
+
 
 class DocumentLoader:
     """문서 로더 클래스"""
     
-    def __init__(self, root_dir: str):
+    # 파서 로직이나 clean_text가 바뀌면 올려서 파싱 캐시를 무효화
+    PARSER_VERSION = "4"
+    # 페이지 단위 메타데이터를 만드는 형식
+    PAGED_EXTENSIONS = ('.pdf',)
+    # 병렬 파싱 시 PDF를 나누는 최소 페이지 범위 (이보다 2배 이상 긴 PDF만 나눔)
+    PDF_PAGES_PER_TASK = 16
+    
+    def __init__(self, root_dir: str, max_workers: int = 1, cache_dir: Optional[str] = None):
         """
         Args:
             root_dir: 문서가 있는 루트 디렉토리
+            max_workers: 병렬 파싱 프로세스 수 (1이면 순차 처리)
+            cache_dir: 파싱 결과 캐시 디렉토리 (None이면 캐시 미사용)
         """
         self.root_dir = root_dir
+        self.max_workers = max(1, max_workers)
+        self.cache_dir = cache_dir
+        self.parse_cache = ParsedTextCache(cache_dir, self.PARSER_VERSION) if cache_dir else None
+        # 마지막 load_documents 호출의 파일별 처리 시간 (파일명, 초)
+        self.file_timings: List[Tuple[str, float]] = []
         self.supported_parsers = {
             '.docx': self._parse_docx,
             '.doc': self._parse_doc,
             '.xlsx': self._parse_xlsx,
-            '.xls': self._parse_xlsx,
+            '.xls': self._parse_xls,
             '.pdf': self._parse_pdf,
         }
     
-    def load_documents(self) -> List[LangchainDocument]:
+    def find_documents(self) -> List[Path]:
+        """
+        로드 대상 문서 파일 목록을 반환합니다. (zip 파일 제외)
+        
+        Returns:
+            파일 경로 리스트
+        """
+        return get_all_documents(self.root_dir, exclude_extensions=['.zip'])
+    
+    def load_documents(self, file_paths: Optional[List[Path]] = None) -> List[LangchainDocument]:
         """
         모든 문서를 로드하고 파싱합니다.
         
+        Args:
+            file_paths: 로드할 파일 목록 (None이면 루트 디렉토리의 모든 문서)
+        
         Returns:
             LangchainDocument 리스트
         """
+        return list(self.iter_documents(file_paths))
+    
+    def iter_documents(
+        self,
+        file_paths: Optional[List[Path]] = None,
+        on_file: Optional[Callable[[Path, Optional[LangchainDocument], Optional[str], float], None]] = None
+    ) -> Iterator[LangchainDocument]:
+        """
+        문서를 파싱되는 대로 하나씩 반환합니다. (스트리밍 인덱싱용)
+        
+        병렬 파싱 시에도 앞서 제출된 파일 몇 개만 메모리에 두므로 문서 수와 무관하게 메모리가 일정합니다.
+        
+        Args:
+            file_paths: 로드할 파일 목록 (None이면 루트 디렉토리의 모든 문서)
+            on_file: 파일마다 (경로, 문서 또는 None, 오류 메시지 또는 None, 소요 시간)으로 호출할 함수
+        
+        Yields:
+            내용이 있는 LangchainDocument (입력 순서)
+        """
         # zip 파일 제외하고 모든 문서 찾기
-        file_paths = get_all_documents(self.root_dir, exclude_extensions=['.zip'])
+        if file_paths is None:
+            file_paths = self.find_documents()
         
         logger.info(f"총 {len(file_paths)}개의 문서를 발견했습니다.")
         
-        documents = []
+        loaded = 0
         failed_files = []
+        self.file_timings = []
+        start = time.perf_counter()
         
-        for file_path in file_paths:
-            try:
-                doc = self._load_single_document(file_path)
-                if doc and doc.page_content.strip():
-                    documents.append(doc)
-                    logger.info(f"✓ 로드 성공: {file_path.name}")
-                else:
-                    logger.warning(f"⚠ 내용 없음: {file_path.name}")
-            except Exception as e:
-                logger.error(f"✗ 로드 실패: {file_path.name} - {str(e)}")
-                failed_files.append((file_path.name, str(e)))
+        for file_path, (doc, error, elapsed) in zip(file_paths, self._iter_parsed(file_paths)):
+            self.file_timings.append((file_path.name, elapsed))
+            if on_file:
+                on_file(file_path, doc, error, elapsed)
+            if error is not None:
+                logger.error(f"✗ 로드 실패: {file_path.name} - {error}")
+                failed_files.append((file_path.name, error))
+            elif doc and doc.page_content.strip():
+                loaded += 1
+                logger.info(f"✓ 로드 성공: {file_path.name} ({elapsed:.2f}초)")
+                yield doc
+            else:
+                logger.warning(f"⚠ 내용 없음: {file_path.name}")
         
         logger.info(f"\n=== 로딩 완료 ===")
-        logger.info(f"성공: {len(documents)}개")
+        logger.info(f"성공: {loaded}개")
         logger.info(f"실패: {len(failed_files)}개")
+        logger.info(f"소요 시간: {time.perf_counter() - start:.1f}초 (프로세스 {self.max_workers}개)")
         
         if failed_files:
             logger.warning("\n실패한 파일 목록:")
             for filename, error in failed_files:
                 logger.warning(f"  - {filename}: {error}")
+    
+    def _iter_parsed(self, file_paths: List[Path]) -> Iterator[Tuple[Optional[LangchainDocument], Optional[str], float]]:
+        """
+        파일들을 파싱합니다. max_workers > 1이면 프로세스 풀에서 병렬로 처리합니다.
         
-        return documents
+        긴 PDF는 페이지 범위로 나누어 여러 프로세스가 함께 추출하므로 한 파일이 전체 로딩을 지연시키지 않습니다.
+        PDF의 내용 해시/파싱 캐시 조회와 페이지 수 확인도 워커에서 하므로 메인 프로세스는 파일을 열지 않습니다.
+        한 번에 제출하는 파일은 프로세스 수의 2배까지이며, 결과를 소비해야 다음 파일을 제출합니다.
+        
+        Args:
+            file_paths: 파일 경로 리스트
+        
+        Yields:
+            입력 순서와 같은 (문서, 오류 메시지, 소요 시간) 튜플
+        """
+        if self.max_workers == 1 or not file_paths or (
+            len(file_paths) == 1 and file_paths[0].suffix.lower() != '.pdf'
+        ):
+            for file_path in file_paths:
+                yield self._timed_load(file_path)
+            return
+        
+        workers = self.max_workers
+        logger.info(f"{workers}개 프로세스로 병렬 파싱합니다.")
+        
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            # [파일 경로, 상태, 내용] 리스트
+            # 상태: "file"(파일 작업 future), "probe"(PDF 확인 작업 future),
+            #       "ranges"((PDF 내용 해시, 페이지 범위 작업 future 리스트)), "done"(로드 결과),
+            #       "retry"(풀이 깨져 결과를 받지 못한 파일, 단독 프로세스에서 다시 로드)
+            pending: Deque[list] = deque()
+            next_index = 0
+            
+            while pending or next_index < len(file_paths):
+                try:
+                    while next_index < len(file_paths) and len(pending) < 2 * workers:
+                        file_path = file_paths[next_index]
+                        if file_path.suffix.lower() == '.pdf':
+                            future = executor.submit(_probe_pdf_task, self.root_dir, self.cache_dir, file_path, workers)
+                            pending.append([file_path, "probe", future])
+                        else:
+                            future = executor.submit(_load_file_task, self.root_dir, self.cache_dir, file_path)
+                            pending.append([file_path, "file", future])
+                        next_index += 1
+                    
+                    self._wait_for_head(executor, pending)
+                    
+                    # 입력 순서대로 결과를 반환하므로 결과 순서가 결정적임
+                    file_path, state, payload = pending[0]
+                    if state == "ranges":
+                        result = self._assemble_pdf(file_path, *payload)
+                    elif state == "done":
+                        result = payload
+                    elif state == "retry":
+                        result = self._load_isolated(file_path)
+                    else:
+                        result = payload.result()
+                except BrokenProcessPool:
+                    executor = self._restart_pool(executor, pending)
+                    continue
+                
+                pending.popleft()
+                yield result
+        finally:
+            executor.shutdown()
+    
+    def _restart_pool(self, executor: ProcessPoolExecutor, pending: Deque[list]) -> ProcessPoolExecutor:
+        """
+        워커 프로세스가 비정상 종료되어 깨진 프로세스 풀을 새로 만듭니다.
+        
+        이미 끝난 작업의 결과는 유지하고, 결과를 받지 못한 파일은 "retry"로 바꿉니다.
+        풀이 깨지면 실행 중이던 모든 작업이 함께 실패하므로 원인 파일을 가리기 위해
+        "retry" 파일은 차례가 되면 단독 프로세스에서 다시 로드합니다. (_load_isolated)
+        
+        Returns:
+            새 프로세스 풀
+        """
+        logger.warning(f"파싱 프로세스가 비정상 종료되어 프로세스 풀을 다시 만듭니다. (대기 중인 파일 {len(pending)}개)")
+        executor.shutdown(wait=False, cancel_futures=True)
+        
+        for entry in pending:
+            state, payload = entry[1:]
+            if state in ("file", "probe"):
+                futures = [payload]
+            elif state == "ranges":
+                futures = payload[1]
+            else:
+                continue
+            
+            if not all(future.done() and future.exception() is None for future in futures):
+                entry[1:] = ["retry", None]
+            elif state == "file":
+                entry[1:] = ["done", payload.result()]
+        
+        return ProcessPoolExecutor(max_workers=self.max_workers)
+    
+    def _load_isolated(self, file_path: Path) -> Tuple[Optional[LangchainDocument], Optional[str], float]:
+        """
+        단독 프로세스에서 파일을 로드합니다. 이 프로세스도 비정상 종료되면 해당 파일을 실패로 반환합니다.
+        
+        Returns:
+            (문서, 오류 메시지, 소요 시간) 튜플
+        """
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            try:
+                return executor.submit(_load_file_task, self.root_dir, self.cache_dir, file_path).result()
+            except BrokenProcessPool:
+                return None, "파싱 프로세스가 비정상 종료되었습니다.", time.perf_counter() - start
+    
+    def _wait_for_head(self, executor: ProcessPoolExecutor, pending: Deque[list]):
+        """
+        맨 앞 파일의 결과가 준비될 때까지 기다립니다.
+        
+        기다리는 동안 페이지 수 확인이 끝난 PDF는 순서와 관계없이 바로 처리하여, 긴 PDF의
+        페이지 범위 작업이 앞 파일을 기다리지 않고 제출되도록 합니다.
+        """
+        while True:
+            probes = []
+            for entry in pending:
+                file_path, state, future = entry
+                if state != "probe":
+                    continue
+                if not future.done():
+                    probes.append(future)
+                    continue
+                
+                result, plan = future.result()
+                if plan is None:
+                    entry[1:] = ["done", result]
+                else:
+                    content_hash, ranges = plan
+                    futures = [executor.submit(_extract_pdf_pages_task, str(file_path), start, end) for start, end in ranges]
+                    entry[1:] = ["ranges", (content_hash, futures)]
+            
+            _, state, payload = pending[0]
+            if state in ("done", "retry"):
+                return
+            head = payload[1] if state == "ranges" else [payload]
+            unfinished = [future for future in head if not future.done()]
+            if not unfinished:
+                return
+            wait(unfinished + probes, return_when=FIRST_COMPLETED)
+    
+    def _plan_pdf_ranges(self, file_path: Path) -> Optional[Tuple[Optional[str], List[Tuple[int, int]]]]:
+        """
+        긴 PDF를 병렬 추출할 페이지 범위로 나눕니다. (PDF가 아니거나, 파싱 캐시에 있거나, 짧으면 None)
+        
+        파일 해시와 페이지 수 확인에 파일 전체를 읽으므로 워커 프로세스(_probe_pdf_task)에서 호출합니다.
+        
+        Returns:
+            (내용 해시, [(시작 페이지, 끝 페이지), ...]) 또는 None
+        """
+        if file_path.suffix.lower() != '.pdf':
+            return None
+        
+        content_hash = None
+        if self.parse_cache:
+            content_hash = compute_file_hash(file_path)
+            if self.parse_cache.get(content_hash, '.pdf') is not None:
+                return None
+        
+        try:
+            from PyPDF2 import PdfReader
+            
+            page_count = len(PdfReader(str(file_path)).pages)
+        except Exception:
+            # 열 수 없는 파일은 파일 단위 작업에서 오류를 기록
+            return None
+        
+        if page_count < 2 * self.PDF_PAGES_PER_TASK:
+            return None
+        size = max(self.PDF_PAGES_PER_TASK, math.ceil(page_count / self.max_workers))
+        return content_hash, [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+    
+    def _assemble_pdf(
+        self,
+        file_path: Path,
+        content_hash: Optional[str],
+        futures: list
+    ) -> Tuple[Optional[LangchainDocument], Optional[str], float]:
+        """
+        페이지 범위별 추출 결과를 합쳐 문서를 만들고 (문서, 오류 메시지, 소요 시간)을 반환합니다.
+        
+        조문이 페이지 범위를 넘어 이어지고 start_index/page_starts가 문서 전체 기준이어야 하므로,
+        범위별 문서를 따로 내보내지 않고 모든 범위를 합친 한 문서로 분할기에 넘깁니다.
+        """
+        elapsed = 0.0
+        pages = []
+        try:
+            for future in futures:
+                range_pages, range_elapsed = future.result()
+                pages.extend(range_pages)
+                elapsed += range_elapsed
+            
+            start = time.perf_counter()
+            cleaned_text = self._clean_and_cache(PAGE_BREAK.join(pages), '.pdf', content_hash)
+            doc = self._build_document(file_path, '.pdf', cleaned_text) if cleaned_text else None
+            return doc, None, elapsed + time.perf_counter() - start
+        except BrokenProcessPool:
+            # 풀을 다시 만들고 파일을 다시 로드하도록 호출자에게 전달
+            raise
+        except Exception as e:
+            logger.error(f"PDF 파싱 실패: {file_path.name} - {str(e)}")
+            return None, str(e), elapsed
+    
+    def _timed_load(self, file_path: Path) -> Tuple[Optional[LangchainDocument], Optional[str], float]:
+        """단일 문서를 로드하고 (문서, 오류 메시지, 소요 시간)을 반환합니다."""
+        start = time.perf_counter()
+        try:
+            doc = self._load_single_document(file_path)
+            return doc, None, time.perf_counter() - start
+        except Exception as e:
+            return None, str(e), time.perf_counter() - start
     
     def _load_single_document(self, file_path: Path) -> Optional[LangchainDocument]:
         """
@@ -90,15 +359,19 @@ class DocumentLoader:
             logger.warning(f"지원하지 않는 파일 형식: {ext}")
             return None
         
-        # 텍스트 추출
-        text = parser(file_path)
-        
-        if not text or not text.strip():
+        cleaned_text = self._extract_text(file_path, ext, parser)
+        if not cleaned_text:
             return None
         
-        # 텍스트 정리
-        cleaned_text = clean_text(text)
+        return self._build_document(file_path, ext, cleaned_text)
+    
+    def _build_document(self, file_path: Path, ext: str, cleaned_text: str) -> LangchainDocument:
+        """
+        정리된 텍스트로 문서를 만듭니다.
         
+        PDF는 페이지를 줄바꿈으로 이어 붙이고 각 페이지의 시작 위치를 metadata["page_starts"]에 기록합니다.
+        (VectorStoreManager.split_documents가 페이지별로 분할하여 청크마다 page 번호를 남김)
+        """
         # 메타데이터 생성
         category = extract_category_from_path(file_path, self.root_dir)
         metadata = {
@@ -108,15 +381,75 @@ class DocumentLoader:
             'file_type': ext,
         }
         
+        if ext in self.PAGED_EXTENSIONS:
+            pages = cleaned_text.split(PAGE_BREAK)
+            page_starts = []
+            offset = 0
+            for page in pages:
+                page_starts.append(offset)
+                offset += len(page) + 1
+            metadata['page_starts'] = page_starts
+            cleaned_text = '\n'.join(pages)
+        
         return LangchainDocument(
             page_content=cleaned_text,
             metadata=metadata
         )
     
+    def _extract_text(self, file_path: Path, ext: str, parser) -> str:
+        """
+        정리된 텍스트를 추출합니다. 파싱 캐시가 있으면 먼저 조회합니다.
+        
+        Args:
+            file_path: 파일 경로
+            ext: 파일 확장자
+            parser: 확장자별 파서 함수
+        
+        Returns:
+            정리된 텍스트 (내용이 없으면 빈 문자열)
+        """
+        content_hash = None
+        if self.parse_cache:
+            content_hash = compute_file_hash(file_path)
+            cached = self.parse_cache.get(content_hash, ext)
+            if cached is not None:
+                logger.debug(f"파싱 캐시 적중: {file_path.name}")
+                return cached
+        
+        # 텍스트 추출
+        text = parser(file_path)
+        return self._clean_and_cache(text, ext, content_hash)
+    
+    def _clean_and_cache(self, text: str, ext: str, content_hash: Optional[str]) -> str:
+        """
+        추출한 텍스트를 정리하고 파싱 캐시에 저장합니다.
+        
+        Args:
+            text: 파서가 추출한 텍스트 (PDF는 페이지를 PAGE_BREAK로 구분)
+            ext: 파일 확장자
+            content_hash: 원본 파일 내용 해시 (캐시 미사용 시 None)
+        
+        Returns:
+            정리된 텍스트 (내용이 없으면 빈 문자열)
+        """
+        if not text or not text.strip():
+            # 파서가 건너뛴 경우(예: win32com 없음)는 캐시하지 않음
+            return ""
+        
+        # 텍스트 정리 (페이지 경계는 유지)
+        cleaned_text = PAGE_BREAK.join(clean_text(page) for page in text.split(PAGE_BREAK))
+        
+        if self.parse_cache and content_hash:
+            self.parse_cache.put(content_hash, ext, cleaned_text)
+        
+        return cleaned_text
+    
     def _parse_docx(self, file_path: Path) -> str:
         """DOCX 파일 파싱"""
         try:
-            # 방법 1: python-docx 사용
+            # 방법 1: python-docx 사용 (파서 의존성은 해당 형식을 처리할 때만 로드)
+            from docx import Document
+            
             doc = Document(str(file_path))
             text_parts = []
             
@@ -135,6 +468,8 @@ class DocumentLoader:
         except:
             # 방법 2: docx2txt 사용 (fallback)
             try:
+                import docx2txt
+                
                 return docx2txt.process(str(file_path))
             except Exception as e:
                 logger.error(f"DOCX 파싱 실패: {file_path.name} - {str(e)}")
@@ -143,19 +478,23 @@ class DocumentLoader:
     def _parse_doc(self, file_path: Path) -> str:
         """DOC 파일 파싱 (레거시 형식)"""
         try:
-            # Windows에서는 win32com 사용
-            import win32com.client
-            
-            word = win32com.client.Dispatch("Word.Application")
-            word.Visible = False
+            # 방법 1: Word 97-2003 바이너리를 직접 읽기 (Linux 포함 모든 플랫폼)
+            from .doc_parser import extract_doc_text
             
+            return extract_doc_text(file_path)
+        except ImportError:
+            logger.warning("olefile을 사용할 수 없습니다. .doc 파일은 win32com으로만 처리합니다.")
+        except Exception as e:
+            logger.warning(f"DOC 직접 파싱 실패, Word로 재시도: {file_path.name} - {str(e)}")
+        
+        try:
+            # 방법 2: Windows에서는 프로세스당 하나의 Word 인스턴스를 재사용 (fallback)
+            word = _get_word_application()
+            doc = word.Documents.Open(str(file_path.absolute()), ReadOnly=True)
             try:
-                doc = word.Documents.Open(str(file_path.absolute()))
-                text = doc.Content.Text
-                doc.Close(False)
-                return text
+                return doc.Content.Text
             finally:
-                word.Quit()
+                doc.Close(False)
         except ImportError:
             logger.warning(f"win32com을 사용할 수 없습니다. .doc 파일을 건너뜁니다: {file_path.name}")
             return ""
@@ -164,43 +503,188 @@ class DocumentLoader:
             return ""
     
     def _parse_xlsx(self, file_path: Path) -> str:
-        """XLSX/XLS 파일 파싱"""
+        """XLSX 파일 파싱 (읽기 전용 모드로 행 단위 스트리밍)"""
         try:
-            workbook = openpyxl.load_workbook(file_path, data_only=True)
-            text_parts = []
+            import openpyxl
             
-            for sheet_name in workbook.sheetnames:
-                sheet = workbook[sheet_name]
-                text_parts.append(f"\n=== {sheet_name} ===\n")
+            # read_only: 셀 객체를 한꺼번에 만들지 않고 시트 XML을 행 단위로 읽음
+            workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+            try:
+                text_parts = []
                 
-                for row in sheet.iter_rows(values_only=True):
-                    row_text = ' | '.join([str(cell) if cell is not None else '' for cell in row])
-                    if row_text.strip():
-                        text_parts.append(row_text)
-            
-            return '\n'.join(text_parts)
+                for sheet in workbook.worksheets:
+                    text_parts.append(f"\n=== {sheet.title} ===\n")
+                    # 저장된 시트 범위(dimension)가 실제와 다른 파일도 모든 행을 읽도록 초기화
+                    sheet.reset_dimensions()
+                    
+                    for row in sheet.iter_rows(values_only=True):
+                        row_text = _format_row(row)
+                        if row_text:
+                            text_parts.append(row_text)
+                
+                return '\n'.join(text_parts)
+            finally:
+                workbook.close()
         except Exception as e:
             logger.error(f"XLSX 파싱 실패: {file_path.name} - {str(e)}")
             return ""
     
-    def _parse_pdf(self, file_path: Path) -> str:
-        """PDF 파일 파싱"""
+    def _parse_xls(self, file_path: Path) -> str:
+        """XLS 파일 파싱 (Excel 97-2003 형식, 시트 단위로 로드 후 해제)"""
         try:
-            reader = PdfReader(str(file_path))
-            text_parts = []
+            import xlrd
             
-            for page_num, page in enumerate(reader.pages):
-                text = page.extract_text()
-                if text.strip():
-                    text_parts.append(f"\n--- Page {page_num + 1} ---\n")
-                    text_parts.append(text)
-            
-            return '\n'.join(text_parts)
+            # on_demand: 시트를 필요할 때 하나씩 로드
+            workbook = xlrd.open_workbook(str(file_path), on_demand=True)
+            try:
+                text_parts = []
+                
+                for sheet_index, sheet_name in enumerate(workbook.sheet_names()):
+                    sheet = workbook.sheet_by_index(sheet_index)
+                    text_parts.append(f"\n=== {sheet_name} ===\n")
+                    
+                    for row_index in range(sheet.nrows):
+                        values = []
+                        for cell in sheet.row(row_index):
+                            if cell.ctype == xlrd.XL_CELL_DATE:
+                                values.append(xlrd.xldate.xldate_as_datetime(cell.value, workbook.datemode))
+                            elif cell.ctype == xlrd.XL_CELL_BOOLEAN:
+                                values.append(bool(cell.value))
+                            elif cell.ctype in (xlrd.XL_CELL_ERROR, xlrd.XL_CELL_BLANK):
+                                values.append(None)
+                            else:
+                                values.append(cell.value)
+                        row_text = _format_row(values)
+                        if row_text:
+                            text_parts.append(row_text)
+                    
+                    workbook.unload_sheet(sheet_index)
+                
+                return '\n'.join(text_parts)
+            finally:
+                workbook.release_resources()
+        except Exception as e:
+            logger.error(f"XLS 파싱 실패: {file_path.name} - {str(e)}")
+            return ""
+    
+    def _parse_pdf(self, file_path: Path) -> str:
+        """PDF 파일 파싱 (페이지를 PAGE_BREAK로 구분)"""
+        try:
+            pages, _ = _extract_pdf_pages_task(str(file_path))
+            return PAGE_BREAK.join(pages)
         except Exception as e:
             logger.error(f"PDF 파싱 실패: {file_path.name} - {str(e)}")
             return ""
 
 
+def _extract_pdf_pages_task(
+    file_path: str,
+    start: int = 0,
+    end: Optional[int] = None
+) -> Tuple[List[str], float]:
+    """
+    PDF의 페이지 범위에서 텍스트를 추출합니다. (프로세스 풀 작업 함수)
+    
+    Args:
+        file_path: PDF 파일 경로
+        start: 시작 페이지 (0부터, 포함)
+        end: 끝 페이지 (제외, None이면 마지막 페이지까지)
+    
+    Returns:
+        (페이지별 텍스트 리스트, 소요 시간) 튜플
+    """
+    from PyPDF2 import PdfReader
+    
+    started = time.perf_counter()
+    reader = PdfReader(file_path)
+    pages = reader.pages[start:end]
+    # 페이지 텍스트에 구분 문자가 섞여 있으면 페이지 경계가 어긋나므로 공백으로 바꿈
+    texts = [(page.extract_text() or "").replace(PAGE_BREAK, " ") for page in pages]
+    return texts, time.perf_counter() - started
+
+
+def _format_cell(value) -> str:
+    """셀 값을 텍스트로 변환합니다. (정수인 실수는 소수점 없이)"""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if hasattr(value, "hour") and hasattr(value, "date") and (value.hour, value.minute, value.second) == (0, 0, 0):
+        # 시각이 없는 날짜는 날짜만 표시
+        return str(value.date())
+    return str(value).strip()
+
+
+def _format_row(values) -> str:
+    """
+    행 값을 " | "로 이은 텍스트를 반환합니다. 뒤쪽 빈 열은 제외하고, 빈 행은 빈 문자열을 반환합니다.
+    """
+    cells = [_format_cell(value) for value in values]
+    while cells and not cells[-1]:
+        cells.pop()
+    return ' | '.join(cells)
+
+
+# 프로세스당 하나만 실행하는 Word 인스턴스 (.doc fallback용, 종료 시 Quit)
+_word_application = None
+
+
+def _get_word_application():
+    """Word.Application COM 객체를 반환합니다. 처음 호출할 때 실행하고 이후에는 재사용합니다."""
+    global _word_application
+    if _word_application is None:
+        import win32com.client
+        from multiprocessing.util import Finalize
+        
+        _word_application = win32com.client.DispatchEx("Word.Application")
+        _word_application.Visible = False
+        _word_application.DisplayAlerts = False
+        # atexit은 프로세스 풀 워커 종료 시 실행되지 않으므로 multiprocessing 종료 처리에 등록
+        Finalize(None, _quit_word_application, exitpriority=10)
+    return _word_application
+
+
+def _quit_word_application():
+    """실행 중인 Word 인스턴스를 종료합니다."""
+    global _word_application
+    if _word_application is not None:
+        try:
+            _word_application.Quit()
+        except Exception as e:
+            logger.warning(f"Word 종료 실패: {str(e)}")
+        _word_application = None
+
+
+def _probe_pdf_task(
+    root_dir: str,
+    cache_dir: Optional[str],
+    file_path: Path,
+    max_workers: int
+) -> Tuple[Optional[Tuple[Optional[LangchainDocument], Optional[str], float]], Optional[Tuple[Optional[str], List[Tuple[int, int]]]]]:
+    """
+    프로세스 풀 작업 함수 (워커 프로세스에서 PDF 파싱 캐시 조회와 페이지 수 확인)
+    
+    긴 PDF는 페이지 범위 계획만 반환하고, 캐시에 있거나 짧은 PDF는 이 작업에서 바로 로드합니다.
+    
+    Returns:
+        (로드 결과 또는 None, (내용 해시, 페이지 범위 리스트) 또는 None) 튜플
+    """
+    loader = DocumentLoader(root_dir, max_workers=max_workers, cache_dir=cache_dir)
+    plan = loader._plan_pdf_ranges(file_path)
+    if plan is None:
+        return loader._timed_load(file_path), None
+    return None, plan
+
+
+def _load_file_task(
+    root_dir: str,
+    cache_dir: Optional[str],
+    file_path: Path
+) -> Tuple[Optional[LangchainDocument], Optional[str], float]:
+    """프로세스 풀 작업 함수 (워커 프로세스에서 단일 문서 로드)"""
+    return DocumentLoader(root_dir, cache_dir=cache_dir)._timed_load(file_path)
+
+
 def test_loader():
     """문서 로더 테스트 함수"""
     loader = DocumentLoader("./reference")
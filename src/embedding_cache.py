@@ -0,0 +1,369 @@
+"""임베딩 캐시 모듈 (SQLite 기반, 내용 주소 지정)"""
+
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from langchain_core.embeddings import Embeddings
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(text: str, model: str, dimensions: Optional[int] = None) -> str:
+    """
+    (청크 텍스트, 임베딩 모델, 차원) 조합으로 캐시 키를 생성합니다.
+
+    Args:
+        text: 임베딩할 텍스트
+        model: 임베딩 모델 이름
+        dimensions: 임베딩 차원 (모델 기본값이면 None)
+
+    Returns:
+        SHA-256 hex 문자열
+    """
+    hasher = hashlib.sha256()
+    hasher.update(model.encode("utf-8"))
+    hasher.update(b"\x00")
+    hasher.update(str(dimensions or "").encode("utf-8"))
+    hasher.update(b"\x00")
+    hasher.update(text.encode("utf-8"))
+    return hasher.hexdigest()
+
+
+class EmbeddingCache:
+    """디스크에 저장되는 임베딩 캐시 클래스"""
+
+    def __init__(self, path: str = "./embedding_cache.db", max_size_mb: float = 512.0):
+        """
+        Args:
+            path: SQLite 캐시 파일 경로
+            max_size_mb: 캐시 최대 크기 (MB), 초과 시 오래 사용되지 않은 항목부터 삭제
+        """
+        self.path = path
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                vector BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)"
+        )
+        self._conn.commit()
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """
+        여러 키에 대한 임베딩을 조회합니다.
+
+        Args:
+            keys: 캐시 키 리스트
+
+        Returns:
+            {키: 벡터} 딕셔너리 (캐시에 없는 키는 포함되지 않음)
+        """
+        found: Dict[str, List[float]] = {}
+        unique_keys = list(dict.fromkeys(keys))
+
+        with self._lock:
+            # SQLite 변수 개수 제한을 고려하여 나눠서 조회
+            for i in range(0, len(unique_keys), 500):
+                batch = unique_keys[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    batch
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = array("f", blob).tolist()
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+                self._conn.commit()
+
+            self.hits += sum(1 for key in keys if key in found)
+            self.misses += sum(1 for key in keys if key not in found)
+
+        return found
+
+    def contains_many(self, keys: List[str]) -> Set[str]:
+        """
+        캐시에 있는 키를 조회합니다. (사용 시각과 적중 통계는 바꾸지 않음, 비용 추정용)
+
+        Args:
+            keys: 캐시 키 리스트
+
+        Returns:
+            캐시에 있는 키 집합
+        """
+        found: Set[str] = set()
+        unique_keys = list(dict.fromkeys(keys))
+
+        with self._lock:
+            for i in range(0, len(unique_keys), 500):
+                batch = unique_keys[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key FROM embeddings WHERE key IN ({placeholders})",
+                    batch
+                ).fetchall()
+                found.update(key for key, in rows)
+
+        return found
+
+    def put_many(self, items: Dict[str, List[float]]):
+        """
+        여러 임베딩을 캐시에 저장합니다.
+
+        Args:
+            items: {키: 벡터} 딕셔너리
+        """
+        if not items:
+            return
+
+        now = time.time()
+        rows = []
+        for key, vector in items.items():
+            blob = array("f", vector).tobytes()
+            rows.append((key, blob, len(blob), now))
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, size, last_used) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+            self._evict()
+
+    def _evict(self):
+        """최대 크기를 초과하면 가장 오래 사용되지 않은 항목부터 삭제합니다."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM embeddings").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        overflow = total - self.max_bytes
+        removed_keys = []
+        freed = 0
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM embeddings ORDER BY last_used ASC"
+        ):
+            removed_keys.append((key,))
+            freed += size
+            if freed >= overflow:
+                break
+
+        self._conn.executemany("DELETE FROM embeddings WHERE key = ?", removed_keys)
+        self._conn.commit()
+        self.evictions += len(removed_keys)
+        logger.info(f"임베딩 캐시 정리: {len(removed_keys)}개 항목 삭제 ({freed / 1024 / 1024:.1f}MB)")
+
+    def stats(self) -> Dict[str, float]:
+        """캐시 적중/미스 통계를 반환합니다."""
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM embeddings"
+            ).fetchone()
+            hits, misses, evictions = self.hits, self.misses, self.evictions
+
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "evictions": evictions,
+            "entries": entries,
+            "size_mb": total / 1024 / 1024,
+        }
+
+    def clear(self):
+        """캐시를 비웁니다."""
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+
+    def close(self):
+        """캐시 연결을 닫습니다."""
+        with self._lock:
+            self._conn.close()
+
+
+class QueryEmbeddingCache:
+    """
+    쿼리 임베딩용 프로세스 내 LRU 캐시
+
+    shared를 지정하면 로컬 미스 시 SQLite 캐시를 조회하여 여러 프로세스가 결과를 공유합니다.
+    """
+
+    def __init__(self, max_entries: int = 1024, shared: Optional[EmbeddingCache] = None):
+        """
+        Args:
+            max_entries: 프로세스 내 최대 항목 수
+            shared: 프로세스 간 공유용 디스크 캐시 (None이면 프로세스 내에서만 캐시)
+        """
+        self.max_entries = max_entries
+        self.shared = shared
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[List[float]]:
+        """캐시된 쿼리 임베딩을 조회합니다."""
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return vector
+
+        if self.shared:
+            vector = self.shared.get_many([key]).get(key)
+            if vector is not None:
+                self._put_local(key, vector)
+                with self._lock:
+                    self.hits += 1
+                return vector
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, vector: List[float]):
+        """쿼리 임베딩을 저장합니다."""
+        self._put_local(key, vector)
+        if self.shared:
+            self.shared.put_many({key: vector})
+
+    def _put_local(self, key: str, vector: List[float]):
+        """프로세스 내 LRU에 저장하고 초과분을 삭제합니다."""
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, float]:
+        """캐시 적중/미스 통계를 반환합니다."""
+        with self._lock:
+            hits, misses, entries = self.hits, self.misses, len(self._entries)
+
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "entries": entries,
+        }
+
+
+class CachedEmbeddings(Embeddings):
+    """캐시를 먼저 조회하고 미스된 텍스트만 API로 보내는 임베딩 래퍼"""
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        model: str,
+        dimensions: Optional[int] = None,
+        cache: Optional[EmbeddingCache] = None,
+        query_cache: Optional[QueryEmbeddingCache] = None
+    ):
+        """
+        Args:
+            embeddings: 실제 임베딩 모델
+            model: 임베딩 모델 이름 (캐시 키에 사용)
+            dimensions: 임베딩 차원 (캐시 키에 사용)
+            cache: 문서 임베딩 캐시 (None이면 문서 임베딩은 캐시하지 않음)
+            query_cache: 쿼리 임베딩 캐시 (None이면 쿼리 임베딩은 캐시하지 않음)
+        """
+        self.embeddings = embeddings
+        self.model = model
+        self.dimensions = dimensions
+        self.cache = cache
+        self.query_cache = query_cache
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """문서 임베딩 (캐시 미스만 API 호출)"""
+        if not self.cache:
+            return self.embeddings.embed_documents(texts)
+
+        keys = [make_cache_key(text, self.model, self.dimensions) for text in texts]
+        cached = self.cache.get_many(keys)
+
+        # 중복을 제외한 미스 텍스트만 모아서 한 번에 요청
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+
+        if missing:
+            vectors = self.embeddings.embed_documents(list(missing.values()))
+            new_items = dict(zip(missing.keys(), vectors))
+            self.cache.put_many(new_items)
+            cached.update(new_items)
+
+        return [cached[key] for key in keys]
+
+    def _query_key(self, text: str) -> str:
+        """공백을 정리한 쿼리 텍스트로 캐시 키를 생성합니다."""
+        return make_cache_key(" ".join(text.split()), "query:" + self.model, self.dimensions)
+
+    def embed_query(self, text: str) -> List[float]:
+        """쿼리 임베딩 (쿼리 캐시 적중 시 API 호출 생략)"""
+        if not self.query_cache:
+            return self.embeddings.embed_query(text)
+
+        key = self._query_key(text)
+        vector = self.query_cache.get(key)
+        if vector is None:
+            vector = self.embeddings.embed_query(text)
+            self.query_cache.put(key, vector)
+        return vector
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """
+        비동기 쿼리 임베딩 (쿼리 캐시 적중 시 API 호출 생략)
+
+        프로세스 간 공유 캐시(SQLite)를 쓰는 경우 캐시 조회/저장은 이벤트 루프를 막지 않도록
+        스레드에서 실행합니다.
+        """
+        if not self.query_cache:
+            return await self.embeddings.aembed_query(text)
+
+        key = self._query_key(text)
+        if self.query_cache.shared:
+            vector = await asyncio.to_thread(self.query_cache.get, key)
+        else:
+            vector = self.query_cache.get(key)
+        if vector is None:
+            vector = await self.embeddings.aembed_query(text)
+            if self.query_cache.shared:
+                await asyncio.to_thread(self.query_cache.put, key, vector)
+            else:
+                self.query_cache.put(key, vector)
+        return vector
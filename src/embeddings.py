@@ -0,0 +1,187 @@
+"""임베딩 백엔드 모듈 (OpenAI API 또는 로컬 CPU ONNX 모델)"""
+
+import os
+import logging
+import threading
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 지원하는 임베딩 제공자
+EMBEDDING_PROVIDERS = ("openai", "local")
+
+# OpenAI 백엔드 기본 모델
+DEFAULT_OPENAI_MODEL = "text-embedding-3-small"
+
+# 로컬 백엔드 기본 모델 (한국어를 포함한 다국어 소형 모델, ONNX 가중치 포함)
+DEFAULT_LOCAL_MODEL = "intfloat/multilingual-e5-small"
+
+
+class LocalONNXEmbeddings(Embeddings):
+    """
+    로컬 CPU에서 ONNX Runtime으로 실행하는 문장 임베딩 클래스
+
+    Hugging Face 형식의 ONNX 모델(onnx/model.onnx 또는 model.onnx)과 tokenizer.json을
+    사용하며, 마지막 은닉 상태를 평균 풀링한 뒤 단위 길이로 정규화합니다.
+    """
+
+    def __init__(
+        self,
+        model: str = DEFAULT_LOCAL_MODEL,
+        batch_size: int = 32,
+        threads: Optional[int] = None,
+        max_length: int = 512,
+        query_prefix: Optional[str] = None,
+        passage_prefix: Optional[str] = None,
+        cache_dir: Optional[str] = None
+    ):
+        """
+        Args:
+            model: 로컬 모델 디렉토리 또는 Hugging Face 저장소 이름
+            batch_size: 한 번에 추론할 텍스트 수
+            threads: 추론 스레드 수 (None이면 ONNX Runtime 기본값 = 전체 코어)
+            max_length: 최대 토큰 길이 (초과분은 잘림)
+            query_prefix: 쿼리 앞에 붙일 문자열 (None이면 E5 계열은 "query: ")
+            passage_prefix: 문서 앞에 붙일 문자열 (None이면 E5 계열은 "passage: ")
+            cache_dir: 모델 다운로드 캐시 디렉토리
+        """
+        # 선택 의존성이므로 로컬 백엔드를 사용할 때만 불러옴
+        try:
+            import onnxruntime
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise ImportError(
+                "로컬 임베딩에는 onnxruntime과 tokenizers가 필요합니다: pip install onnxruntime tokenizers"
+            ) from e
+
+        is_e5 = "e5" in model.lower()
+        self.model = model
+        self.batch_size = max(1, batch_size)
+        self.max_length = max_length
+        self.query_prefix = query_prefix if query_prefix is not None else ("query: " if is_e5 else "")
+        self.passage_prefix = passage_prefix if passage_prefix is not None else ("passage: " if is_e5 else "")
+
+        model_dir = self._resolve_model_dir(model, cache_dir)
+        onnx_path = model_dir / "onnx" / "model.onnx"
+        if not onnx_path.exists():
+            onnx_path = model_dir / "model.onnx"
+
+        self.tokenizer = Tokenizer.from_file(str(model_dir / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.no_padding()
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+        self.session = onnxruntime.InferenceSession(
+            str(onnx_path),
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {node.name for node in self.session.get_inputs()}
+        # 하나의 세션을 여러 스레드가 공유할 때 배치 추론이 서로의 코어를 뺏지 않도록 직렬화
+        self._lock = threading.Lock()
+
+        logger.info(f"로컬 임베딩 모델 로드: {model} (스레드 {threads or '기본값'}, 배치 {self.batch_size})")
+
+    @staticmethod
+    def _resolve_model_dir(model: str, cache_dir: Optional[str]) -> Path:
+        """로컬 디렉토리면 그대로, 아니면 Hugging Face에서 필요한 파일만 내려받습니다."""
+        if os.path.isdir(model):
+            return Path(model)
+
+        from huggingface_hub import snapshot_download
+
+        logger.info(f"로컬 임베딩 모델을 내려받는 중: {model}")
+        return Path(snapshot_download(
+            repo_id=model,
+            allow_patterns=["onnx/model.onnx", "model.onnx", "tokenizer.json", "config.json"],
+            cache_dir=cache_dir
+        ))
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        """텍스트를 길이순으로 묶어 배치 추론합니다. (패딩 최소화)"""
+        if not texts:
+            return []
+
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        vectors: List[Optional[List[float]]] = [None] * len(texts)
+
+        for start in range(0, len(order), self.batch_size):
+            batch_idx = order[start:start + self.batch_size]
+            encodings = self.tokenizer.encode_batch([texts[i] for i in batch_idx])
+            for i, vector in zip(batch_idx, self._run(encodings)):
+                vectors[i] = vector.tolist()
+
+        return vectors
+
+    def _run(self, encodings) -> np.ndarray:
+        """토큰화된 배치 하나를 추론하여 정규화된 문장 벡터를 반환합니다."""
+        length = max(len(encoding.ids) for encoding in encodings)
+        input_ids = np.zeros((len(encodings), length), dtype=np.int64)
+        attention_mask = np.zeros((len(encodings), length), dtype=np.int64)
+        for row, encoding in enumerate(encodings):
+            input_ids[row, :len(encoding.ids)] = encoding.ids
+            attention_mask[row, :len(encoding.ids)] = 1
+
+        inputs = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            inputs["token_type_ids"] = np.zeros_like(input_ids)
+
+        with self._lock:
+            hidden = self.session.run(None, inputs)[0]
+
+        # 패딩을 제외한 평균 풀링 후 정규화
+        mask = attention_mask[:, :, None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return (pooled / np.clip(norms, 1e-12, None)).astype(np.float32)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """문서 임베딩"""
+        return self._embed([self.passage_prefix + text for text in texts])
+
+    def embed_query(self, text: str) -> List[float]:
+        """쿼리 임베딩"""
+        return self._embed([self.query_prefix + text])[0]
+
+
+def create_embeddings(
+    provider: str = "openai",
+    model: Optional[str] = None,
+    batch_size: int = 32,
+    threads: Optional[int] = None
+) -> Embeddings:
+    """
+    설정에 맞는 임베딩 백엔드를 생성합니다.
+
+    Args:
+        provider: 임베딩 제공자 ("openai" 또는 "local")
+        model: 모델 이름 (None이면 제공자 기본값)
+        batch_size: 로컬 백엔드 배치 크기
+        threads: 로컬 백엔드 추론 스레드 수
+
+    Returns:
+        Embeddings 객체
+    """
+    if provider == "openai":
+        from langchain_openai import OpenAIEmbeddings
+
+        return OpenAIEmbeddings(model=model or DEFAULT_OPENAI_MODEL)
+
+    if provider == "local":
+        return LocalONNXEmbeddings(
+            model=model or DEFAULT_LOCAL_MODEL,
+            batch_size=batch_size,
+            threads=threads
+        )
+
+    raise ValueError(f"지원하지 않는 임베딩 제공자입니다: {provider} (지원: {', '.join(EMBEDDING_PROVIDERS)})")
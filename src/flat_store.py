@@ -0,0 +1,493 @@
+"""NumPy 기반 벡터 스토어 모듈 (메모리 맵 .npy + 청크 메타데이터 테이블)"""
+
+import json
+import os
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from .quantized_index import QuantizedIndex
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+VECTORS_FILE = "vectors.npy"
+CHUNKS_FILE = "chunks.json"
+METADATA_FILE = "store.json"
+QUANTIZED_INDEX_FILE = "quantized_index.npz"
+
+# 인덱스 모드별 양자화 방식 (flat은 압축 없이 전수 비교)
+INDEX_MODES = {"flat": None, "ivf-int8": "int8", "ivf-pq": "pq"}
+
+
+class FlatVectorStore(VectorStore):
+    """
+    전체 벡터와 행렬 곱으로 top-k를 계산하는 벡터 스토어 클래스
+
+    청크 수천 개 규모에서는 HNSW 인덱스나 네트워크 왕복 없이 float32 행렬 하나로
+    전수 비교하는 편이 빠릅니다. 벡터는 .npy 파일을 메모리 맵으로 읽으므로 같은 파일을
+    여는 여러 워커 프로세스가 페이지를 공유합니다. 거리는 Chroma 기본값과 같은
+    제곱 L2 거리를 반환하여 기존 유사도 임계값을 그대로 사용할 수 있습니다.
+
+    청크가 수십만 개로 늘어나면 index_mode로 압축 인덱스(IVF + int8/PQ)를 사용할 수
+    있습니다. 이때 메모리에는 양자화 코드만 두고, 원본 벡터는 메모리 맵에서 후보를
+    다시 계산할 때만 읽습니다.
+    """
+
+    def __init__(
+        self,
+        persist_directory: str,
+        embedding_function: Embeddings,
+        index_mode: str = "flat",
+        index_options: Optional[dict] = None
+    ):
+        """
+        Args:
+            persist_directory: 벡터/메타데이터 저장 디렉토리
+            embedding_function: 임베딩 모델
+            index_mode: "flat" (전수 비교), "ivf-int8", "ivf-pq" (압축 근사 검색 + 재계산)
+            index_options: QuantizedIndex 설정 (n_lists, n_probe, pq_subvectors, rescore_factor 등)
+        """
+        if index_mode not in INDEX_MODES:
+            raise ValueError(f"지원하지 않는 인덱스 모드입니다: {index_mode} (지원: {', '.join(INDEX_MODES)})")
+
+        self.persist_directory = Path(persist_directory)
+        self.embedding_function = embedding_function
+        self.index_mode = index_mode
+        self.quantized_index: Optional[QuantizedIndex] = None
+        if INDEX_MODES[index_mode]:
+            self.quantized_index = QuantizedIndex(quantizer=INDEX_MODES[index_mode], **(index_options or {}))
+        self._lock = threading.Lock()
+        self._bulk_depth = 0
+        self._pending_vectors: List[np.ndarray] = []
+        self._index_dirty = False
+
+        self.ids: List[str] = []
+        self.texts: List[str] = []
+        self.metadatas: List[dict] = []
+        self.store_metadata: Dict[str, Any] = {}
+        self._id_set: set = set()
+        self._vectors: Optional[np.ndarray] = None
+        self._norms: Optional[np.ndarray] = None
+        self._load()
+        self.refresh_index()
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self.embedding_function
+
+    def _load(self):
+        """저장된 벡터(메모리 맵)와 메타데이터 테이블을 읽습니다."""
+        chunks_path = self.persist_directory / CHUNKS_FILE
+        vectors_path = self.persist_directory / VECTORS_FILE
+        if not chunks_path.exists() or not vectors_path.exists():
+            return
+
+        with open(chunks_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        self.ids = data["ids"]
+        self.texts = data["documents"]
+        self.metadatas = data["metadatas"]
+        metadata_path = self.persist_directory / METADATA_FILE
+        if metadata_path.exists():
+            with open(metadata_path, "r", encoding="utf-8") as f:
+                self.store_metadata = json.load(f)
+        self._id_set = set(self.ids)
+        self._set_vectors(np.load(vectors_path, mmap_mode="r"))
+
+    def _set_vectors(self, vectors: Optional[np.ndarray]):
+        """벡터 행렬과 노름 캐시를 갱신합니다. (압축 인덱스 모드는 전체 노름을 메모리에 두지 않음)"""
+        self._vectors = vectors if vectors is not None and len(vectors) else None
+        self._index_dirty = True
+        if self._vectors is None or self.quantized_index is not None:
+            self._norms = None
+        else:
+            self._norms = np.einsum("ij,ij->i", self._vectors, self._vectors)
+
+    def refresh_index(self):
+        """
+        벡터가 바뀌었으면 압축 인덱스를 다시 구성합니다.
+
+        저장된 인덱스가 현재 벡터 파일과 같으면 읽기만 하고, 다르면 다시 만들어 저장합니다.
+        """
+        if self.quantized_index is None or not self._index_dirty:
+            return
+
+        with self._lock:
+            vectors = self._vectors
+            if vectors is None:
+                self.quantized_index.reset()
+            elif self._bulk_depth or self._pending_vectors:
+                # 일괄 쓰기 중에는 파일과 메모리가 다르므로 메모리에서만 다시 구성
+                self.quantized_index.build(vectors)
+            else:
+                index_path = str(self.persist_directory / QUANTIZED_INDEX_FILE)
+                fingerprint = self._fingerprint()
+                if not self.quantized_index.load(index_path, fingerprint):
+                    logger.info(f"압축 인덱스를 구성하는 중... ({len(vectors)}개 벡터)")
+                    self.quantized_index.build(vectors)
+                    self.quantized_index.save(index_path, fingerprint)
+            self._index_dirty = False
+
+    def _fingerprint(self) -> str:
+        """현재 벡터 파일 식별자 (크기와 수정 시각)"""
+        stat = (self.persist_directory / VECTORS_FILE).stat()
+        return f"{len(self.ids)}-{stat.st_size}-{stat.st_mtime_ns}"
+
+    @contextmanager
+    def bulk_write(self):
+        """블록 안의 추가/삭제는 메모리에만 반영하고 블록이 끝날 때 한 번만 저장합니다."""
+        with self._lock:
+            self._bulk_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._bulk_depth -= 1
+                if self._bulk_depth == 0:
+                    self._flush()
+
+    def _merge_pending(self):
+        """메모리에 쌓인 새 벡터를 벡터 행렬에 합칩니다. (잠금 상태에서 호출)"""
+        if not self._pending_vectors:
+            return
+        parts = ([self._vectors] if self._vectors is not None else []) + self._pending_vectors
+        self._pending_vectors = []
+        self._set_vectors(np.vstack(parts))
+
+    def _flush(self):
+        """변경 사항을 파일에 저장합니다. (잠금 상태에서 호출)"""
+        self._merge_pending()
+        self._save(self._vectors)
+
+    def _save(self, vectors: Optional[np.ndarray], write_vectors: bool = True):
+        """
+        벡터, 청크 테이블, 스토어 메타데이터를 임시 파일에 쓴 뒤 교체합니다. (잠금 상태에서 호출)
+
+        Args:
+            vectors: 저장할 벡터 행렬
+            write_vectors: False면 스토어 메타데이터만 저장
+        """
+        self.persist_directory.mkdir(parents=True, exist_ok=True)
+        vectors_path = self.persist_directory / VECTORS_FILE
+        chunks_path = self.persist_directory / CHUNKS_FILE
+        metadata_path = self.persist_directory / METADATA_FILE
+
+        if write_vectors:
+            if vectors is None:
+                data = np.zeros((0, 0), dtype=np.float32)
+            else:
+                data = np.array(vectors, dtype=np.float32)
+            # 열려 있는 메모리 맵을 먼저 닫아야 파일을 교체할 수 있는 환경(Windows) 고려
+            self._set_vectors(None)
+            tmp_vectors = vectors_path.with_suffix(".tmp.npy")
+            np.save(tmp_vectors, data)
+            os.replace(tmp_vectors, vectors_path)
+
+            self._write_json(chunks_path, {
+                "ids": self.ids,
+                "documents": self.texts,
+                "metadatas": self.metadatas,
+            })
+            self._set_vectors(np.load(vectors_path, mmap_mode="r"))
+
+        self._write_json(metadata_path, self.store_metadata)
+
+    @staticmethod
+    def _write_json(path: Path, data: Any):
+        """JSON을 임시 파일에 쓴 뒤 교체합니다."""
+        tmp_path = path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any
+    ) -> List[str]:
+        """
+        텍스트를 임베딩하여 저장합니다. 같은 ID가 있으면 교체합니다.
+
+        Args:
+            texts: 텍스트 리스트
+            metadatas: 메타데이터 리스트
+            ids: 청크 ID 리스트 (None이면 순번으로 생성)
+
+        Returns:
+            저장된 청크 ID 리스트
+        """
+        texts = list(texts)
+        metadatas = metadatas or [{} for _ in texts]
+        # 임베딩은 잠금 밖에서 수행하여 여러 배치가 동시에 요청할 수 있도록 함
+        new_vectors = np.asarray(self.embedding_function.embed_documents(texts), dtype=np.float32)
+
+        with self._lock:
+            if ids is None:
+                ids = [str(len(self.ids) + i) for i in range(len(texts))]
+            existing = {chunk_id for chunk_id in ids if chunk_id in self._id_set}
+            if existing:
+                self._merge_pending()
+                self._delete_rows(existing)
+            self.ids.extend(ids)
+            self._id_set.update(ids)
+            self.texts.extend(texts)
+            self.metadatas.extend(dict(metadata) for metadata in metadatas)
+            self._pending_vectors.append(new_vectors)
+            if not self._bulk_depth:
+                self._flush()
+
+        return list(ids)
+
+    def _delete_rows(self, ids: set):
+        """ID에 해당하는 행을 메모리에서 제거합니다. (잠금 상태에서 호출, 저장은 하지 않음)"""
+        keep = [i for i, chunk_id in enumerate(self.ids) if chunk_id not in ids]
+        if len(keep) == len(self.ids):
+            return
+
+        self.ids = [self.ids[i] for i in keep]
+        self._id_set = set(self.ids)
+        self.texts = [self.texts[i] for i in keep]
+        self.metadatas = [self.metadatas[i] for i in keep]
+        vectors = np.asarray(self._vectors[keep]) if self._vectors is not None and keep else None
+        self._set_vectors(vectors)
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        """
+        청크를 삭제합니다.
+
+        Args:
+            ids: 삭제할 청크 ID 리스트
+        """
+        if not ids:
+            return False
+
+        with self._lock:
+            self._merge_pending()
+            self._delete_rows(set(ids))
+            if not self._bulk_depth:
+                self._flush()
+        return True
+
+    def count(self) -> int:
+        """저장된 청크 수"""
+        return len(self.ids)
+
+    def get_metadata(self) -> Dict[str, Any]:
+        """스토어 메타데이터 (인덱스 버전, 임베딩 모델 등)"""
+        return dict(self.store_metadata)
+
+    def read_stored_metadata(self) -> Dict[str, Any]:
+        """디스크에 저장된 스토어 메타데이터를 읽습니다. (다른 프로세스가 갱신한 값 확인용)"""
+        metadata_path = self.persist_directory / METADATA_FILE
+        if not metadata_path.exists():
+            return self.get_metadata()
+        with open(metadata_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def set_metadata(self, metadata: Dict[str, Any]):
+        """스토어 메타데이터를 교체하여 저장합니다."""
+        with self._lock:
+            self.store_metadata = dict(metadata)
+            self._save(self._vectors, write_vectors=False)
+
+    def get_page(self, limit: int, offset: int = 0) -> Tuple[List[str], List[str], List[dict]]:
+        """저장된 청크를 순서대로 일부 반환합니다. (ID, 텍스트, 메타데이터)"""
+        end = offset + limit
+        return self.ids[offset:end], self.texts[offset:end], self.metadatas[offset:end]
+
+    def _filter_mask(self, filter_dict: Optional[dict]) -> Optional[np.ndarray]:
+        """메타데이터 필터(키별 값 일치)에 맞는 행의 불리언 마스크"""
+        if not filter_dict:
+            return None
+        return np.fromiter(
+            (all(metadata.get(key) == value for key, value in filter_dict.items()) for metadata in self.metadatas),
+            dtype=bool,
+            count=len(self.metadatas)
+        )
+
+    def similarity_search_by_vector_with_relevance_scores(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[dict] = None,
+        **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        """
+        쿼리 벡터와 모든 벡터의 거리를 한 번의 행렬 곱으로 계산하여 top-k를 반환합니다.
+
+        Args:
+            embedding: 쿼리 임베딩
+            k: 반환할 문서 수
+            filter: 메타데이터 필터
+
+        Returns:
+            (문서, 제곱 L2 거리) 튜플 리스트 (거리 오름차순)
+        """
+        query = np.asarray(embedding, dtype=np.float32)
+        return [
+            (Document(page_content=self.texts[row], metadata=self.metadatas[row]), distance)
+            for row, distance in self._search_rows(query, k, self._filter_mask(filter))
+        ]
+
+    def _search_rows(self, query: np.ndarray, k: int, mask: Optional[np.ndarray]) -> List[Tuple[int, float]]:
+        """top-k 행 번호와 제곱 L2 거리 (거리 오름차순)"""
+        self.refresh_index()
+        vectors, norms = self._vectors, self._norms
+        if vectors is None:
+            return []
+
+        if self.quantized_index is not None:
+            # 압축 코드로 고른 후보만 원본 벡터로 다시 계산 (정렬된 순서로 읽어 디스크 접근 최소화)
+            rows = np.sort(self.quantized_index.search(query, k, mask))
+            candidates = np.asarray(vectors[rows], dtype=np.float32)
+            distances = np.einsum("ij,ij->i", candidates, candidates) - 2.0 * (candidates @ query)
+        else:
+            rows = None
+            distances = norms - 2.0 * (vectors @ query)
+            if mask is not None:
+                distances = np.where(mask, distances, np.inf)
+        distances = distances + float(query @ query)
+
+        k = min(k, len(distances))
+        if k == 0:
+            return []
+        top = np.argpartition(distances, k - 1)[:k] if k < len(distances) else np.arange(len(distances))
+        top = top[np.argsort(distances[top])]
+
+        return [
+            (int(rows[i]) if rows is not None else int(i), float(max(distances[i], 0.0)))
+            for i in top
+            if np.isfinite(distances[i])
+        ]
+
+    def memory_report(self) -> Dict[str, Any]:
+        """
+        벡터 검색에 사용하는 메모리 크기를 반환합니다.
+
+        Returns:
+            벡터 수, 차원, float32 원본 크기(MB), 상주 인덱스 크기(MB), 압축률
+        """
+        self.refresh_index()
+        if self._vectors is None:
+            return {"index_mode": self.index_mode, "vectors": 0}
+
+        count, dim = self._vectors.shape
+        full_bytes = count * dim * 4
+        if self.quantized_index is not None:
+            resident_bytes = self.quantized_index.memory_bytes()
+        else:
+            resident_bytes = full_bytes + (self._norms.nbytes if self._norms is not None else 0)
+
+        return {
+            "index_mode": self.index_mode,
+            "vectors": count,
+            "dim": dim,
+            "float32_mb": full_bytes / 1024 / 1024,
+            "resident_mb": resident_bytes / 1024 / 1024,
+            "compression": full_bytes / resident_bytes if resident_bytes else 0.0,
+        }
+
+    def measure_recall(self, k: int = 10, n_queries: int = 100, seed: int = 0) -> Dict[str, float]:
+        """
+        저장된 벡터를 쿼리로 사용하여 압축 인덱스의 recall@k와 지연 시간을 측정합니다.
+
+        Args:
+            k: 비교할 상위 결과 수
+            n_queries: 표본 쿼리 수
+            seed: 표본 추출 시드
+
+        Returns:
+            recall@k, 쿼리당 평균 지연(ms)
+        """
+        self.refresh_index()
+        if self._vectors is None:
+            return {"recall": 0.0, "latency_ms": 0.0}
+
+        vectors = self._vectors
+        rng = np.random.default_rng(seed)
+        sample = rng.choice(len(vectors), size=min(n_queries, len(vectors)), replace=False)
+        k = min(k, len(vectors))
+
+        hits = 0
+        elapsed = 0.0
+        for row in sample:
+            query = np.asarray(vectors[row], dtype=np.float32)
+            # 정답: 원본 벡터 전수 비교 (메모리 맵을 나눠 읽음)
+            exact = np.concatenate([
+                np.einsum("ij,ij->i", block, block) - 2.0 * (block @ query)
+                for block in (
+                    np.asarray(vectors[start:start + 65536], dtype=np.float32)
+                    for start in range(0, len(vectors), 65536)
+                )
+            ])
+            truth = set(np.argpartition(exact, k - 1)[:k].tolist())
+
+            start_time = time.perf_counter()
+            found = self._search_rows(query, k, None)
+            elapsed += time.perf_counter() - start_time
+
+            hits += len(truth & {row for row, _ in found})
+
+        return {"recall": hits / (len(sample) * k), "latency_ms": elapsed / len(sample) * 1000}
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[dict] = None,
+        **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        """텍스트 쿼리로 검색합니다. (문서, 거리) 튜플 리스트"""
+        embedding = self.embedding_function.embed_query(query)
+        return self.similarity_search_by_vector_with_relevance_scores(embedding, k=k, filter=filter)
+
+    def similarity_search_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[dict] = None,
+        **kwargs: Any
+    ) -> List[Document]:
+        """쿼리 벡터로 검색하여 문서만 반환합니다."""
+        return [
+            doc for doc, _ in
+            self.similarity_search_by_vector_with_relevance_scores(embedding, k=k, filter=filter)
+        ]
+
+    def similarity_search(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[dict] = None,
+        **kwargs: Any
+    ) -> List[Document]:
+        """텍스트 쿼리로 검색하여 문서만 반환합니다. (Retriever에서 사용)"""
+        return [doc for doc, _ in self.similarity_search_with_score(query, k=k, filter=filter)]
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        persist_directory: str = "./chroma_db",
+        **kwargs: Any
+    ) -> "FlatVectorStore":
+        """텍스트로 새 스토어를 생성합니다."""
+        store = cls(persist_directory=persist_directory, embedding_function=embedding)
+        store.add_texts(texts, metadatas=metadatas, ids=ids)
+        return store
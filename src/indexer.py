@@ -0,0 +1,308 @@
+"""증분 인덱싱 모듈 (파일 매니페스트 기반)"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .document_loader import DocumentLoader
+from .vector_store import VectorStoreManager
+from .utils import compute_file_hash
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class IndexManifest:
+    """인덱싱된 소스 파일과 청크 ID를 기록하는 매니페스트 클래스"""
+
+    VERSION = 1
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: 매니페스트 JSON 파일 경로
+        """
+        self.path = Path(path)
+        self.files: Dict[str, dict] = {}
+        self.load()
+
+    def load(self):
+        """매니페스트 파일을 읽습니다. (없거나 버전이 다르면 빈 상태로 시작)"""
+        self.files = {}
+        if not self.path.exists():
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"매니페스트를 읽을 수 없어 새로 생성합니다: {e}")
+            return
+
+        if data.get("version") != self.VERSION:
+            logger.warning("매니페스트 버전이 달라 새로 생성합니다.")
+            return
+
+        self.files = data.get("files", {})
+
+    def save(self):
+        """매니페스트 파일을 저장합니다."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": self.VERSION, "files": self.files}, f, ensure_ascii=False, indent=2)
+        tmp_path.replace(self.path)
+
+    def reset(self):
+        """모든 기록을 지웁니다."""
+        self.files = {}
+
+    def diff(self, file_paths: List[Path], settings: Optional[dict] = None) -> Dict[str, list]:
+        """
+        현재 파일 목록과 매니페스트를 비교합니다.
+
+        크기와 수정 시각이 같으면 변경 없음으로 보고, 다르면 내용 해시로 확인합니다.
+        settings가 주어지면 기록된 파서 버전/청크 설정이 다른 파일도 변경된 것으로 봅니다.
+
+        Args:
+            file_paths: 현재 소스 파일 목록
+            settings: 현재 인덱싱 설정 (index_settings())
+
+        Returns:
+            added/changed/unchanged (Path 리스트), deleted (소스 경로 문자열 리스트)
+        """
+        result = {"added": [], "changed": [], "unchanged": [], "deleted": []}
+        current = set()
+        outdated = 0
+
+        for file_path in file_paths:
+            source = str(file_path)
+            current.add(source)
+            entry = self.files.get(source)
+
+            if entry is None:
+                result["added"].append(file_path)
+                continue
+
+            if settings is not None and entry.get("settings") != settings:
+                # 이전 파서/분할 설정으로 만든 청크는 내용이 같아도 다시 생성
+                result["changed"].append(file_path)
+                outdated += 1
+                continue
+
+            stat = file_path.stat()
+            if entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+                result["unchanged"].append(file_path)
+                continue
+
+            content_hash = compute_file_hash(file_path)
+            if content_hash == entry["hash"]:
+                # 내용은 같고 수정 시각만 바뀐 경우
+                entry["size"] = stat.st_size
+                entry["mtime"] = stat.st_mtime
+                result["unchanged"].append(file_path)
+            else:
+                result["changed"].append(file_path)
+
+        result["deleted"] = [source for source in self.files if source not in current]
+        if outdated:
+            logger.info(f"파서 버전 또는 청크 설정이 바뀌어 {outdated}개 파일을 다시 인덱싱합니다.")
+        return result
+
+    def get_chunk_ids(self, source: str) -> List[str]:
+        """소스 파일에서 생성된 청크 ID를 반환합니다."""
+        entry = self.files.get(source)
+        return list(entry["chunk_ids"]) if entry else []
+
+    def update(
+        self,
+        file_path: Path,
+        chunk_ids: List[str],
+        content_hash: Optional[str] = None,
+        settings: Optional[dict] = None
+    ):
+        """
+        소스 파일의 기록을 갱신합니다.
+
+        Args:
+            file_path: 소스 파일 경로
+            chunk_ids: 파일에서 생성된 청크 ID 리스트
+            content_hash: 내용 해시 (None이면 계산)
+            settings: 청크를 만들 때의 인덱싱 설정 (index_settings())
+        """
+        stat = file_path.stat()
+        self.files[str(file_path)] = {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "hash": content_hash or compute_file_hash(file_path),
+            "chunk_ids": list(chunk_ids),
+            "settings": dict(settings or {}),
+        }
+
+    def remove(self, source: str) -> List[str]:
+        """
+        소스 파일의 기록을 삭제합니다.
+
+        Returns:
+            삭제된 파일에서 생성되었던 청크 ID 리스트
+        """
+        entry = self.files.pop(source, None)
+        return list(entry["chunk_ids"]) if entry else []
+
+    def record_full_build(
+        self,
+        file_paths: List[Path],
+        chunk_ids_by_source: Dict[str, List[str]],
+        settings: Optional[dict] = None
+    ):
+        """
+        전체 재생성 결과로 매니페스트를 다시 작성합니다.
+
+        파싱에 실패했거나 내용이 없는 파일은 기록하지 않아 다음 증분 인덱싱에서 다시 시도합니다.
+
+        Args:
+            file_paths: 인덱싱 대상이었던 소스 파일 목록
+            chunk_ids_by_source: 소스 파일별 청크 ID
+            settings: 인덱싱 설정 (index_settings())
+        """
+        self.reset()
+        for file_path in file_paths:
+            chunk_ids = chunk_ids_by_source.get(str(file_path))
+            if chunk_ids:
+                self.update(file_path, chunk_ids, settings=settings)
+        self.save()
+
+
+def index_settings(loader: DocumentLoader, vs_manager: VectorStoreManager) -> Dict[str, object]:
+    """
+    매니페스트에 파일별로 기록할 인덱싱 설정 (파서 버전과 청크 분할 설정)
+
+    Args:
+        loader: 문서 로더
+        vs_manager: 벡터 스토어 관리자
+
+    Returns:
+        parser_version, chunk_strategy, chunk_size, chunk_overlap 딕셔너리
+    """
+    return {"parser_version": loader.PARSER_VERSION, **vs_manager.get_chunk_settings()}
+
+
+def incremental_index(
+    loader: DocumentLoader,
+    vs_manager: VectorStoreManager,
+    manifest: IndexManifest
+) -> Dict[str, int]:
+    """
+    추가/변경된 파일만 파싱·임베딩하고, 삭제/변경된 파일의 청크를 제거합니다.
+
+    Args:
+        loader: 문서 로더
+        vs_manager: 벡터 스토어 관리자
+        manifest: 인덱싱 매니페스트
+
+    Returns:
+        added/changed/deleted/unchanged 파일 수와 추가/삭제된 청크 수
+    """
+    # 기존 청크를 지우기 전에 임베딩 모델/청크 분할 설정이 인덱스와 같은지 확인
+    vs_manager.check_index_compatibility()
+
+    file_paths = loader.find_documents()
+    settings = index_settings(loader, vs_manager)
+    diff = manifest.diff(file_paths, settings)
+
+    logger.info(
+        f"변경 사항: 추가 {len(diff['added'])}개, 변경 {len(diff['changed'])}개, "
+        f"삭제 {len(diff['deleted'])}개, 유지 {len(diff['unchanged'])}개"
+    )
+
+    # 삭제되거나 변경된 파일의 기존 청크 제거
+    stale_ids = []
+    for source in diff["deleted"]:
+        stale_ids.extend(manifest.remove(source))
+    for file_path in diff["changed"]:
+        stale_ids.extend(manifest.get_chunk_ids(str(file_path)))
+    vs_manager.delete_chunks(stale_ids)
+
+    # 추가되거나 변경된 파일만 파싱하여 임베딩
+    to_index = diff["added"] + diff["changed"]
+    added_ids: Dict[str, List[str]] = {}
+    if to_index:
+        # 파싱되는 대로 분할/임베딩하여 파싱과 업로드를 겹쳐 진행
+        added_ids = vs_manager.add_documents(loader.iter_documents(to_index))
+
+    # 내용이 없거나 파싱에 실패한 파일은 기록하지 않아 다음 실행에서 다시 시도 (일시적인 잠금/COM 오류 등)
+    failed = 0
+    for file_path in to_index:
+        chunk_ids = added_ids.get(str(file_path))
+        if chunk_ids:
+            manifest.update(file_path, chunk_ids, settings=settings)
+        else:
+            manifest.remove(str(file_path))
+            failed += 1
+    manifest.save()
+    if failed:
+        logger.warning(f"청크가 생성되지 않은 파일 {failed}개는 다음 증분 인덱싱에서 다시 처리합니다.")
+
+    summary = {
+        "added": len(diff["added"]),
+        "changed": len(diff["changed"]),
+        "deleted": len(diff["deleted"]),
+        "unchanged": len(diff["unchanged"]),
+        "chunks_added": sum(len(ids) for ids in added_ids.values()),
+        "chunks_deleted": len(stale_ids),
+    }
+    logger.info(
+        f"증분 인덱싱 완료: 청크 {summary['chunks_added']}개 추가, {summary['chunks_deleted']}개 삭제"
+    )
+    return summary
+
+
+def full_index(
+    loader: DocumentLoader,
+    vs_manager: VectorStoreManager,
+    file_paths: List[Path],
+    manifest: Optional[IndexManifest] = None,
+    report=None
+) -> Dict[str, object]:
+    """
+    모든 파일을 스트리밍으로 인덱싱합니다. (파싱 → 분할 → 임베딩 배치 → 저장이 겹쳐 진행)
+
+    파일을 파싱되는 대로 벡터 스토어에 넘기므로 전체 문서/청크 목록을 메모리에 두지 않습니다.
+
+    Args:
+        loader: 문서 로더
+        vs_manager: 벡터 스토어 관리자 (기존 데이터는 미리 삭제해야 함)
+        file_paths: 인덱싱할 파일 목록
+        manifest: 전체 생성 결과를 기록할 매니페스트 (None이면 기록하지 않음)
+        report: 파일별 파싱/청크 통계를 기록할 IndexingReport (None이면 기록하지 않음)
+
+    Returns:
+        문서 수, 청크 수, 카테고리별 문서 수 딕셔너리
+    """
+    categories: Dict[str, int] = {}
+
+    def on_file(file_path: Path, doc, error: Optional[str], elapsed: float):
+        if report:
+            parsed = [doc] if doc is not None and doc.page_content.strip() else []
+            report.record_parse([file_path], [(file_path.name, elapsed)], parsed)
+
+    def documents():
+        for doc in loader.iter_documents(file_paths, on_file=on_file):
+            category = doc.metadata.get("category", "기타")
+            categories[category] = categories.get(category, 0) + 1
+            yield doc
+
+    # 캐시 적중 여부를 반영하도록 임베딩 전에 청크별 토큰 수를 기록
+    on_chunks = (lambda chunks: report.record_chunks(vs_manager, chunks)) if report else None
+    vs_manager.create_vectorstore_from_stream(documents(), on_chunks=on_chunks)
+
+    if manifest is not None:
+        manifest.record_full_build(file_paths, vs_manager.chunk_ids_by_source, index_settings(loader, vs_manager))
+
+    return {
+        "documents": sum(categories.values()),
+        "chunks": sum(len(ids) for ids in vs_manager.chunk_ids_by_source.values()),
+        "categories": categories,
+    }
@@ -0,0 +1,335 @@
+"""인덱싱 리포트 모듈 (파일별 파싱 시간, 메모리, 토큰 수, 비용/시간 추정)"""
+
+import json
+import logging
+import math
+import os
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from .embedding_cache import make_cache_key
+from .embeddings import DEFAULT_LOCAL_MODEL, DEFAULT_OPENAI_MODEL
+from .vector_store import VectorStoreManager
+from .utils import count_tokens
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 임베딩 모델별 가격 (USD / 100만 토큰, 로컬 모델은 0)
+EMBEDDING_PRICES_PER_1M_TOKENS = {
+    "text-embedding-3-small": 0.02,
+    "text-embedding-3-large": 0.13,
+    "text-embedding-ada-002": 0.10,
+}
+
+# 임베딩 요청 하나의 처리 속도 가정 (토큰/초) - 시간 추정용, 실측값으로 조정 가능
+ASSUMED_TOKENS_PER_SECOND = {
+    "openai": 50_000,
+    "local": 2_000,
+}
+
+
+class DryRunEmbeddings(Embeddings):
+    """임베딩 API를 호출하지 않는 자리표시자 (--dry-run에서 분할/토큰 계산만 할 때 사용)"""
+
+    def __init__(self, model: str):
+        self.model = model
+        self.dimensions = None
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        raise RuntimeError("dry-run 모드에서는 임베딩을 생성하지 않습니다.")
+
+    def embed_query(self, text: str) -> List[float]:
+        raise RuntimeError("dry-run 모드에서는 임베딩을 생성하지 않습니다.")
+
+
+def create_dry_run_manager(
+    chunk_overlap_percent: float,
+    chunk_strategy: Optional[str] = None,
+    chunk_tokens: int = 1000,
+    embedding_cache_path: Optional[str] = None
+) -> VectorStoreManager:
+    """
+    API 키, 네트워크, 벡터 DB 없이 분할과 토큰 계산만 하는 벡터 스토어 관리자를 생성합니다.
+
+    Args:
+        chunk_overlap_percent: 청크 간 중복 비율 (%)
+        chunk_strategy: 분할 방식 "regulation" 또는 "recursive" (None이면 CHUNK_STRATEGY 환경 변수)
+        chunk_tokens: 청크 최대 토큰 수 (regulation 분할 방식)
+        embedding_cache_path: 임베딩 캐시 경로 (파일이 있으면 이미 임베딩된 청크를 비용에서 제외)
+
+    Returns:
+        VectorStoreManager
+    """
+    provider = os.getenv("EMBEDDING_PROVIDER", "openai")
+    default_model = DEFAULT_OPENAI_MODEL if provider == "openai" else DEFAULT_LOCAL_MODEL
+    model = os.getenv("EMBEDDING_MODEL") or default_model
+
+    return VectorStoreManager(
+        chunk_overlap_percent=chunk_overlap_percent,
+        chunk_strategy=chunk_strategy,
+        chunk_tokens=chunk_tokens,
+        embedding_provider=provider,
+        embedding_model=model,
+        embeddings=DryRunEmbeddings(model),
+        embedding_cache_path=embedding_cache_path if embedding_cache_path and os.path.exists(embedding_cache_path) else None,
+        query_cache_size=0,
+        use_lexical_index=False
+    )
+
+
+class IndexingReport:
+    """
+    인덱싱 파이프라인의 파일별/단계별 지표를 모으는 클래스
+
+    peak_memory는 tracemalloc으로 측정한 현재 프로세스의 Python 할당량입니다.
+    (병렬 파싱 워커 프로세스의 메모리는 포함되지 않음)
+    """
+
+    def __init__(self, top_n: int = 10):
+        """
+        Args:
+            top_n: 리포트에 표시할 가장 느린 파일 수
+        """
+        self.top_n = top_n
+        self.files: Dict[str, Dict[str, any]] = {}
+        self.stages: Dict[str, float] = {}
+        self.estimate: Dict[str, any] = {}
+        self._started = time.perf_counter()
+        self._tracing = False
+
+    def start(self):
+        """메모리 추적을 시작합니다."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+        self._started = time.perf_counter()
+
+    def stop(self):
+        """start()로 시작한 메모리 추적을 끝냅니다."""
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+
+    def record_stage(self, name: str, seconds: float):
+        """단계 소요 시간(초)을 기록합니다."""
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def record_parse(
+        self,
+        file_paths: List[Path],
+        file_timings: List[Tuple[str, float]],
+        documents: List[Document]
+    ):
+        """
+        파일별 파싱 결과를 기록합니다.
+
+        Args:
+            file_paths: 로드한 파일 목록 (load_documents에 넘긴 순서)
+            file_timings: DocumentLoader.file_timings (같은 순서의 (파일명, 초))
+            documents: 파싱된 문서 리스트
+        """
+        chars_by_source = {doc.metadata["source"]: len(doc.page_content) for doc in documents}
+        for file_path, (_, seconds) in zip(file_paths, file_timings):
+            source = str(file_path)
+            self.files[source] = {
+                "file": source,
+                "type": file_path.suffix.lower(),
+                "bytes": file_path.stat().st_size if file_path.exists() else 0,
+                "parse_seconds": seconds,
+                "chars": chars_by_source.get(source, 0),
+                "parsed": source in chars_by_source,
+                "chunks": 0,
+                "tokens": 0,
+                "billable_tokens": 0,
+            }
+
+    def record_chunks(self, vs_manager: VectorStoreManager, chunks: List[Document]):
+        """
+        파일별 청크 수와 임베딩 토큰 수를 기록합니다.
+
+        임베딩 캐시가 있으면 이미 임베딩된 청크의 토큰은 billable_tokens에서 제외합니다.
+
+        Args:
+            vs_manager: 청크를 만든 벡터 스토어 관리자 (토큰 계산 모델, 캐시 참조)
+            chunks: 청크 리스트
+        """
+        keys = [make_cache_key(chunk.page_content, vs_manager.embedding_id) for chunk in chunks]
+        cached = vs_manager.embedding_cache.contains_many(keys) if vs_manager.embedding_cache else set()
+
+        for chunk, key in zip(chunks, keys):
+            source = chunk.metadata.get("source", "")
+            stats = self.files.setdefault(source, {
+                "file": source, "type": Path(source).suffix.lower(), "bytes": 0, "parse_seconds": 0.0,
+                "chars": 0, "parsed": True, "chunks": 0, "tokens": 0, "billable_tokens": 0,
+            })
+            tokens = count_tokens(chunk.page_content, vs_manager.embedding_model)
+            stats["chunks"] += 1
+            stats["tokens"] += tokens
+            if key not in cached:
+                stats["billable_tokens"] += tokens
+
+    def estimate_indexing(
+        self,
+        vs_manager: VectorStoreManager,
+        chunks: List[Document],
+        tokens_per_second: Optional[float] = None
+    ) -> Dict[str, any]:
+        """
+        API를 호출하지 않고 임베딩 비용과 소요 시간을 추정합니다.
+
+        시간은 업로드 배치를 upload_concurrency개씩 동시에 보낸다고 보고,
+        배치마다 토큰 수 / tokens_per_second 초가 걸린다고 가정하여 계산합니다.
+
+        Args:
+            vs_manager: 업로드 배치 설정을 가진 벡터 스토어 관리자
+            chunks: 청크 리스트
+            tokens_per_second: 요청 하나의 처리 속도 가정 (None이면 제공자별 기본값)
+
+        Returns:
+            추정 결과 딕셔너리
+        """
+        provider = vs_manager.embedding_provider
+        tokens_per_second = tokens_per_second or ASSUMED_TOKENS_PER_SECOND.get(provider, 50_000)
+        price = EMBEDDING_PRICES_PER_1M_TOKENS.get(vs_manager.embedding_model, 0.0) if provider == "openai" else 0.0
+
+        total_tokens = sum(stats["tokens"] for stats in self.files.values())
+        billable_tokens = sum(stats["billable_tokens"] for stats in self.files.values())
+        batches = vs_manager._make_upload_batches(chunks, vs_manager.make_chunk_ids(chunks))
+        # 이미 캐시된 청크 비율만큼 배치 처리 시간을 줄여 계산
+        billable_ratio = billable_tokens / total_tokens if total_tokens else 0.0
+        batch_seconds = sorted((tokens * billable_ratio / tokens_per_second for _, _, tokens in batches), reverse=True)
+        lanes = [0.0] * vs_manager.upload_concurrency
+        for seconds in batch_seconds:
+            lanes[lanes.index(min(lanes))] += seconds
+
+        self.estimate = {
+            "embedding_id": vs_manager.embedding_id,
+            "chunks": len(chunks),
+            "batches": len(batches),
+            "total_tokens": total_tokens,
+            "billable_tokens": billable_tokens,
+            "price_per_1m_tokens_usd": price,
+            "estimated_cost_usd": billable_tokens / 1_000_000 * price,
+            "assumed_tokens_per_second": tokens_per_second,
+            "upload_concurrency": vs_manager.upload_concurrency,
+            "estimated_embedding_seconds": max(lanes) if lanes else 0.0,
+            "estimated_total_seconds": sum(self.stages.values()) + (max(lanes) if lanes else 0.0),
+        }
+        return self.estimate
+
+    def peak_memory_mb(self) -> Optional[float]:
+        """tracemalloc 최대 할당량(MB)을 반환합니다. (추적 중이 아니면 None)"""
+        if not tracemalloc.is_tracing():
+            return None
+        return tracemalloc.get_traced_memory()[1] / 1024 / 1024
+
+    def slowest_files(self) -> List[Dict[str, any]]:
+        """파싱 시간이 가장 긴 파일 목록을 반환합니다."""
+        return sorted(self.files.values(), key=lambda stats: stats["parse_seconds"], reverse=True)[:self.top_n]
+
+    def to_dict(self) -> Dict[str, any]:
+        """리포트를 딕셔너리로 반환합니다."""
+        files = list(self.files.values())
+        total_parse = sum(stats["parse_seconds"] for stats in files)
+        slowest = self.slowest_files()
+        return {
+            "summary": {
+                "files": len(files),
+                "parsed": sum(1 for stats in files if stats["parsed"]),
+                "chars": sum(stats["chars"] for stats in files),
+                "chunks": sum(stats["chunks"] for stats in files),
+                "tokens": sum(stats["tokens"] for stats in files),
+                "parse_seconds": total_parse,
+                "slowest_share": sum(stats["parse_seconds"] for stats in slowest) / total_parse if total_parse else 0.0,
+                "elapsed_seconds": time.perf_counter() - self._started,
+                "peak_memory_mb": self.peak_memory_mb(),
+            },
+            "stages": self.stages,
+            "estimate": self.estimate,
+            "slowest_files": slowest,
+            "files": files,
+        }
+
+    def save(self, path: str):
+        """
+        리포트를 JSON 파일로 저장합니다.
+
+        Args:
+            path: 저장할 파일 경로
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        logger.info(f"인덱싱 리포트 저장: {path}")
+
+    def print_summary(self):
+        """리포트 요약을 출력합니다."""
+        data = self.to_dict()
+        summary = data["summary"]
+        print(f"\n[리포트] 파일 {summary['files']}개 (파싱 성공 {summary['parsed']}개), "
+              f"{summary['chars']:,}자, 청크 {summary['chunks']:,}개, 임베딩 토큰 {summary['tokens']:,}")
+        for name, seconds in self.stages.items():
+            print(f"  - {name}: {seconds:.1f}초")
+        if summary["peak_memory_mb"] is not None:
+            print(f"  - 최대 메모리 (tracemalloc, 메인 프로세스): {summary['peak_memory_mb']:.1f}MB")
+
+        print(f"\n[리포트] 파싱이 가장 느린 파일 {len(data['slowest_files'])}개 "
+              f"(전체 파싱 시간의 {summary['slowest_share']:.0%}):")
+        for stats in data["slowest_files"]:
+            print(f"  - {stats['parse_seconds']:6.2f}초 {stats['chars']:>9,}자 {stats['chunks']:>5}청크  "
+                  f"{Path(stats['file']).name}")
+
+        if self.estimate:
+            estimate = self.estimate
+            print(f"\n[추정] {estimate['embedding_id']}: 토큰 {estimate['total_tokens']:,} "
+                  f"(과금 대상 {estimate['billable_tokens']:,}), 배치 {estimate['batches']}개")
+            print(f"  - 예상 비용: ${estimate['estimated_cost_usd']:.4f} "
+                  f"(100만 토큰당 ${estimate['price_per_1m_tokens_usd']})")
+            print(f"  - 예상 임베딩 시간: {estimate['estimated_embedding_seconds']:.0f}초 "
+                  f"(요청당 {estimate['assumed_tokens_per_second']:,.0f} 토큰/초, "
+                  f"동시 {estimate['upload_concurrency']}개 가정)")
+            print(f"  - 예상 전체 시간: {math.ceil(estimate['estimated_total_seconds'])}초")
+
+
+def dry_run(
+    loader,
+    vs_manager: VectorStoreManager,
+    tokens_per_second: Optional[float] = None,
+    top_n: int = 10
+) -> IndexingReport:
+    """
+    문서를 파싱하고 분할하여 리포트와 비용/시간 추정을 만듭니다. (임베딩 API, 벡터 DB 미사용)
+
+    Args:
+        loader: DocumentLoader
+        vs_manager: create_dry_run_manager()로 만든 벡터 스토어 관리자
+        tokens_per_second: 요청 하나의 처리 속도 가정 (None이면 제공자별 기본값)
+        top_n: 리포트에 표시할 가장 느린 파일 수
+
+    Returns:
+        IndexingReport
+    """
+    report = IndexingReport(top_n=top_n)
+    report.start()
+
+    file_paths = loader.find_documents()
+    start = time.perf_counter()
+    documents = loader.load_documents(file_paths)
+    report.record_stage("parse", time.perf_counter() - start)
+    report.record_parse(file_paths, loader.file_timings, documents)
+
+    start = time.perf_counter()
+    chunks = vs_manager.split_documents(documents)
+    report.record_stage("split", time.perf_counter() - start)
+    report.record_chunks(vs_manager, chunks)
+
+    report.estimate_indexing(vs_manager, chunks, tokens_per_second)
+    return report
@@ -0,0 +1,218 @@
+"""어휘 검색 모듈 (한국어 문자 n-gram BM25 역색인)"""
+
+import json
+import logging
+import math
+import re
+import heapq
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 단어 단위 분리 (문장부호/공백 기준)
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def char_ngrams(text: str, n: int = 2) -> List[str]:
+    """
+    단어마다 문자 n-gram을 생성합니다.
+
+    한국어는 조사가 붙고 띄어쓰기가 일정하지 않아 형태소 분석 없이 문자 2-gram으로
+    색인합니다. n보다 짧은 단어는 그대로 하나의 용어로 사용합니다.
+
+    Args:
+        text: 입력 텍스트
+        n: n-gram 길이
+
+    Returns:
+        용어 리스트 (중복 포함)
+    """
+    terms = []
+    for word in WORD_PATTERN.findall(text.lower()):
+        if len(word) <= n:
+            terms.append(word)
+        else:
+            terms.extend(word[i:i + n] for i in range(len(word) - n + 1))
+    return terms
+
+
+class LexicalIndex:
+    """청크 텍스트에 대한 BM25 역색인 클래스 (임베딩 API 없이 검색)"""
+
+    VERSION = 1
+
+    def __init__(self, ngram_size: int = 2, k1: float = 1.5, b: float = 0.75):
+        """
+        Args:
+            ngram_size: 문자 n-gram 길이
+            k1: BM25 용어 빈도 포화 계수
+            b: BM25 문서 길이 정규화 계수
+        """
+        self.ngram_size = ngram_size
+        self.k1 = k1
+        self.b = b
+        self.index_version = ""
+        self.docs: Dict[str, Document] = {}
+        self.doc_lengths: Dict[str, int] = {}
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def add(self, ids: List[str], documents: List[Document]):
+        """
+        청크를 색인에 추가합니다. 같은 ID가 있으면 교체합니다.
+
+        Args:
+            ids: 청크 ID 리스트
+            documents: 청크 리스트
+        """
+        self.remove([chunk_id for chunk_id in ids if chunk_id in self.docs])
+
+        for chunk_id, doc in zip(ids, documents):
+            terms = Counter(char_ngrams(doc.page_content, self.ngram_size))
+            self.docs[chunk_id] = Document(page_content=doc.page_content, metadata=dict(doc.metadata))
+            self.doc_lengths[chunk_id] = sum(terms.values())
+            self.total_length += self.doc_lengths[chunk_id]
+            for term, tf in terms.items():
+                self.postings.setdefault(term, {})[chunk_id] = tf
+
+    def remove(self, ids: List[str]):
+        """
+        청크를 색인에서 삭제합니다. (없는 ID는 무시)
+
+        Args:
+            ids: 삭제할 청크 ID 리스트
+        """
+        for chunk_id in ids:
+            doc = self.docs.pop(chunk_id, None)
+            if doc is None:
+                continue
+
+            self.total_length -= self.doc_lengths.pop(chunk_id)
+            for term in set(char_ngrams(doc.page_content, self.ngram_size)):
+                postings = self.postings.get(term)
+                if postings is None:
+                    continue
+                postings.pop(chunk_id, None)
+                if not postings:
+                    del self.postings[term]
+
+    def clear(self):
+        """색인을 비웁니다."""
+        self.docs = {}
+        self.doc_lengths = {}
+        self.postings = {}
+        self.total_length = 0
+
+    def search(
+        self,
+        query: str,
+        k: int = 4,
+        filter_dict: Optional[dict] = None
+    ) -> List[Tuple[Document, float, float]]:
+        """
+        BM25로 검색합니다.
+
+        Args:
+            query: 검색 쿼리
+            k: 반환할 청크 수
+            filter_dict: 메타데이터 필터 (키별 값이 같은 청크만 검색)
+
+        Returns:
+            (청크, BM25 점수, 쿼리 용어 포함 비율) 튜플 리스트 (점수 내림차순)
+        """
+        query_terms = set(char_ngrams(query, self.ngram_size))
+        if not query_terms or not self.docs:
+            return []
+
+        doc_count = len(self.docs)
+        avg_length = self.total_length / doc_count or 1.0
+        scores: Dict[str, float] = {}
+        matched: Dict[str, int] = {}
+
+        for term in query_terms:
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for chunk_id, tf in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[chunk_id] / avg_length)
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+                matched[chunk_id] = matched.get(chunk_id, 0) + 1
+
+        if filter_dict:
+            scores = {
+                chunk_id: score for chunk_id, score in scores.items()
+                if all(self.docs[chunk_id].metadata.get(key) == value for key, value in filter_dict.items())
+            }
+
+        top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [
+            (self.docs[chunk_id], score, matched[chunk_id] / len(query_terms))
+            for chunk_id, score in top
+        ]
+
+    def save(self, path: str):
+        """
+        색인 대상 청크를 JSON 파일로 저장합니다. (역색인은 로드 시 다시 구성)
+
+        Args:
+            path: 저장할 파일 경로
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": self.VERSION,
+            "index_version": self.index_version,
+            "ngram_size": self.ngram_size,
+            "chunks": [
+                {"id": chunk_id, "text": doc.page_content, "metadata": doc.metadata}
+                for chunk_id, doc in self.docs.items()
+            ],
+        }
+
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["LexicalIndex"]:
+        """
+        저장된 색인을 읽습니다.
+
+        Args:
+            path: 색인 파일 경로
+
+        Returns:
+            LexicalIndex 또는 None (파일이 없거나 형식이 다른 경우)
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"어휘 색인을 읽을 수 없습니다: {e}")
+            return None
+
+        if data.get("version") != cls.VERSION:
+            return None
+
+        index = cls(ngram_size=data.get("ngram_size", 2))
+        index.index_version = data.get("index_version", "")
+        chunks = data.get("chunks", [])
+        index.add(
+            [chunk["id"] for chunk in chunks],
+            [Document(page_content=chunk["text"], metadata=chunk["metadata"]) for chunk in chunks]
+        )
+        return index
@@ -0,0 +1,260 @@
+"""질의 단계별 소요 시간 측정 및 Prometheus 형식 지표 모듈"""
+
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 단계별 지연 시간 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# 지표 설명 (Prometheus HELP 줄)
+METRIC_HELP = {
+    "rag_queries_total": "처리한 질문 수 (status=ok|error|aborted, aborted는 끝까지 읽지 않고 닫힌 스트리밍 답변)",
+    "rag_answer_cache_hits_total": "답변 캐시 적중 수 (type=exact|semantic)",
+    "rag_lexical_shortcuts_total": "임베딩 없이 어휘 검색 결과만으로 처리한 질문 수",
+    "rag_out_of_scope_total": "범위 밖으로 판단한 질문 수",
+    "rag_retrieval_only_total": "임베딩 API 장애로 검색 결과만 제공한 질문 수",
+    "rag_errors_total": "오류로 끝난 질문 수",
+    "rag_prompt_tokens_total": "LLM 프롬프트 토큰 수 합계",
+    "rag_completion_tokens_total": "LLM 응답 토큰 수 합계",
+    "rag_stage_seconds": "질의 처리 단계별 소요 시간 (초)",
+}
+
+
+class QueryTimer:
+    """질문 하나의 처리 단계별 소요 시간을 기록하는 클래스"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """블록 실행 시간을 단계 소요 시간에 더합니다."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float):
+        """단계 소요 시간(초)을 더합니다."""
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def elapsed(self) -> float:
+        """타이머 생성 후 경과 시간(초)을 반환합니다."""
+        return time.perf_counter() - self.started
+
+    def timings(self) -> Dict[str, float]:
+        """
+        단계별 소요 시간을 밀리초로 반환합니다.
+
+        Returns:
+            {"<단계>_ms": 밀리초, ..., "total_ms": 전체 경과 시간} 딕셔너리
+        """
+        timings = {f"{name}_ms": round(seconds * 1000, 3) for name, seconds in self.durations.items()}
+        timings["total_ms"] = round(self.elapsed() * 1000, 3)
+        return timings
+
+
+class MetricsRegistry:
+    """프로세스 단위 카운터와 지연 시간 히스토그램을 모으는 클래스 (스레드 안전)"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        """
+        Args:
+            buckets: 히스토그램 구간 상한 (초, 오름차순)
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._counters: Dict[str, Dict[Tuple[Tuple[str, str], ...], float]] = {}
+        # 라벨 조합별 [구간별 개수..., 최대 구간 초과 개수, 합계, 개수]
+        self._histograms: Dict[str, Dict[Tuple[Tuple[str, str], ...], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _labels(labels: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+        return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def inc(self, name: str, value: float = 1.0, **labels: str):
+        """카운터를 증가시킵니다."""
+        key = self._labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, seconds: float, **labels: str):
+        """히스토그램에 관측값(초)을 추가합니다."""
+        key = self._labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            values = series.get(key)
+            if values is None:
+                values = series[key] = [0.0] * (len(self.buckets) + 3)
+            values[bisect.bisect_left(self.buckets, seconds)] += 1
+            values[-2] += seconds
+            values[-1] += 1
+
+    def observe_stages(self, durations: Dict[str, float]):
+        """
+        단계별 소요 시간(초)을 히스토그램에 반영합니다.
+
+        스트리밍 답변은 검색 단계를 첫 토큰 전에 이 함수로 먼저 기록합니다.
+        """
+        for stage, seconds in durations.items():
+            self.observe("rag_stage_seconds", seconds, stage=stage)
+
+    def observe_query(
+        self,
+        durations: Dict[str, float],
+        total_seconds: float,
+        result: Dict[str, any],
+        status: str = "ok"
+    ):
+        """
+        질문 하나의 처리 결과를 지표에 반영합니다.
+
+        Args:
+            durations: 아직 기록하지 않은 단계별 소요 시간 (초)
+            total_seconds: 전체 소요 시간 (초)
+            result: 질의 결과 딕셔너리
+            status: 처리 결과 "ok", "error", "aborted"(스트림이 중간에 닫힘)
+        """
+        self.inc("rag_queries_total", status=status)
+        if result.get("is_out_of_scope"):
+            self.inc("rag_out_of_scope_total")
+        if result.get("retrieval_only"):
+            self.inc("rag_retrieval_only_total")
+
+        tokens = result.get("tokens") or {}
+        if tokens.get("prompt"):
+            self.inc("rag_prompt_tokens_total", tokens["prompt"])
+        if tokens.get("completion"):
+            self.inc("rag_completion_tokens_total", tokens["completion"])
+
+        self.observe_stages(durations)
+        self.observe("rag_stage_seconds", total_seconds, stage="total")
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        현재 카운터 값과 히스토그램 합계/개수를 반환합니다. (대시보드/디버깅용)
+
+        Returns:
+            {지표 이름{라벨}: 값} 딕셔너리
+        """
+        with self._lock:
+            data = {
+                name + self._format_labels(key): value
+                for name, series in self._counters.items() for key, value in series.items()
+            }
+            for name, series in self._histograms.items():
+                for key, values in series.items():
+                    data[f"{name}_sum{self._format_labels(key)}"] = values[-2]
+                    data[f"{name}_count{self._format_labels(key)}"] = values[-1]
+        return data
+
+    @staticmethod
+    def _format_labels(key: Tuple[Tuple[str, str], ...], extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(key) + ([extra] if extra else [])
+        if not pairs:
+            return ""
+        escaped = (
+            name + '="' + value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+            for name, value in pairs
+        )
+        return "{" + ",".join(escaped) + "}"
+
+    def render(self) -> str:
+        """
+        Prometheus 텍스트 형식(0.0.4)으로 지표를 출력합니다.
+
+        Returns:
+            /metrics 응답 본문
+        """
+        lines = []
+        with self._lock:
+            for name in sorted(self._counters):
+                lines.append(f"# HELP {name} {METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(self._counters[name].items()):
+                    lines.append(f"{name}{self._format_labels(key)} {value:g}")
+
+            for name in sorted(self._histograms):
+                lines.append(f"# HELP {name} {METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, values in sorted(self._histograms[name].items()):
+                    cumulative = 0.0
+                    for bound, count in zip(self.buckets, values):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{self._format_labels(key, ('le', f'{bound:g}'))} {cumulative:g}")
+                    lines.append(f"{name}_bucket{self._format_labels(key, ('le', '+Inf'))} {values[-1]:g}")
+                    lines.append(f"{name}_sum{self._format_labels(key)} {values[-2]:.6f}")
+                    lines.append(f"{name}_count{self._format_labels(key)} {values[-1]:g}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """모든 지표를 초기화합니다."""
+        with self._lock:
+            self._counters = {}
+            self._histograms = {}
+
+
+# 프로세스 전역 지표 (RAGChain 기본값)
+METRICS = MetricsRegistry()
+
+# 포트별로 실행 중인 지표 서버 (Streamlit 재실행 시 중복 실행 방지)
+_servers: Dict[int, ThreadingHTTPServer] = {}
+_servers_lock = threading.Lock()
+
+
+def start_metrics_server(
+    port: int = 9108,
+    host: str = "127.0.0.1",
+    registry: MetricsRegistry = METRICS
+) -> ThreadingHTTPServer:
+    """
+    /metrics 경로로 Prometheus 지표를 제공하는 HTTP 서버를 백그라운드 스레드에서 시작합니다.
+
+    같은 포트로 다시 호출하면 기존 서버를 그대로 반환합니다.
+
+    Args:
+        port: 포트 번호
+        host: 바인딩 주소 (기본값은 로컬에서만 접근 가능)
+        registry: 제공할 지표
+
+    Returns:
+        실행 중인 HTTP 서버
+    """
+    with _servers_lock:
+        if port in _servers:
+            return _servers[port]
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # 수집기 요청마다 로그를 남기지 않음
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name=f"metrics-{port}", daemon=True).start()
+        _servers[port] = server
+        logger.info(f"지표 서버 시작: http://{host}:{port}/metrics")
+        return server
@@ -0,0 +1,75 @@
+"""파싱 결과 캐시 모듈 (정리된 추출 텍스트 저장)"""
+
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class ParsedTextCache:
+    """
+    파일 내용 해시와 파서 버전을 키로 정리된 텍스트를 저장하는 디스크 캐시
+
+    항목마다 파일 하나를 사용하므로 병렬 파싱 프로세스들이 동시에 읽고 써도 안전합니다.
+    """
+
+    def __init__(self, cache_dir: str, parser_version: str):
+        """
+        Args:
+            cache_dir: 캐시 디렉토리
+            parser_version: 파서 버전 (파서 로직이 바뀌면 올려서 기존 캐시를 무효화)
+        """
+        self.cache_dir = Path(cache_dir) / f"v{parser_version}"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _entry_path(self, content_hash: str, ext: str) -> Path:
+        """캐시 항목 파일 경로"""
+        return self.cache_dir / content_hash[:2] / f"{content_hash}{ext}.txt"
+
+    def get(self, content_hash: str, ext: str) -> Optional[str]:
+        """
+        캐시된 텍스트를 조회합니다.
+
+        Args:
+            content_hash: 원본 파일 내용 해시
+            ext: 원본 파일 확장자 (파서 구분용)
+
+        Returns:
+            정리된 텍스트 또는 None (캐시 미스)
+        """
+        path = self._entry_path(content_hash, ext)
+        try:
+            return path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"파싱 캐시 읽기 실패: {path.name} - {e}")
+            return None
+
+    def put(self, content_hash: str, ext: str, text: str):
+        """
+        정리된 텍스트를 캐시에 저장합니다.
+
+        Args:
+            content_hash: 원본 파일 내용 해시
+            ext: 원본 파일 확장자
+            text: 정리된 텍스트
+        """
+        path = self._entry_path(content_hash, ext)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # 임시 파일에 쓴 뒤 교체하여 다른 프로세스가 중간 상태를 읽지 않도록 함
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_name, path)
+        except OSError as e:
+            logger.warning(f"파싱 캐시 저장 실패: {path.name} - {e}")
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
@@ -0,0 +1,325 @@
+"""압축 근사 검색 인덱스 모듈 (IVF 거친 군집화 + int8/PQ 양자화)"""
+
+import logging
+from typing import Dict, Optional
+
+import numpy as np
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+QUANTIZERS = ("int8", "pq")
+
+
+def _nearest(x: np.ndarray, centroids: np.ndarray, batch_size: int = 4096) -> np.ndarray:
+    """각 행에 가장 가까운 중심의 번호 (메모리 사용을 줄이기 위해 나눠서 계산)"""
+    centroid_norms = np.einsum("ij,ij->i", centroids, centroids)
+    labels = np.empty(len(x), dtype=np.int32)
+    for start in range(0, len(x), batch_size):
+        batch = np.asarray(x[start:start + batch_size], dtype=np.float32)
+        labels[start:start + batch_size] = np.argmin(centroid_norms - 2.0 * (batch @ centroids.T), axis=1)
+    return labels
+
+
+def _kmeans(x: np.ndarray, k: int, iterations: int, rng: np.random.Generator) -> np.ndarray:
+    """Lloyd k-means (빈 군집은 임의의 점으로 다시 초기화)"""
+    centroids = x[rng.choice(len(x), size=k, replace=False)].copy()
+    for _ in range(iterations):
+        labels = _nearest(x, centroids)
+        counts = np.bincount(labels, minlength=k)
+        empty = counts == 0
+        # 군집 번호순으로 정렬한 뒤 구간 합으로 중심 갱신
+        starts = (np.cumsum(counts) - counts)[~empty]
+        sums = np.add.reduceat(x[np.argsort(labels, kind="stable")], starts, axis=0)
+        centroids[~empty] = sums / counts[~empty, None]
+        if empty.any():
+            centroids[empty] = x[rng.choice(len(x), size=int(empty.sum()), replace=False)]
+    return centroids
+
+
+class QuantizedIndex:
+    """
+    IVF + 양자화 근사 검색 인덱스 클래스
+
+    벡터를 거친 군집(IVF 리스트)으로 나누고, 각 벡터는 int8 스칼라 양자화(4배 압축) 또는
+    곱 양자화(PQ, 기본 16배 압축) 코드로만 메모리에 둡니다. 검색은 가까운 n_probe개 리스트의
+    코드로 근사 거리를 계산해 후보를 고르고, 호출자가 원본 벡터로 후보만 다시 계산합니다.
+
+    조절 항목:
+        n_probe: 검색할 리스트 수 (클수록 재현율 증가, 지연 증가)
+        rescore_factor: 원본 벡터로 다시 계산할 후보 수 = k * rescore_factor
+        quantizer / pq_subvectors: 벡터당 메모리 (int8 = 차원 바이트, PQ = 서브벡터 수 바이트)
+    """
+
+    def __init__(
+        self,
+        quantizer: str = "int8",
+        n_lists: Optional[int] = None,
+        n_probe: int = 8,
+        pq_subvectors: Optional[int] = None,
+        rescore_factor: int = 4,
+        train_sample: int = 20000,
+        train_iterations: int = 10,
+        seed: int = 0
+    ):
+        """
+        Args:
+            quantizer: 양자화 방식 ("int8" 또는 "pq")
+            n_lists: IVF 리스트 수 (None이면 4 * sqrt(벡터 수))
+            n_probe: 검색 시 확인할 리스트 수
+            pq_subvectors: PQ 서브벡터 수 (None이면 차원 / 4, 즉 float32 대비 16배 압축)
+            rescore_factor: 원본 벡터로 다시 계산할 후보 배수
+            train_sample: 군집/코드북 학습에 사용할 최대 벡터 수
+            train_iterations: k-means 반복 횟수
+            seed: 난수 시드
+        """
+        if quantizer not in QUANTIZERS:
+            raise ValueError(f"지원하지 않는 양자화 방식입니다: {quantizer} (지원: {', '.join(QUANTIZERS)})")
+
+        self.quantizer = quantizer
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.pq_subvectors = pq_subvectors
+        self.rescore_factor = max(1, rescore_factor)
+        self.train_sample = train_sample
+        self.train_iterations = train_iterations
+        self.seed = seed
+
+        self.trained_on = 0
+        self.centroids: Optional[np.ndarray] = None
+        self.scale: Optional[np.ndarray] = None
+        self.codebooks: Optional[np.ndarray] = None
+        self.codes: Optional[np.ndarray] = None
+        self.code_norms: Optional[np.ndarray] = None
+        self.list_rows: Optional[np.ndarray] = None
+        self.list_offsets: Optional[np.ndarray] = None
+
+    def reset(self):
+        """학습 결과와 코드를 모두 지웁니다. (설정은 유지)"""
+        self.trained_on = 0
+        self.centroids = None
+        self.scale = None
+        self.codebooks = None
+        self.codes = None
+        self.code_norms = None
+        self.list_rows = None
+        self.list_offsets = None
+
+    def __len__(self) -> int:
+        return 0 if self.codes is None else len(self.codes)
+
+    @property
+    def trained(self) -> bool:
+        return self.centroids is not None
+
+    def train(self, vectors: np.ndarray):
+        """
+        IVF 중심과 양자화 파라미터를 학습합니다.
+
+        Args:
+            vectors: (N, D) float32 벡터 행렬 (메모리 맵 가능)
+        """
+        rng = np.random.default_rng(self.seed)
+        count, dim = vectors.shape
+        sample_idx = np.sort(rng.choice(count, size=min(count, self.train_sample), replace=False))
+        sample = np.asarray(vectors[sample_idx], dtype=np.float32)
+
+        n_lists = self.n_lists or max(1, int(4 * np.sqrt(count)))
+        n_lists = min(n_lists, len(sample))
+        self.centroids = _kmeans(sample, n_lists, self.train_iterations, rng)
+
+        if self.quantizer == "int8":
+            # 차원별 최대 절댓값을 127에 대응
+            self.scale = np.maximum(np.abs(sample).max(axis=0), 1e-12) / 127.0
+        else:
+            subvectors = self.pq_subvectors or self._default_subvectors(dim)
+            if dim % subvectors:
+                raise ValueError(f"PQ 서브벡터 수({subvectors})는 차원({dim})의 약수여야 합니다.")
+            sub_dim = dim // subvectors
+            n_codes = min(256, len(sample))
+            self.codebooks = np.stack([
+                _kmeans(sample[:, j * sub_dim:(j + 1) * sub_dim], n_codes, self.train_iterations, rng)
+                for j in range(subvectors)
+            ])
+
+        self.trained_on = count
+        logger.info(f"압축 인덱스 학습 완료: {self.quantizer}, 리스트 {n_lists}개, 학습 벡터 {len(sample)}개")
+
+    @staticmethod
+    def _default_subvectors(dim: int) -> int:
+        """차원 / 4 이하에서 차원의 가장 큰 약수 (벡터당 1/16 크기)"""
+        for subvectors in range(max(1, dim // 4), 0, -1):
+            if dim % subvectors == 0:
+                return subvectors
+        return 1
+
+    def _encode(self, vectors: np.ndarray, batch_size: int = 4096) -> np.ndarray:
+        """벡터를 양자화 코드로 변환합니다."""
+        count, dim = vectors.shape
+        if self.quantizer == "int8":
+            codes = np.empty((count, dim), dtype=np.int8)
+            for start in range(0, count, batch_size):
+                batch = np.asarray(vectors[start:start + batch_size], dtype=np.float32)
+                codes[start:start + batch_size] = np.clip(np.rint(batch / self.scale), -127, 127)
+            return codes
+
+        subvectors, _, sub_dim = self.codebooks.shape
+        codes = np.empty((count, subvectors), dtype=np.uint8)
+        for start in range(0, count, batch_size):
+            batch = np.asarray(vectors[start:start + batch_size], dtype=np.float32)
+            for j in range(subvectors):
+                codes[start:start + batch_size, j] = _nearest(
+                    batch[:, j * sub_dim:(j + 1) * sub_dim], self.codebooks[j]
+                )
+        return codes
+
+    def _decode_norms(self) -> np.ndarray:
+        """코드로 복원한 벡터의 제곱 노름 (근사 거리 계산용)"""
+        if self.quantizer == "int8":
+            norms = np.empty(len(self.codes), dtype=np.float32)
+            scale_sq = self.scale ** 2
+            for start in range(0, len(self.codes), 4096):
+                batch = self.codes[start:start + 4096].astype(np.float32)
+                norms[start:start + 4096] = (batch * batch) @ scale_sq
+            return norms
+
+        subvectors = self.codebooks.shape[0]
+        codeword_norms = np.einsum("mkd,mkd->mk", self.codebooks, self.codebooks)
+        return codeword_norms[np.arange(subvectors), self.codes].sum(axis=1).astype(np.float32)
+
+    def build(self, vectors: np.ndarray):
+        """
+        모든 벡터를 리스트에 배정하고 코드로 변환합니다.
+
+        학습된 적이 없거나 벡터 수가 학습 시점의 2배를 넘으면 먼저 다시 학습합니다.
+
+        Args:
+            vectors: (N, D) float32 벡터 행렬 (메모리 맵 가능)
+        """
+        if not self.trained or len(vectors) > 2 * self.trained_on:
+            self.train(vectors)
+
+        assignments = _nearest(vectors, self.centroids)
+        self.list_rows = np.argsort(assignments, kind="stable").astype(np.int32)
+        self.list_offsets = np.searchsorted(
+            assignments[self.list_rows], np.arange(len(self.centroids) + 1)
+        ).astype(np.int64)
+        self.codes = self._encode(vectors)
+        self.code_norms = self._decode_norms()
+
+    def search(self, query: np.ndarray, k: int, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        근사 거리로 후보 행 번호를 고릅니다.
+
+        Args:
+            query: 쿼리 벡터
+            k: 최종 반환할 결과 수 (후보는 k * rescore_factor개)
+            mask: 검색 대상 행 마스크 (메타데이터 필터)
+
+        Returns:
+            후보 행 번호 배열 (원본 벡터로 다시 계산해야 함)
+        """
+        if not len(self):
+            return np.empty(0, dtype=np.int64)
+
+        centroid_dist = np.einsum("ij,ij->i", self.centroids, self.centroids) - 2.0 * (self.centroids @ query)
+        n_probe = min(self.n_probe, len(self.centroids))
+        probe = np.argpartition(centroid_dist, n_probe - 1)[:n_probe]
+        rows = np.concatenate([
+            self.list_rows[self.list_offsets[i]:self.list_offsets[i + 1]] for i in probe
+        ])
+        if mask is not None:
+            rows = rows[mask[rows]]
+        if not len(rows):
+            return rows
+
+        codes = self.codes[rows]
+        if self.quantizer == "int8":
+            dots = codes.astype(np.float32) @ (query * self.scale)
+        else:
+            subvectors, _, sub_dim = self.codebooks.shape
+            tables = np.einsum("mkd,md->mk", self.codebooks, query.reshape(subvectors, sub_dim))
+            dots = tables[np.arange(subvectors), codes].sum(axis=1)
+        approx = self.code_norms[rows] - 2.0 * dots
+
+        shortlist = min(len(rows), k * self.rescore_factor)
+        if shortlist < len(rows):
+            rows = rows[np.argpartition(approx, shortlist - 1)[:shortlist]]
+        return rows
+
+    def memory_bytes(self) -> int:
+        """인덱스가 메모리에 두는 배열의 총 바이트 수"""
+        arrays = [
+            self.centroids, self.scale, self.codebooks, self.codes,
+            self.code_norms, self.list_rows, self.list_offsets,
+        ]
+        return int(sum(array.nbytes for array in arrays if array is not None))
+
+    def save(self, path: str, fingerprint: str):
+        """
+        인덱스를 .npz 파일로 저장합니다.
+
+        Args:
+            path: 저장 경로
+            fingerprint: 인덱싱된 벡터 집합 식별자 (로드 시 일치 여부 확인)
+        """
+        arrays = {
+            "centroids": self.centroids,
+            "codes": self.codes,
+            "code_norms": self.code_norms,
+            "list_rows": self.list_rows,
+            "list_offsets": self.list_offsets,
+        }
+        if self.scale is not None:
+            arrays["scale"] = self.scale
+        if self.codebooks is not None:
+            arrays["codebooks"] = self.codebooks
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                quantizer=np.array(self.quantizer),
+                fingerprint=np.array(fingerprint),
+                trained_on=np.array(self.trained_on),
+                **arrays
+            )
+
+    def load(self, path: str, fingerprint: str) -> bool:
+        """
+        저장된 인덱스를 읽습니다. (검색 설정은 현재 값을 유지)
+
+        Args:
+            path: 인덱스 파일 경로
+            fingerprint: 현재 벡터 집합 식별자
+
+        Returns:
+            읽기 성공 여부 (파일이 없거나 벡터 집합/양자화 방식이 다르면 False)
+        """
+        try:
+            data = np.load(path)
+        except (OSError, ValueError):
+            return False
+
+        with data:
+            if str(data["quantizer"]) != self.quantizer or str(data["fingerprint"]) != fingerprint:
+                return False
+            self.trained_on = int(data["trained_on"])
+            self.centroids = data["centroids"]
+            self.codes = data["codes"]
+            self.code_norms = data["code_norms"]
+            self.list_rows = data["list_rows"]
+            self.list_offsets = data["list_offsets"]
+            self.scale = data["scale"] if "scale" in data else None
+            self.codebooks = data["codebooks"] if "codebooks" in data else None
+        return True
+
+    def stats(self) -> Dict[str, float]:
+        """인덱스 구성과 메모리 사용량을 반환합니다."""
+        return {
+            "quantizer": self.quantizer,
+            "vectors": len(self),
+            "lists": 0 if self.centroids is None else len(self.centroids),
+            "n_probe": self.n_probe,
+            "rescore_factor": self.rescore_factor,
+            "memory_mb": self.memory_bytes() / 1024 / 1024,
+        }
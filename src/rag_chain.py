@@ -1,16 +1,24 @@
 """RAG 체인 구성 모듈"""
 
+import math
 import os
-from typing import List, Dict, Optional, Tuple
+import re
+import time
+import asyncio
+from typing import List, Dict, Iterator, Optional, Tuple
 import logging
 
-from langchain_openai import ChatOpenAI
+from langchain_core.language_models import BaseChatModel
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.documents import Document
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough
 
 from .vector_store import VectorStoreManager
+from .context_packer import ContextPacker
+from .answer_cache import AnswerCache
+from .metrics import METRICS, MetricsRegistry, QueryTimer
+from .regulation_splitter import article_references, covers_article, format_article
+from .utils import count_tokens
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -36,6 +44,9 @@ SYSTEM_PROMPT_TEMPLATE = """당신은 NICE평가정보의 내규 및 규정에 
 
 답변:"""
 
+# 임베딩 API 장애 시 검색 결과만 제공할 때의 안내 문구
+RETRIEVAL_ONLY_NOTICE = "⚠️ 현재 AI 답변 생성 서비스에 연결할 수 없어, 질문과 관련된 규정 원문을 검색 결과로 보여드립니다.\n\n"
+
 
 class RAGChain:
     """RAG 체인 클래스"""
@@ -46,7 +57,16 @@ class RAGChain:
         model_name: str = "gpt-4-turbo-preview",
         temperature: float = 0,
         similarity_threshold: float = 1.2,  # 더 관대하게 조정 (0.5 -> 1.2)
-        top_k: int = 6  # 더 많은 문서 검색 (4 -> 6)
+        top_k: int = 6,  # 더 많은 문서 검색 (4 -> 6)
+        context_max_tokens: int = 4000,
+        answer_cache: Optional[AnswerCache] = None,
+        hybrid_search: bool = True,
+        lexical_min_coverage: float = 1.0,
+        lexical_scope_min_coverage: float = 0.45,
+        rrf_k: int = 60,
+        llm: Optional[BaseChatModel] = None,
+        metrics: Optional[MetricsRegistry] = None,
+        index_version_check_interval: float = 5.0
     ):
         """
         Args:
@@ -55,17 +75,48 @@ class RAGChain:
             temperature: 생성 온도 (0=결정적, 1=창의적)
             similarity_threshold: 유사도 임계값 (이하는 범위 밖으로 간주)
             top_k: 검색할 문서 수
+            context_max_tokens: 프롬프트 컨텍스트 최대 토큰 수
+            answer_cache: 답변 캐시 (None이면 캐시 미사용)
+            hybrid_search: 어휘(BM25) 검색 결과를 벡터 검색 결과와 함께 사용할지 여부
+            lexical_min_coverage: 정확 조회 질문(조 번호 또는 질문 전체가 최상위 청크에 있음)의
+                최상위 청크가 쿼리 용어를 이 비율 이상 포함하면 임베딩 없이 어휘 검색 결과만 사용
+                (1보다 크면 항상 벡터 검색)
+            lexical_scope_min_coverage: 어휘 검색 결과만으로 답할 때(어휘 색인 적중, 검색 전용 모드)
+                쿼리 용어 포함 비율이 이보다 낮으면 범위 밖으로 간주 (벡터 거리 임계값과 별도)
+            rrf_k: RRF(Reciprocal Rank Fusion) 순위 보정 상수
+            llm: 직접 생성한 채팅 모델 (지정하면 OpenAI 모델 대신 사용, 오프라인 벤치마크용)
+            metrics: 질의 지표를 기록할 레지스트리 (None이면 프로세스 전역 METRICS)
+            index_version_check_interval: 답변 캐시 사용 시 인덱스 버전을 다시 확인하는 간격 (초)
+                (다른 프로세스의 재인덱싱/업로드 후 이전 인덱스로 만든 답변을 반환하지 않도록)
         """
         self.vs_manager = vector_store_manager
         self.model_name = model_name
         self.temperature = temperature
         self.similarity_threshold = similarity_threshold
         self.top_k = top_k
+        self.answer_cache = answer_cache
+        self.hybrid_search = hybrid_search
+        self.lexical_min_coverage = lexical_min_coverage
+        self.lexical_scope_min_coverage = lexical_scope_min_coverage
+        self.rrf_k = rrf_k
+        self.metrics = metrics or METRICS
+        self.index_version_check_interval = index_version_check_interval
+        self._index_version_checked_at = 0.0
         
-        # LLM 초기화
-        self.llm = ChatOpenAI(
-            model_name=model_name,
-            temperature=temperature
+        # LLM 초기화 (langchain_openai는 기본 LLM을 만들 때만 로드)
+        if llm is None:
+            from langchain_openai import ChatOpenAI
+            
+            llm = ChatOpenAI(
+                model_name=model_name,
+                temperature=temperature
+            )
+        self.llm = llm
+        
+        # 컨텍스트 구성기 (청크 병합, 하위 청크/무관 문장 제거, 토큰 예산 적용)
+        self.context_packer = ContextPacker(
+            max_tokens=context_max_tokens,
+            model_name=model_name
         )
         
         # 프롬프트 템플릿 설정 (LCEL 방식)
@@ -73,7 +124,6 @@ class RAGChain:
         
         # RAG 체인 생성
         self.chain = None
-        self.retriever = None
         self._initialize_chain()
     
     def _initialize_chain(self):
@@ -83,26 +133,505 @@ class RAGChain:
         if not vectorstore:
             raise ValueError("벡터 스토어가 초기화되지 않았습니다.")
         
-        # Retriever 설정
-        self.retriever = self.vs_manager.get_retriever(
-            search_kwargs={"k": self.top_k}
-        )
-        
-        # 문서를 컨텍스트 문자열로 변환하는 함수
-        def format_docs(docs):
-            return "\n\n".join(doc.page_content for doc in docs)
-        
-        # LCEL 체인 구성
+        # LCEL 체인 구성 (검색은 query에서 한 번만 수행하고 결과를 주입)
         self.chain = (
-            {
-                "context": self.retriever | format_docs,
-                "question": RunnablePassthrough()
-            }
-            | self.prompt
+            self.prompt
             | self.llm
             | StrOutputParser()
         )
     
+    def _build_context(
+        self,
+        question: str,
+        search_results: List[Tuple[Document, float]]
+    ) -> Tuple[str, List[Document]]:
+        """검색 결과를 토큰 예산에 맞는 컨텍스트 문자열로 변환합니다."""
+        return self.context_packer.pack(question, search_results)
+    
+    @staticmethod
+    def _build_sources(docs: List[Document]) -> List[Dict[str, str]]:
+        """검색된 문서로부터 출처 정보를 구성합니다."""
+        sources = []
+        for doc in docs:
+            source = {
+                "filename": doc.metadata.get("filename", "Unknown"),
+                "category": doc.metadata.get("category", "Unknown"),
+                "content_preview": doc.page_content[:200] + "..."
+            }
+            if doc.metadata.get("page"):
+                source["page"] = doc.metadata["page"]
+            if doc.metadata.get("article"):
+                source["article"] = format_article(doc.metadata)
+            sources.append(source)
+        return sources
+    
+    def _lexical_search(
+        self,
+        question: str,
+        filter_dict: Optional[dict] = None
+    ) -> List[Tuple[Document, float, float]]:
+        """어휘 색인을 검색합니다. (하이브리드 검색 미사용 시 빈 리스트)"""
+        if not self.hybrid_search:
+            return []
+        return self.vs_manager.lexical_search(question, k=self.top_k, filter_dict=filter_dict)
+    
+    def _is_lexical_hit(self, question: str, lexical_results: List[Tuple[Document, float, float]]) -> bool:
+        """
+        임베딩 없이 어휘 검색 결과만으로 답할 정확 조회 질문인지 판단합니다.
+        
+        벡터 범위 판단을 건너뛰므로, 최상위 청크가 쿼리 용어를 충분히 포함하면서 다음 중
+        하나에 해당할 때만 적중으로 봅니다. (용어가 코퍼스 곳곳에 흩어져 있을 뿐인 일반 질문 제외)
+        - 질문의 조 번호(제N조)를 모두 최상위 청크가 담고 있음
+        - 공백과 문장부호를 뺀 질문 전체가 최상위 청크 본문에 그대로 있음
+        """
+        min_coverage = max(self.lexical_min_coverage, self.lexical_scope_min_coverage)
+        if not lexical_results or lexical_results[0][2] < min_coverage:
+            return False
+        
+        doc = lexical_results[0][0]
+        articles = article_references(question)
+        if articles:
+            return all(covers_article(doc.metadata, article) for article in articles)
+        return self._compact(question) in self._compact(doc.page_content)
+    
+    @staticmethod
+    def _compact(text: str) -> str:
+        """정확 조회 비교용으로 소문자로 바꾸고 공백과 문장부호를 제거합니다."""
+        return re.sub(r"\W+", "", text.lower())
+    
+    def _check_lexical_scope(self, lexical_results: List[Tuple[Document, float, float]]) -> Optional[Dict[str, any]]:
+        """
+        어휘 검색 결과만으로 범위 밖 여부를 판단합니다. (쿼리 용어 포함 비율 기준)
+        
+        포함 비율은 벡터 거리와 척도가 달라 similarity_threshold 대신 lexical_scope_min_coverage와 비교합니다.
+        
+        Returns:
+            범위 밖이면 반환할 결과 딕셔너리, 답변 가능하면 None
+        """
+        if not lexical_results:
+            return self._out_of_scope_result(found=False)
+        if max(coverage for _, _, coverage in lexical_results) < self.lexical_scope_min_coverage:
+            return self._out_of_scope_result(found=True)
+        return None
+    
+    @staticmethod
+    def _lexical_to_scored(lexical_results: List[Tuple[Document, float, float]]) -> List[Tuple[Document, float]]:
+        """
+        어휘 검색 결과를 (문서, 거리) 형식으로 변환합니다.
+        
+        쿼리 용어 포함 비율을 1에서 뺀 값을 거리로 사용하고, 순위가 내려갈수록 거리가
+        줄어들지 않도록 맞춥니다. (컨텍스트 구성의 하위 청크 제외용이며 범위 판단에는 쓰지 않음)
+        """
+        results = []
+        distance = 0.0
+        for doc, _, coverage in lexical_results:
+            distance = max(distance, 1.0 - coverage)
+            results.append((doc, distance))
+        return results
+    
+    @staticmethod
+    def _doc_key(doc: Document) -> Tuple[str, str]:
+        """검색 결과 병합 시 같은 청크를 식별하는 키"""
+        return doc.metadata.get("source", ""), doc.page_content
+    
+    def _fuse(
+        self,
+        vector_results: List[Tuple[Document, float]],
+        lexical_results: List[Tuple[Document, float, float]]
+    ) -> List[Tuple[Document, float]]:
+        """
+        벡터 검색과 어휘 검색 결과를 RRF로 합칩니다.
+        
+        순서는 두 검색의 순위로 정하고, 각 청크는 자신의 벡터 거리를 그대로 갖습니다.
+        벡터 결과에 없는(어휘 검색으로만 찾은) 청크의 거리는 inf이므로 범위 판단에 쓰이지 않습니다.
+        
+        Returns:
+            (문서, 거리) 튜플 리스트 (RRF 점수 순)
+        """
+        if not lexical_results or not vector_results:
+            return vector_results
+        
+        fused: Dict[Tuple[str, str], float] = {}
+        docs: Dict[Tuple[str, str], Document] = {}
+        distances: Dict[Tuple[str, str], float] = {}
+        
+        for rank, (doc, distance) in enumerate(vector_results):
+            key = self._doc_key(doc)
+            fused[key] = fused.get(key, 0.0) + 1.0 / (self.rrf_k + rank + 1)
+            docs[key] = doc
+            distances[key] = distance
+        
+        for rank, (doc, _, _) in enumerate(lexical_results):
+            key = self._doc_key(doc)
+            fused[key] = fused.get(key, 0.0) + 1.0 / (self.rrf_k + rank + 1)
+            docs.setdefault(key, doc)
+        
+        ordered = sorted(fused, key=fused.get, reverse=True)[:self.top_k]
+        return [(docs[key], distances.get(key, math.inf)) for key in ordered]
+    
+    def _retrieval_only_result(
+        self,
+        question: str,
+        lexical_results: List[Tuple[Document, float, float]],
+        error: Exception,
+        timer: QueryTimer
+    ) -> Dict[str, any]:
+        """
+        임베딩 API를 사용할 수 없을 때 어휘 검색 결과만으로 검색 전용 결과를 구성합니다.
+        
+        어휘 색인이 없으면 원래 오류를 다시 발생시킵니다.
+        """
+        if not self.hybrid_search or not self.vs_manager.has_lexical_index():
+            raise error
+        
+        logger.warning(f"임베딩 API를 사용할 수 없어 검색 전용 모드로 응답합니다: {error}")
+        out_of_scope = self._check_lexical_scope(lexical_results)
+        if out_of_scope:
+            return out_of_scope
+        
+        with timer.stage("context"):
+            context, docs = self._build_context(question, self._lexical_to_scored(lexical_results))
+        return {
+            "answer": RETRIEVAL_ONLY_NOTICE + context,
+            "sources": self._build_sources(docs),
+            "is_out_of_scope": False,
+            "confidence": lexical_results[0][2],
+            "retrieval_only": True
+        }
+    
+    def _use_answer_cache(self, filter_dict: Optional[dict]) -> bool:
+        """답변 캐시는 필터가 없는 질문에만 사용합니다."""
+        return self.answer_cache is not None and filter_dict is None
+    
+    def _prepare_lexical(
+        self,
+        question: str,
+        filter_dict: Optional[dict],
+        timer: QueryTimer
+    ) -> Tuple[Optional[tuple], List[Tuple[Document, float, float]]]:
+        """
+        임베딩 전 단계: 답변 캐시 정확 일치 확인과 어휘 색인 검색 (동기, _prepare/_aprepare 공통)
+        
+        Returns:
+            (캐시 적중/어휘 색인 적중 시 _prepare가 바로 반환할 값 또는 None, 어휘 검색 결과)
+        """
+        if self._use_answer_cache(filter_dict):
+            with timer.stage("answer_cache"):
+                self._sync_answer_cache()
+                cached = self.answer_cache.get_exact(question)
+            if cached:
+                logger.info("답변 캐시 적중 (정확 일치)")
+                self.metrics.inc("rag_answer_cache_hits_total", type="exact")
+                return (cached, None, []), []
+        
+        with timer.stage("lexical_search"):
+            lexical_results = self._lexical_search(question, filter_dict)
+        if self._is_lexical_hit(question, lexical_results):
+            logger.info("어휘 색인 적중: 임베딩 없이 검색 결과를 사용합니다.")
+            self.metrics.inc("rag_lexical_shortcuts_total")
+            return (None, None, self._lexical_to_scored(lexical_results)), lexical_results
+        return None, lexical_results
+    
+    def _prepare_vector(
+        self,
+        embedding: List[float],
+        lexical_results: List[Tuple[Document, float, float]],
+        filter_dict: Optional[dict],
+        timer: QueryTimer
+    ) -> Tuple[Optional[Dict[str, any]], Optional[List[float]], List[Tuple[Document, float]]]:
+        """
+        임베딩 후 단계: 유사 질문 캐시 확인, 벡터 검색, 어휘 검색 결과와 융합 (동기, _prepare/_aprepare 공통)
+        
+        Returns:
+            _prepare와 같은 형식의 튜플
+        """
+        if self._use_answer_cache(filter_dict):
+            with timer.stage("answer_cache"):
+                cached = self.answer_cache.get_similar(embedding)
+            if cached:
+                logger.info("답변 캐시 적중 (유사 질문)")
+                self.metrics.inc("rag_answer_cache_hits_total", type="semantic")
+                return cached, embedding, []
+        
+        with timer.stage("vector_search"):
+            vector_results = self.vs_manager.similarity_search_by_vector(
+                embedding,
+                k=self.top_k,
+                filter_dict=filter_dict
+            )
+            search_results = self._fuse(vector_results, lexical_results)
+        return None, embedding, search_results
+    
+    def _prepare(
+        self,
+        question: str,
+        filter_dict: Optional[dict] = None,
+        timer: Optional[QueryTimer] = None
+    ) -> Tuple[Optional[Dict[str, any]], Optional[List[float]], List[Tuple[Document, float]]]:
+        """
+        답변 캐시 조회와 검색을 질문당 한 번씩 수행합니다.
+        
+        1. 답변 캐시 정확 일치 확인
+        2. 어휘 색인 검색 - 정확 조회 질문(_is_lexical_hit)이면 임베딩 없이 사용
+           (이때 범위 판단은 조 번호/질문 전체 일치로 끝난 것이므로 질문 임베딩은 None)
+        3. 쿼리 임베딩으로 유사 질문 캐시 확인 후 벡터 검색, 어휘 검색 결과와 융합
+        
+        임베딩 API 호출이 실패하면 어휘 검색 결과로 검색 전용 결과를 만듭니다.
+        답변 캐시는 필터가 없는 질문에만 사용합니다.
+        단계별 소요 시간은 timer에 기록합니다.
+        
+        Returns:
+            (바로 반환할 결과 또는 None, 질문 임베딩 또는 None, (문서, 거리) 검색 결과)
+        """
+        timer = timer or QueryTimer()
+        prepared, lexical_results = self._prepare_lexical(question, filter_dict, timer)
+        if prepared:
+            return prepared
+        
+        try:
+            with timer.stage("embedding"):
+                embedding = self.vs_manager.embed_query(question)
+        except Exception as e:
+            return self._retrieval_only_result(question, lexical_results, e, timer), None, []
+        
+        return self._prepare_vector(embedding, lexical_results, filter_dict, timer)
+    
+    async def _aprepare(
+        self,
+        question: str,
+        filter_dict: Optional[dict] = None,
+        timer: Optional[QueryTimer] = None
+    ) -> Tuple[Optional[Dict[str, any]], Optional[List[float]], List[Tuple[Document, float]]]:
+        """
+        _prepare의 비동기 버전
+        
+        쿼리 임베딩만 비동기 클라이언트로 요청하고, 답변 캐시(SQLite)/어휘 검색/벡터 검색 단계는
+        이벤트 루프를 막지 않도록 스레드에서 실행합니다.
+        """
+        timer = timer or QueryTimer()
+        prepared, lexical_results = await asyncio.to_thread(self._prepare_lexical, question, filter_dict, timer)
+        if prepared:
+            return prepared
+        
+        try:
+            with timer.stage("embedding"):
+                embedding = await self.vs_manager.aembed_query(question)
+        except Exception as e:
+            result = await asyncio.to_thread(self._retrieval_only_result, question, lexical_results, e, timer)
+            return result, None, []
+        
+        return await asyncio.to_thread(self._prepare_vector, embedding, lexical_results, filter_dict, timer)
+    
+    def _sync_answer_cache(self):
+        """
+        인덱스 버전이 바뀌었으면 답변 캐시의 버전을 갱신합니다.
+        
+        index_version_check_interval 초마다 저장소에서 버전을 다시 읽으며, 확인에 실패하면
+        기존 버전을 유지합니다.
+        """
+        now = time.monotonic()
+        if now - self._index_version_checked_at < self.index_version_check_interval:
+            return
+        self._index_version_checked_at = now
+        
+        try:
+            index_version = self.vs_manager.get_index_version(refresh=True)
+        except Exception as e:
+            logger.warning(f"인덱스 버전을 확인할 수 없습니다: {e}")
+            return
+        
+        if index_version != self.answer_cache.index_version:
+            logger.info(f"인덱스 버전이 바뀌었습니다: {self.answer_cache.index_version} -> {index_version}")
+            self.answer_cache.set_index_version(index_version)
+    
+    def _store_answer(self, question: str, embedding: Optional[List[float]], result: Dict[str, any]):
+        """범위 안 답변을 답변 캐시에 저장합니다. (질의별 소요 시간과 토큰 수는 제외)"""
+        if self.answer_cache and not result["is_out_of_scope"]:
+            cached = {key: value for key, value in result.items() if key not in ("timings", "tokens")}
+            self.answer_cache.put(question, embedding, cached)
+    
+    def _count_tokens(self, question: str, context: str, answer: str = "") -> Dict[str, int]:
+        """LLM에 보낸 프롬프트와 받은 답변의 토큰 수를 계산합니다."""
+        prompt = self.prompt.format(context=context, question=question)
+        return {
+            "prompt": count_tokens(prompt, self.model_name),
+            "completion": count_tokens(answer, self.model_name) if answer else 0
+        }
+    
+    def _finish(
+        self,
+        result: Dict[str, any],
+        timer: QueryTimer,
+        status: str = "ok",
+        observed_stages: Tuple[str, ...] = ()
+    ) -> Dict[str, any]:
+        """
+        결과에 단계별 소요 시간(timings, 밀리초)과 토큰 수(tokens)를 붙이고 프로세스 지표에 기록합니다.
+        
+        timings 딕셔너리는 제자리에서 갱신하므로, 스트리밍 결과는 스트림이 끝난 뒤 값이 채워집니다.
+        
+        Args:
+            result: 질의 결과 딕셔너리
+            timer: 단계별 소요 시간 타이머
+            status: 지표 라벨 "ok", "error", "aborted"
+            observed_stages: 이미 지표에 기록한 단계 (스트리밍 답변의 검색 단계)
+        """
+        result.setdefault("tokens", {"prompt": 0, "completion": 0})
+        result.setdefault("timings", {}).update(timer.timings())
+        durations = {stage: seconds for stage, seconds in timer.durations.items() if stage not in observed_stages}
+        self.metrics.observe_query(durations, timer.elapsed(), result, status=status)
+        return result
+    
+    @staticmethod
+    def _out_of_scope_result(found: bool) -> Dict[str, any]:
+        """범위 밖 안내 결과 (found=False면 검색 결과 자체가 없는 경우)"""
+        if not found:
+            answer = "죄송합니다. 관련된 문서를 찾을 수 없습니다."
+        else:
+            answer = "죄송합니다. 해당 질문은 제공된 NICE평가정보 내규 문서의 범위를 벗어납니다. NICE평가정보의 조직, 인사, 복지, 감사, 업무, IT, 기업평가, 금융소비자 보호 관련 내규에 대해서만 답변드릴 수 있습니다."
+        return {
+            "answer": answer,
+            "sources": [],
+            "is_out_of_scope": True,
+            "confidence": 0.0
+        }
+    
+    def _check_scope(
+        self,
+        search_results: List[Tuple[Document, float]],
+        check_distance: bool = True
+    ) -> Optional[Dict[str, any]]:
+        """
+        검색 결과로 범위 밖 여부를 판단합니다.
+        
+        Args:
+            search_results: (문서, 거리) 튜플 리스트
+            check_distance: 벡터 거리를 similarity_threshold와 비교할지 여부
+                (어휘 색인 적중 결과는 _is_lexical_hit에서 이미 판단했으므로 False)
+        
+        Returns:
+            범위 밖이면 반환할 결과 딕셔너리, 답변 가능하면 None
+        """
+        # 유사도 점수 확인
+        if not search_results:
+            return self._out_of_scope_result(found=False)
+        
+        # 임계값 이하인 경우 범위 밖으로 판단 (ChromaDB는 거리를 반환, 낮을수록 유사)
+        # 융합 결과는 RRF 순이므로 순위와 관계없이 가장 가까운 벡터 거리로 판단 (어휘 검색으로만 찾은 청크는 inf)
+        if check_distance and self._best_distance(search_results) > self.similarity_threshold:
+            return self._out_of_scope_result(found=True)
+        
+        return None
+    
+    @staticmethod
+    def _best_distance(search_results: List[Tuple[Document, float]]) -> float:
+        """검색 결과 중 가장 가까운 거리를 반환합니다."""
+        return min(distance for _, distance in search_results)
+    
+    def _answer_context(
+        self,
+        question: str,
+        search_results: List[Tuple[Document, float]],
+        timer: QueryTimer,
+        check_distance: bool = True
+    ) -> Tuple[Optional[Dict[str, any]], str, List[Document]]:
+        """
+        범위를 판단하고 프롬프트 컨텍스트를 구성합니다. (동기, _answer/_aanswer/query_stream 공통)
+        
+        Returns:
+            (범위 밖이면 반환할 결과 또는 None, 컨텍스트 문자열, 컨텍스트에 사용된 청크 리스트)
+        """
+        out_of_scope = self._check_scope(search_results, check_distance)
+        if out_of_scope:
+            return out_of_scope, "", []
+        
+        with timer.stage("context"):
+            context, docs = self._build_context(question, search_results)
+        return None, context, docs
+    
+    def _answer_metadata(
+        self,
+        question: str,
+        search_results: List[Tuple[Document, float]],
+        context: str,
+        docs: List[Document],
+        answer: str = ""
+    ) -> Dict[str, any]:
+        """범위 안 답변의 출처, 신뢰도, 토큰 수를 구성합니다."""
+        return {
+            "sources": self._build_sources(docs),
+            "is_out_of_scope": False,
+            "confidence": 1.0 - self._best_distance(search_results),  # 거리를 신뢰도로 변환
+            "tokens": self._count_tokens(question, context, answer)
+        }
+    
+    def _answer(
+        self,
+        question: str,
+        search_results: List[Tuple[Document, float]],
+        timer: Optional[QueryTimer] = None,
+        check_distance: bool = True
+    ) -> Dict[str, any]:
+        """
+        검색 결과를 범위 판단, 프롬프트 컨텍스트, 출처 정보에 재사용하여 답변합니다.
+        
+        Args:
+            question: 사용자 질문
+            search_results: (문서, 거리) 튜플 리스트
+            timer: 단계별 소요 시간 기록용 타이머
+            check_distance: 벡터 거리로 범위를 판단할지 여부 (어휘 색인 적중 결과는 False)
+        
+        Returns:
+            답변과 메타데이터를 포함한 딕셔너리
+        """
+        timer = timer or QueryTimer()
+        out_of_scope, context, docs = self._answer_context(question, search_results, timer, check_distance)
+        if out_of_scope:
+            return out_of_scope
+        
+        # 검색된 문서로 구성한 컨텍스트로 LCEL 체인 실행
+        with timer.stage("generation"):
+            answer = self.chain.invoke({
+                "context": context,
+                "question": question
+            })
+        
+        return {"answer": answer, **self._answer_metadata(question, search_results, context, docs, answer)}
+    
+    async def _aanswer(
+        self,
+        question: str,
+        search_results: List[Tuple[Document, float]],
+        timer: Optional[QueryTimer] = None,
+        check_distance: bool = True
+    ) -> Dict[str, any]:
+        """_answer의 비동기 버전 (컨텍스트 구성은 스레드에서, LLM 호출은 비동기 클라이언트로 실행)"""
+        timer = timer or QueryTimer()
+        out_of_scope, context, docs = await asyncio.to_thread(
+            self._answer_context, question, search_results, timer, check_distance
+        )
+        if out_of_scope:
+            return out_of_scope
+        
+        with timer.stage("generation"):
+            answer = await self.chain.ainvoke({
+                "context": context,
+                "question": question
+            })
+        
+        return {"answer": answer, **self._answer_metadata(question, search_results, context, docs, answer)}
+    
+    def _error_result(self, e: Exception) -> Dict[str, any]:
+        """오류 발생 시 반환할 결과를 구성합니다."""
+        logger.error(f"쿼리 처리 중 오류 발생: {str(e)}")
+        self.metrics.inc("rag_errors_total")
+        return {
+            "answer": f"죄송합니다. 답변 생성 중 오류가 발생했습니다: {str(e)}",
+            "sources": [],
+            "is_out_of_scope": False,
+            "confidence": 0.0
+        }
+    
     def query(self, question: str) -> Dict[str, any]:
         """
         질문에 대한 답변을 생성합니다.
@@ -112,66 +641,50 @@ class RAGChain:
         
         Returns:
             답변과 메타데이터를 포함한 딕셔너리
+            (timings: 단계별 소요 시간(밀리초), tokens: 프롬프트/응답 토큰 수 포함)
         """
         if not self.chain:
             raise ValueError("RAG 체인이 초기화되지 않았습니다.")
         
+        timer = QueryTimer()
+        status = "ok"
         try:
-            # 유사도 검색 수행
-            search_results = self.vs_manager.similarity_search(
-                question,
-                k=self.top_k
-            )
-            
-            # 유사도 점수 확인
-            if not search_results:
-                return {
-                    "answer": "죄송합니다. 관련된 문서를 찾을 수 없습니다.",
-                    "sources": [],
-                    "is_out_of_scope": True,
-                    "confidence": 0.0
-                }
-            
-            # 최고 유사도 점수 확인
-            best_score = search_results[0][1]
-            
-            # 임계값 이하인 경우 범위 밖으로 판단
-            if best_score > self.similarity_threshold:  # ChromaDB는 거리를 반환 (낮을수록 유사)
-                return {
-                    "answer": "죄송합니다. 해당 질문은 제공된 NICE평가정보 내규 문서의 범위를 벗어납니다. NICE평가정보의 조직, 인사, 복지, 감사, 업무, IT, 기업평가, 금융소비자 보호 관련 내규에 대해서만 답변드릴 수 있습니다.",
-                    "sources": [],
-                    "is_out_of_scope": True,
-                    "confidence": 0.0
-                }
-            
-            # LCEL 체인 실행
-            answer = self.chain.invoke(question)
-            
-            # 소스 문서 정리 (retriever에서 직접 가져옴)
-            source_docs = self.retriever.invoke(question)
-            sources = []
-            for doc in source_docs:
-                sources.append({
-                    "filename": doc.metadata.get("filename", "Unknown"),
-                    "category": doc.metadata.get("category", "Unknown"),
-                    "content_preview": doc.page_content[:200] + "..."
-                })
-            
-            return {
-                "answer": answer,
-                "sources": sources,
-                "is_out_of_scope": False,
-                "confidence": 1.0 - best_score  # 거리를 신뢰도로 변환
-            }
-            
+            result, embedding, search_results = self._prepare(question, timer=timer)
+            if not result:
+                result = self._answer(question, search_results, timer, check_distance=embedding is not None)
+                self._store_answer(question, embedding, result)
         except Exception as e:
-            logger.error(f"쿼리 처리 중 오류 발생: {str(e)}")
-            return {
-                "answer": f"죄송합니다. 답변 생성 중 오류가 발생했습니다: {str(e)}",
-                "sources": [],
-                "is_out_of_scope": False,
-                "confidence": 0.0
-            }
+            result = self._error_result(e)
+            status = "error"
+        return self._finish(result, timer, status)
+    
+    async def aquery(self, question: str) -> Dict[str, any]:
+        """
+        질문에 대한 답변을 비동기로 생성합니다.
+        
+        OpenAI 왕복 동안 스레드를 점유하지 않으므로 한 프로세스에서 여러 질문을
+        동시에 처리할 수 있습니다.
+        
+        Args:
+            question: 사용자 질문
+        
+        Returns:
+            답변과 메타데이터를 포함한 딕셔너리
+        """
+        if not self.chain:
+            raise ValueError("RAG 체인이 초기화되지 않았습니다.")
+        
+        timer = QueryTimer()
+        status = "ok"
+        try:
+            result, embedding, search_results = await self._aprepare(question, timer=timer)
+            if not result:
+                result = await self._aanswer(question, search_results, timer, check_distance=embedding is not None)
+                await asyncio.to_thread(self._store_answer, question, embedding, result)
+        except Exception as e:
+            result = self._error_result(e)
+            status = "error"
+        return self._finish(result, timer, status)
     
     def query_with_filter(
         self,
@@ -188,63 +701,258 @@ class RAGChain:
         Returns:
             답변과 메타데이터를 포함한 딕셔너리
         """
-        if category:
-            filter_dict = {"category": category}
-            search_results = self.vs_manager.similarity_search(
-                question,
-                k=self.top_k,
-                filter_dict=filter_dict
-            )
-            
-            if not search_results:
-                return {
+        if not category:
+            return self.query(question)
+        
+        if not self.chain:
+            raise ValueError("RAG 체인이 초기화되지 않았습니다.")
+        
+        timer = QueryTimer()
+        status = "ok"
+        try:
+            result, embedding, search_results = self._prepare(question, filter_dict={"category": category}, timer=timer)
+            if not result and not search_results:
+                result = {
                     "answer": f"'{category}' 카테고리에서 관련 문서를 찾을 수 없습니다.",
                     "sources": [],
                     "is_out_of_scope": True,
                     "confidence": 0.0
                 }
+            elif not result:
+                result = self._answer(question, search_results, timer, check_distance=embedding is not None)
+        except Exception as e:
+            result = self._error_result(e)
+            status = "error"
+        return self._finish(result, timer, status)
+    
+    def query_stream(self, question: str) -> Dict[str, any]:
+        """
+        답변을 토큰 단위로 스트리밍합니다.
         
-        return self.query(question)
+        검색과 범위 판단은 이 함수가 반환되기 전에 끝나므로, 출처와 범위 밖 여부를
+        답변 생성 시작 전에 화면에 표시할 수 있습니다.
+        
+        Args:
+            question: 사용자 질문
+        
+        Returns:
+            query()와 같은 메타데이터에 "answer" 대신 토큰 이터레이터 "answer_stream"을 담은 딕셔너리
+            (LLM 답변의 timings와 tokens["completion"]은 스트림을 끝까지 소비하거나 닫은 뒤 채워짐)
+        """
+        if not self.chain:
+            raise ValueError("RAG 체인이 초기화되지 않았습니다.")
+        
+        timer = QueryTimer()
+        status = "ok"
+        try:
+            result, embedding, search_results = self._prepare(question, timer=timer)
+            if result:
+                result = dict(result)
+            else:
+                result, context, docs = self._answer_context(
+                    question, search_results, timer, check_distance=embedding is not None
+                )
+        except Exception as e:
+            result = self._error_result(e)
+            status = "error"
+        else:
+            if result is None:
+                metadata = {
+                    **self._answer_metadata(question, search_results, context, docs),
+                    "timings": {}
+                }
+                
+                # 검색 단계 지표는 첫 토큰 전에 기록 (스트림이 끝나거나 닫힐 때는 생성 단계만 기록)
+                self.metrics.observe_stages(timer.durations)
+                
+                def store(answer: str):
+                    self._store_answer(question, embedding, {"answer": answer, **metadata})
+                
+                return {
+                    "answer_stream": self._stream_answer(
+                        question, context, timer, metadata,
+                        on_complete=store,
+                        observed_stages=tuple(timer.durations)
+                    ),
+                    **metadata
+                }
+        
+        # 캐시된 답변, 검색 전용 결과, 범위 밖/오류 안내 문구는 한 번에 전달
+        result = self._finish(result, timer, status)
+        result["answer_stream"] = iter([result.pop("answer")])
+        return result
+    
+    def _stream_answer(
+        self,
+        question: str,
+        context: str,
+        timer: QueryTimer,
+        metadata: Dict[str, any],
+        on_complete=None,
+        observed_stages: Tuple[str, ...] = ()
+    ) -> Iterator[str]:
+        """
+        LLM 응답 토큰을 도착하는 대로 전달합니다. 정상 종료 시 전체 답변으로 on_complete를 호출합니다.
+        
+        첫 토큰까지의 시간(first_token)과 전체 생성 시간(generation)을 기록하고, 스트림이 끝나면
+        metadata의 timings와 tokens를 채웁니다. 호출자가 끝까지 읽지 않고 스트림을 닫으면
+        (GeneratorExit) 그때까지 받은 토큰으로 status="aborted" 지표를 기록합니다.
+        """
+        parts = []
+        status = "ok"
+        start = time.perf_counter()
+        try:
+            for token in self.chain.stream({
+                "context": context,
+                "question": question
+            }):
+                if not parts:
+                    timer.add("first_token", time.perf_counter() - start)
+                parts.append(token)
+                yield token
+        except GeneratorExit:
+            status = "aborted"
+            logger.info(f"스트리밍이 중간에 종료되었습니다. ({len(parts)}개 토큰 전달)")
+            raise
+        except Exception as e:
+            status = "error"
+            logger.error(f"스트리밍 중 오류 발생: {str(e)}")
+            self.metrics.inc("rag_errors_total")
+            yield f"\n\n죄송합니다. 답변 생성 중 오류가 발생했습니다: {str(e)}"
+        finally:
+            timer.add("generation", time.perf_counter() - start)
+            metadata["tokens"]["completion"] = count_tokens("".join(parts), self.model_name)
+            self._finish(metadata, timer, status, observed_stages)
+        
+        if on_complete and status == "ok":
+            on_complete("".join(parts))
 
 
 class ConversationalRAGChain(RAGChain):
-    """대화형 RAG 체인 클래스"""
+    """
+    대화형 RAG 체인 클래스
+    
+    history 인자로 대화 히스토리를 호출마다 넘기면 체인 상태를 바꾸지 않으므로,
+    하나의 인스턴스를 여러 세션/스레드가 공유할 수 있습니다. history를 생략하면
+    인스턴스의 conversation_history를 사용하고 갱신합니다.
+    """
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.conversation_history: List[Dict[str, str]] = []
     
-    def query_with_history(self, question: str) -> Dict[str, any]:
+    @staticmethod
+    def _build_context_question(question: str, history: List[Dict[str, str]]) -> str:
+        """최근 대화 히스토리를 포함한 질문을 구성합니다."""
+        if not history:
+            return question
+        
+        # 최근 2개의 대화만 포함
+        recent_history = history[-2:]
+        history_text = "\n".join([
+            f"이전 질문: {h['question']}\n이전 답변: {h['answer']}"
+            for h in recent_history
+        ])
+        return f"{history_text}\n\n현재 질문: {question}"
+    
+    def query_with_history(
+        self,
+        question: str,
+        history: Optional[List[Dict[str, str]]] = None
+    ) -> Dict[str, any]:
         """
         대화 히스토리를 고려하여 답변합니다.
         
         Args:
             question: 사용자 질문
+            history: 호출자가 관리하는 대화 히스토리 (None이면 인스턴스 히스토리 사용 및 갱신)
         
         Returns:
             답변과 메타데이터를 포함한 딕셔너리
         """
-        # 히스토리를 고려한 컨텍스트 구성
-        context_question = question
-        if self.conversation_history:
-            # 최근 2개의 대화만 포함
-            recent_history = self.conversation_history[-2:]
-            history_text = "\n".join([
-                f"이전 질문: {h['question']}\n이전 답변: {h['answer']}"
-                for h in recent_history
-            ])
-            context_question = f"{history_text}\n\n현재 질문: {question}"
-        
         # 쿼리 실행
-        result = self.query(context_question)
+        result = self.query(self._build_context_question(question, self._resolve_history(history)))
         
         # 히스토리에 추가
+        if history is None:
+            self.conversation_history.append({
+                "question": question,
+                "answer": result["answer"]
+            })
+        
+        return result
+    
+    async def aquery_with_history(
+        self,
+        question: str,
+        history: Optional[List[Dict[str, str]]] = None
+    ) -> Dict[str, any]:
+        """
+        대화 히스토리를 고려하여 비동기로 답변합니다.
+        
+        Args:
+            question: 사용자 질문
+            history: 호출자가 관리하는 대화 히스토리 (None이면 인스턴스 히스토리 사용 및 갱신)
+        
+        Returns:
+            답변과 메타데이터를 포함한 딕셔너리
+        """
+        result = await self.aquery(self._build_context_question(question, self._resolve_history(history)))
+        
+        if history is None:
+            self.conversation_history.append({
+                "question": question,
+                "answer": result["answer"]
+            })
+        
+        return result
+    
+    def query_with_history_stream(
+        self,
+        question: str,
+        history: Optional[List[Dict[str, str]]] = None
+    ) -> Dict[str, any]:
+        """
+        대화 히스토리를 고려하여 답변을 스트리밍합니다.
+        
+        history를 생략한 경우, 스트림을 끝까지 소비하면 전체 답변이 인스턴스 히스토리에 추가됩니다.
+        
+        Args:
+            question: 사용자 질문
+            history: 호출자가 관리하는 대화 히스토리 (None이면 인스턴스 히스토리 사용 및 갱신)
+        
+        Returns:
+            query_stream()과 같은 형식의 딕셔너리
+        """
+        result = self.query_stream(self._build_context_question(question, self._resolve_history(history)))
+        if history is None:
+            result["answer_stream"] = self._record_history(question, result["answer_stream"])
+        return result
+    
+    def _resolve_history(self, history: Optional[List[Dict[str, str]]]) -> List[Dict[str, str]]:
+        """호출자가 넘긴 히스토리가 없으면 인스턴스 히스토리를 사용합니다."""
+        return self.conversation_history if history is None else history
+    
+    def _record_history(self, question: str, answer_stream: Iterator[str]) -> Iterator[str]:
+        """
+        토큰을 그대로 전달하면서 전체 답변을 모아 히스토리에 추가합니다.
+        
+        이 스트림을 닫으면 원래 스트림도 바로 닫아 중단된 답변의 지표가 기록되게 합니다.
+        """
+        parts = []
+        try:
+            for token in answer_stream:
+                parts.append(token)
+                yield token
+        finally:
+            close = getattr(answer_stream, "close", None)
+            if close:
+                close()
+        
         self.conversation_history.append({
             "question": question,
-            "answer": result["answer"]
+            "answer": "".join(parts)
         })
-        
-        return result
     
     def clear_history(self):
         """대화 히스토리를 초기화합니다."""
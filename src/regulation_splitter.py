@@ -0,0 +1,400 @@
+"""
+내규 구조(편/장/절 → 조 → 항 → 호 → 목) 기반 토큰 단위 텍스트 분할 모듈
+
+조문 머리글(제N조)을 경계로 나눈 뒤 토큰 예산 안에서 인접한 조문을 묶고, 예산을 넘는 조문만
+항/호/목/줄/문장 순으로 더 잘게 나눕니다. 청크 메타데이터에 조 번호와 제목을 기록합니다.
+"""
+
+import logging
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+from .utils import count_tokens
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 편/장/절/관 머리글 (예: "제 1 편  총   칙", "제3장 평가업무")
+DIVISION_PATTERN = re.compile(r"제\s*\d+\s*[편장절관](?:\s*의\s*\d+)?(?=\s|$)")
+# 부칙 머리글 (예: "부칙", "부 칙 <2020.08.05>")
+ADDENDA_PATTERN = re.compile(r"부\s*칙(?=\s|[(<（]|$)")
+# 머리글 정리용 (번호/부칙 글자 사이 공백)
+DIVISION_NUMBER_PATTERN = re.compile(r"^제\s*(\d+)\s*([편장절관])(?:\s*의\s*(\d+))?")
+ADDENDA_SPACING_PATTERN = re.compile(r"^부\s+칙")
+# 조 머리글 (예: "제1조(목적)", "제 2 조 (정의)", "제5조의2 【위원회】")
+# 본문 중 "제22조제1항에 따라"처럼 다른 조문을 가리키는 줄은 제외
+ARTICLE_PATTERN = re.compile(
+    r"제\s*(\d+)\s*조(?:\s*의\s*(\d+))?(?=\s|[(（【\[]|$)"
+    r"(?:\s*[(（【\[]\s*([^)）】\]\n]{1,40}?)\s*[)）】\]])?"
+)
+# 질문/본문 속 조 번호 참조 (예: "제14조", "제5조의2에 따라")
+ARTICLE_REFERENCE_PATTERN = re.compile(r"제\s*(\d+)\s*조(?:\s*의\s*(\d+))?")
+# 조보다 작은 단위: 항(①), 호(1.), 목(가.)
+PARAGRAPH_PATTERN = re.compile(r"[①-⑳]")
+ITEM_PATTERN = re.compile(r"\d+\s*\.(?!\d)")
+SUBITEM_PATTERN = re.compile(r"[가-하]\s*\.")
+# 문장 경계 (마침표/물음표/느낌표 뒤 공백)
+SENTENCE_PATTERN = re.compile(r"(?<=[.。!?])\s+")
+
+# 머리글 한 줄로 볼 최대 길이 (목차/본문 중 긴 줄 제외)
+MAX_HEADING_LENGTH = 60
+
+
+class RegulationTextSplitter:
+    """한국어 내규 문서를 조문 단위로 나누고 토큰 수 기준으로 묶는 텍스트 스플리터"""
+
+    def __init__(
+        self,
+        chunk_tokens: int = 800,
+        chunk_overlap_tokens: int = 0,
+        model_name: str = "text-embedding-3-small"
+    ):
+        """
+        Args:
+            chunk_tokens: 청크 최대 토큰 수
+            chunk_overlap_tokens: 한 조문을 여러 청크로 나눌 때 앞 청크 끝에서 반복할 최대 토큰 수
+            model_name: 토큰 수 계산에 사용할 모델 이름
+        """
+        if chunk_tokens <= 0:
+            raise ValueError(f"chunk_tokens는 양수여야 합니다: {chunk_tokens}")
+        self.chunk_tokens = chunk_tokens
+        self.chunk_overlap_tokens = max(0, min(chunk_overlap_tokens, chunk_tokens // 2))
+        self.model_name = model_name
+
+    def split_documents(self, documents: Iterable[Document]) -> List[Document]:
+        """
+        문서를 청크로 분할합니다.
+
+        청크 메타데이터에는 start_index(원문 기준 위치)와 함께 조문 정보를 기록합니다.
+        - article: 청크의 첫 조 번호 (예: "제2조", "제5조의2")
+        - article_title: 첫 조의 제목 (예: "정의")
+        - article_end: 여러 조를 묶은 경우 마지막 조 번호
+        - chapter: 편/장/절 또는 부칙 머리글
+
+        metadata["page_starts"]가 있는 문서(PDF)는 청크가 페이지를 넘지 않게 나누고
+        page(1부터) 번호를 기록합니다. 조문 정보는 페이지가 바뀌어도 이어집니다.
+
+        Args:
+            documents: 문서 이터러블
+
+        Returns:
+            청크 리스트
+        """
+        chunks = []
+        for document in documents:
+            metadata = {key: value for key, value in document.metadata.items() if key != "page_starts"}
+            page_starts = document.metadata.get("page_starts")
+
+            for start, end, chunk_metadata in self.split_text_spans(document.page_content, page_starts):
+                chunks.append(Document(
+                    page_content=document.page_content[start:end],
+                    metadata={**metadata, **chunk_metadata, "start_index": start}
+                ))
+        return chunks
+
+    def split_text(self, text: str) -> List[str]:
+        """텍스트를 청크 문자열 리스트로 분할합니다."""
+        return [text[start:end] for start, end, _ in self.split_text_spans(text)]
+
+    def split_text_spans(
+        self,
+        text: str,
+        page_starts: Optional[List[int]] = None
+    ) -> List[Tuple[int, int, Dict[str, object]]]:
+        """
+        텍스트를 청크 구간으로 분할합니다.
+
+        Args:
+            text: 원문
+            page_starts: 페이지 시작 위치 목록 (청크가 넘지 않을 경계)
+
+        Returns:
+            (시작 위치, 끝 위치, 청크 메타데이터) 튜플 리스트
+        """
+        boundaries = list(page_starts or [0])
+        pages = [
+            (boundaries[i], boundaries[i + 1] if i + 1 < len(boundaries) else len(text))
+            for i in range(len(boundaries))
+        ]
+
+        spans = []
+        # 현재 청크에 담긴 (시작, 끝, 토큰 수, 머리글 정보, 조문 번호) 단위 목록
+        current: List[Tuple[int, int, int, Dict[str, str], int]] = []
+        current_tokens = 0
+        current_key = None
+
+        def flush():
+            if current:
+                spans.append((current[0][0], current[-1][1], self._chunk_metadata(current, current_key)))
+
+        for section_index, (section_start, section_end, heading) in enumerate(self._sections(text)):
+            for page_index, (page_start, page_end) in enumerate(pages):
+                piece = _strip_span(text, max(section_start, page_start), min(section_end, page_end))
+                if piece is None:
+                    continue
+
+                # 페이지가 바뀌면 이전 청크와 묶지 않음
+                key = page_index if page_starts else None
+                tokens = count_tokens(text[piece[0]:piece[1]], self.model_name)
+                if tokens <= self.chunk_tokens:
+                    units = [(piece[0], piece[1], tokens)]
+                else:
+                    units = self._split_oversized(text, piece[0], piece[1], 0)
+
+                for unit_index, (unit_start, unit_end, unit_tokens) in enumerate(units):
+                    # 예산을 넘어 나눈 조문은 새 청크에서 시작 (조 머리글이 앞 청크 끝에 붙지 않게)
+                    if current and (
+                        key != current_key
+                        or (unit_index == 0 and len(units) > 1)
+                        or current_tokens + self._gap_tokens(text, current, unit_start) + unit_tokens > self.chunk_tokens
+                    ):
+                        flush()
+                        current = self._overlap_tail(text, current, section_index, unit_start, unit_tokens) if key == current_key else []
+                        current_tokens = count_tokens(text[current[0][0]:current[-1][1]], self.model_name) if current else 0
+                    current_tokens += self._gap_tokens(text, current, unit_start) + unit_tokens
+                    current.append((unit_start, unit_end, unit_tokens, heading, section_index))
+                    current_key = key
+
+        flush()
+        return spans
+
+    def _gap_tokens(self, text: str, units: list, start: int) -> int:
+        """청크 마지막 단위와 다음 단위 사이 공백(줄바꿈)의 토큰 수"""
+        if not units or units[-1][1] >= start:
+            return 0
+        return count_tokens(text[units[-1][1]:start], self.model_name)
+
+    def _overlap_tail(self, text: str, units: list, section_index: int, next_start: int, next_tokens: int) -> list:
+        """직전 청크 끝에서 다음 청크 앞에 반복할 단위 목록 (같은 조문 안에서만)"""
+        tail = []
+        for unit in reversed(units[1:]):
+            if unit[4] != section_index:
+                break
+            last = tail[-1] if tail else unit
+            tokens = count_tokens(text[unit[0]:last[1]], self.model_name)
+            if tokens > self.chunk_overlap_tokens:
+                break
+            if tokens + self._gap_tokens(text, [last], next_start) + next_tokens > self.chunk_tokens:
+                break
+            tail.insert(0, unit)
+        return tail
+
+    @staticmethod
+    def _chunk_metadata(units: list, page_index: Optional[int]) -> Dict[str, object]:
+        """청크에 담긴 단위들의 머리글 정보로 청크 메타데이터를 만듭니다."""
+        metadata: Dict[str, object] = {}
+        if page_index is not None:
+            metadata["page"] = page_index + 1
+        chapters = [unit[3]["chapter"] for unit in units if unit[3].get("chapter")]
+        if chapters:
+            metadata["chapter"] = chapters[0]
+
+        articles = [unit[3] for unit in units if unit[3].get("article")]
+        if articles:
+            metadata["article"] = articles[0]["article"]
+            if articles[0].get("article_title"):
+                metadata["article_title"] = articles[0]["article_title"]
+            if articles[-1]["article"] != articles[0]["article"]:
+                metadata["article_end"] = articles[-1]["article"]
+        return metadata
+
+    def _sections(self, text: str) -> List[Tuple[int, int, Dict[str, str]]]:
+        """
+        조 머리글과 편/장/절/부칙 머리글을 경계로 텍스트를 나눕니다.
+
+        Returns:
+            (시작 위치, 끝 위치, 머리글 정보) 튜플 리스트
+        """
+        sections = []
+        heading: Dict[str, str] = {}
+        section_start = 0
+
+        for line_start, line in _iter_lines(text):
+            stripped = line.strip()
+            if not stripped:
+                continue
+
+            new_heading = None
+            if len(stripped) <= MAX_HEADING_LENGTH and (
+                DIVISION_PATTERN.match(stripped) or ADDENDA_PATTERN.match(stripped)
+            ):
+                # 편/장/절이 바뀌면 이전 조문 정보는 이어지지 않음
+                new_heading = {"chapter": _normalize_heading(stripped)}
+            else:
+                match = ARTICLE_PATTERN.match(stripped)
+                if match:
+                    article = f"제{match.group(1)}조" + (f"의{match.group(2)}" if match.group(2) else "")
+                    new_heading = {"chapter": heading.get("chapter", ""), "article": article}
+                    if match.group(3):
+                        new_heading["article_title"] = " ".join(match.group(3).split())
+
+            if new_heading is not None:
+                if line_start > section_start:
+                    sections.append((section_start, line_start, heading))
+                section_start = line_start
+                heading = {key: value for key, value in new_heading.items() if value}
+
+        sections.append((section_start, len(text), heading))
+        return sections
+
+    def _split_oversized(self, text: str, start: int, end: int, level: int) -> List[Tuple[int, int, int]]:
+        """
+        토큰 예산을 넘는 구간을 항 → 호 → 목 → 줄 → 문장 → 글자 순으로 나눕니다.
+
+        Returns:
+            (시작 위치, 끝 위치, 토큰 수) 튜플 리스트 (각각 예산 이하)
+        """
+        if level < len(_SPLIT_LEVELS):
+            cuts = _SPLIT_LEVELS[level](text, start, end)
+        else:
+            return self._hard_split(text, start, end)
+
+        pieces = [
+            span for span in (_strip_span(text, cut_start, cut_end) for cut_start, cut_end in zip(cuts, cuts[1:] + [end]))
+            if span is not None
+        ]
+        if len(pieces) <= 1:
+            return self._split_oversized(text, start, end, level + 1)
+
+        # 조 머리글처럼 첫 단위 앞에 오는 짧은 줄은 첫 단위와 떨어지지 않게 묶음
+        head = (pieces[0][0], pieces[1][1])
+        if count_tokens(text[head[0]:head[1]], self.model_name) <= self.chunk_tokens:
+            pieces[:2] = [head]
+
+        units = []
+        for piece_start, piece_end in pieces:
+            tokens = count_tokens(text[piece_start:piece_end], self.model_name)
+            if tokens <= self.chunk_tokens:
+                units.append((piece_start, piece_end, tokens))
+            else:
+                units.extend(self._split_oversized(text, piece_start, piece_end, level + 1))
+        return units
+
+    def _hard_split(self, text: str, start: int, end: int) -> List[Tuple[int, int, int]]:
+        """문장 경계가 없는 긴 구간을 토큰 예산에 맞는 글자 수로 자릅니다."""
+        units = []
+        while start < end:
+            tokens = count_tokens(text[start:end], self.model_name)
+            if tokens <= self.chunk_tokens:
+                units.append((start, end, tokens))
+                break
+            # 글자당 토큰 수가 고르다고 보고 예산의 90%에 해당하는 길이로 자름
+            size = max(1, int((end - start) * self.chunk_tokens * 0.9 / tokens))
+            piece_end = start + size
+            units.append((start, piece_end, count_tokens(text[start:piece_end], self.model_name)))
+            start = piece_end
+        return units
+
+
+def format_article(metadata: Dict[str, object]) -> str:
+    """
+    청크 메타데이터의 조문 정보를 출처 표시용 문자열로 만듭니다.
+
+    Args:
+        metadata: 청크 메타데이터
+
+    Returns:
+        "제2조(정의)", "제3조~제5조" 형태의 문자열 (조문 정보가 없으면 빈 문자열)
+    """
+    article = metadata.get("article")
+    if not article:
+        return ""
+    if metadata.get("article_end"):
+        return f"{article}~{metadata['article_end']}"
+    if metadata.get("article_title"):
+        return f"{article}({metadata['article_title']})"
+    return article
+
+
+def article_references(text: str) -> List[Tuple[int, int]]:
+    """
+    텍스트에서 조 번호 참조를 찾아 비교용 (조 번호, 가지 번호) 튜플로 반환합니다.
+
+    Args:
+        text: 질문 또는 청크 메타데이터의 조 번호 (예: "제5조의2")
+
+    Returns:
+        (조 번호, 가지 번호) 튜플 리스트 (예: "제5조의2" → (5, 2), "제14조" → (14, 0))
+    """
+    return [
+        (int(match.group(1)), int(match.group(2) or 0))
+        for match in ARTICLE_REFERENCE_PATTERN.finditer(text)
+    ]
+
+
+def covers_article(metadata: Dict[str, object], article: Tuple[int, int]) -> bool:
+    """
+    청크가 해당 조문을 담고 있는지 메타데이터(article, article_end)로 판단합니다.
+
+    Args:
+        metadata: 청크 메타데이터
+        article: article_references가 반환한 (조 번호, 가지 번호) 튜플
+
+    Returns:
+        청크의 첫 조부터 마지막 조 사이에 있으면 True
+    """
+    first = article_references(str(metadata.get("article") or ""))
+    if not first:
+        return False
+    last = article_references(str(metadata.get("article_end") or "")) or first
+    # 본칙 끝과 부칙을 묶은 청크는 번호가 다시 시작하므로 양 끝만 비교
+    if last[0] < first[0]:
+        return article in (first[0], last[0])
+    return first[0] <= article <= last[0]
+
+
+def _iter_lines(text: str):
+    """(줄 시작 위치, 줄 내용) 목록을 반환합니다."""
+    position = 0
+    for line in text.split("\n"):
+        yield position, line
+        position += len(line) + 1
+
+
+def _normalize_heading(line: str) -> str:
+    """머리글 공백을 정리합니다. (예: "제 6 장의 2  사용" → "제6장의2 사용", "부    칙(15)" → "부칙(15)")"""
+    line = DIVISION_NUMBER_PATTERN.sub(
+        lambda match: f"제{match.group(1)}{match.group(2)}" + (f"의{match.group(3)}" if match.group(3) else ""),
+        " ".join(line.split())
+    )
+    return ADDENDA_SPACING_PATTERN.sub("부칙", line, count=1)
+
+
+def _strip_span(text: str, start: int, end: int) -> Optional[Tuple[int, int]]:
+    """구간 앞뒤 공백을 제외한 구간을 반환합니다. (공백뿐이면 None)"""
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return (start, end) if start < end else None
+
+
+def _line_cuts(pattern: Optional[re.Pattern]):
+    """패턴으로 시작하는 줄(패턴이 없으면 모든 줄)의 시작 위치를 경계로 삼는 함수를 만듭니다."""
+    def cuts(text: str, start: int, end: int) -> List[int]:
+        positions = [start]
+        for line_start, line in _iter_lines(text[start:end]):
+            if line_start == 0:
+                continue
+            if pattern is None or pattern.match(line.lstrip()):
+                positions.append(start + line_start)
+        return positions
+    return cuts
+
+
+def _sentence_cuts(text: str, start: int, end: int) -> List[int]:
+    """문장 시작 위치를 경계로 삼습니다."""
+    return [start] + [start + match.end() for match in SENTENCE_PATTERN.finditer(text[start:end])]
+
+
+# 조문보다 작은 분할 단위 (큰 단위부터)
+_SPLIT_LEVELS = [
+    _line_cuts(PARAGRAPH_PATTERN),
+    _line_cuts(ITEM_PATTERN),
+    _line_cuts(SUBITEM_PATTERN),
+    _line_cuts(None),
+    _sentence_cuts,
+]
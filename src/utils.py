@@ -1,9 +1,14 @@
 """유틸리티 함수 모음"""
 
 import os
+import hashlib
+import logging
+from functools import lru_cache
 from pathlib import Path
 from typing import List
 
+logger = logging.getLogger(__name__)
+
 
 def get_all_documents(root_dir: str, exclude_extensions: List[str] = None) -> List[Path]:
     """
@@ -37,6 +42,23 @@ def get_all_documents(root_dir: str, exclude_extensions: List[str] = None) -> Li
     return sorted(documents)
 
 
+def compute_file_hash(file_path: Path) -> str:
+    """
+    파일 내용의 SHA-256 해시를 계산합니다.
+    
+    Args:
+        file_path: 파일 경로
+    
+    Returns:
+        hex 해시 문자열
+    """
+    hasher = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
 def extract_category_from_path(file_path: Path, root_dir: str) -> str:
     """
     파일 경로에서 카테고리를 추출합니다.
@@ -96,3 +118,46 @@ def clean_text(text: str) -> str:
     
     return '\n'.join(cleaned_lines)
 
+
+
+@lru_cache(maxsize=8)
+def get_token_encoder(model: str = "text-embedding-3-small"):
+    """
+    모델에 맞는 tiktoken 인코더를 반환합니다. (모르는 모델이면 cl100k_base)
+    
+    Args:
+        model: OpenAI 모델 이름
+    
+    Returns:
+        tiktoken Encoding 또는 None (인코딩 파일을 받을 수 없는 오프라인 환경)
+    """
+    try:
+        import tiktoken
+        
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"tiktoken 인코더를 사용할 수 없어 토큰 수를 추정합니다: {e}")
+        return None
+
+
+def count_tokens(text: str, model: str = "text-embedding-3-small") -> int:
+    """
+    텍스트의 토큰 수를 계산합니다.
+    
+    tiktoken을 사용할 수 없으면 UTF-8 바이트 수의 절반으로 넉넉하게 추정합니다.
+    (한글 1글자 ≈ 1.5토큰, 영문 1글자 ≈ 0.5토큰으로 실제보다 크게 잡힘)
+    
+    Args:
+        text: 텍스트
+        model: OpenAI 모델 이름
+    
+    Returns:
+        토큰 수
+    """
+    encoder = get_token_encoder(model)
+    if encoder is None:
+        return (len(text.encode('utf-8')) + 1) // 2
+    return len(encoder.encode(text, disallowed_special=()))
@@ -1,14 +1,25 @@
 """벡터 스토어 관리 모듈"""
 
 import os
-from typing import List, Optional
+import time
+import uuid
+import asyncio
+import hashlib
+from contextlib import nullcontext
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 import logging
-import chromadb
 
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_openai import OpenAIEmbeddings
-from langchain_community.vectorstores import Chroma
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from .embeddings import create_embeddings
+from .embedding_cache import EmbeddingCache, CachedEmbeddings, QueryEmbeddingCache
+from .lexical_index import LexicalIndex
+from .flat_store import FlatVectorStore
+from .regulation_splitter import RegulationTextSplitter
+from .utils import count_tokens
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -21,51 +32,170 @@ class VectorStoreManager:
     def __init__(
         self,
         persist_directory: str = "./chroma_db",
-        embedding_model: str = "text-embedding-3-small",
-        chunk_size: int = 1000,
+        embedding_model: Optional[str] = None,
+        chunk_size: Optional[int] = None,
         chunk_overlap_percent: float = 4.0,
+        chunk_strategy: Optional[str] = None,
+        chunk_tokens: int = 1000,
         use_cloud: bool = False,
         cloud_api_key: Optional[str] = None,
         cloud_tenant: Optional[str] = None,
         cloud_database: Optional[str] = None,
-        collection_name: str = "niceinfo-rules"
+        collection_name: str = "niceinfo-rules",
+        embedding_cache_path: Optional[str] = None,
+        embedding_cache_max_mb: float = 512.0,
+        query_cache_size: int = 1024,
+        query_cache_path: Optional[str] = None,
+        upload_batch_tokens: int = 100_000,
+        upload_batch_max_size: int = 100,
+        upload_concurrency: int = 4,
+        use_lexical_index: bool = True,
+        lexical_index_path: Optional[str] = None,
+        embedding_provider: Optional[str] = None,
+        embedding_threads: Optional[int] = None,
+        embedding_batch_size: int = 32,
+        vector_backend: Optional[str] = None,
+        vector_index: Optional[str] = None,
+        vector_index_options: Optional[dict] = None,
+        embeddings: Optional[Embeddings] = None
     ):
         """
         Args:
             persist_directory: ChromaDB 저장 디렉토리 (로컬 사용 시)
-            embedding_model: OpenAI 임베딩 모델
-            chunk_size: 텍스트 청크 크기
-            chunk_overlap_percent: 청크 간 중복 비율 (%) - 기본 4%
+            embedding_model: 임베딩 모델 (None이면 EMBEDDING_MODEL 환경 변수 또는 제공자 기본값)
+            chunk_size: 텍스트 청크 크기 (글자 수, recursive 분할 방식에서만 사용, None이면 1000)
+            chunk_overlap_percent: 청크 간 중복 비율 (%) - 기본 4% (두 분할 방식 모두 사용)
+            chunk_strategy: 분할 방식 "regulation"(조문 경계 + 토큰 수 기준) 또는 "recursive"(글자 수 기준)
+                (None이면 CHUNK_STRATEGY 환경 변수, 없으면 "regulation")
+            chunk_tokens: 청크 최대 토큰 수 (regulation 분할 방식에서 사용)
             use_cloud: ChromaDB Cloud 사용 여부
             cloud_api_key: ChromaDB Cloud API 키
             cloud_tenant: ChromaDB Cloud Tenant ID
             cloud_database: ChromaDB Cloud Database 이름
             collection_name: 컬렉션 이름
+            embedding_cache_path: 임베딩 캐시 파일 경로 (None이면 캐시 미사용)
+            embedding_cache_max_mb: 임베딩 캐시 최대 크기 (MB)
+            query_cache_size: 프로세스 내 쿼리 임베딩 LRU 캐시 크기 (0이면 미사용)
+            query_cache_path: 프로세스 간 공유할 쿼리 임베딩 캐시 파일 경로 (None이면 공유 안 함)
+            upload_batch_tokens: 업로드 배치당 최대 토큰 수 (OpenAI 임베딩 요청 한도 고려)
+            upload_batch_max_size: 업로드 배치당 최대 청크 수 (ChromaDB 쓰기 한도 고려)
+            upload_concurrency: 동시에 처리할 업로드 배치 수
+            use_lexical_index: 어휘(BM25) 색인 사용 여부
+            lexical_index_path: 어휘 색인 파일 경로 (None이면 로컬은 persist_directory 안,
+                Cloud는 컬렉션 이름으로 현재 디렉토리에 저장)
+            embedding_provider: 임베딩 제공자 "openai" 또는 "local"
+                (None이면 EMBEDDING_PROVIDER 환경 변수, 없으면 "openai")
+            embedding_threads: 로컬 임베딩 추론 스레드 수 (None이면 EMBEDDING_THREADS 환경 변수)
+            embedding_batch_size: 로컬 임베딩 배치 크기
+            vector_backend: 로컬 벡터 저장 방식 "chroma" 또는 "numpy" (메모리 맵 전수 비교)
+                (None이면 VECTOR_BACKEND 환경 변수, 없으면 "chroma")
+            vector_index: numpy 백엔드의 인덱스 모드 "flat", "ivf-int8", "ivf-pq"
+                (None이면 VECTOR_INDEX 환경 변수, 없으면 "flat")
+            vector_index_options: 압축 인덱스 설정 (n_lists, n_probe, pq_subvectors, rescore_factor)
+            embeddings: 직접 생성한 임베딩 객체 (지정하면 embedding_provider의 기본 백엔드 대신 사용,
+                벤치마크/비용 추정용)
         """
         self.persist_directory = persist_directory
-        self.embedding_model = embedding_model
-        self.chunk_size = chunk_size
+        if embeddings is not None and embedding_provider is None:
+            embedding_provider = "custom"
+        self.embedding_provider = embedding_provider or os.getenv("EMBEDDING_PROVIDER", "openai")
+        self.embedding_model = embedding_model or os.getenv("EMBEDDING_MODEL")
+        if embedding_threads is None and os.getenv("EMBEDDING_THREADS"):
+            embedding_threads = int(os.getenv("EMBEDDING_THREADS"))
+        self.chunk_strategy = chunk_strategy or os.getenv("CHUNK_STRATEGY", "regulation")
+        if self.chunk_strategy not in ("regulation", "recursive"):
+            raise ValueError(f"지원하지 않는 분할 방식입니다: {self.chunk_strategy} (지원: regulation, recursive)")
+        if chunk_size is not None and self.chunk_strategy == "regulation":
+            logger.warning(
+                f"chunk_size={chunk_size}(글자 수)는 recursive 분할 방식에서만 사용됩니다. "
+                f"regulation 방식은 chunk_tokens={chunk_tokens}을 사용합니다."
+            )
+        self.chunk_size = chunk_size or 1000
         self.chunk_overlap_percent = chunk_overlap_percent
         # 4% 오버랩 계산
-        self.chunk_overlap = int(chunk_size * (chunk_overlap_percent / 100))
+        self.chunk_overlap = int(self.chunk_size * (chunk_overlap_percent / 100))
+        self.chunk_tokens = chunk_tokens
         self.use_cloud = use_cloud
+        self.vector_backend = vector_backend or os.getenv("VECTOR_BACKEND", "chroma")
+        if self.vector_backend not in ("chroma", "numpy"):
+            raise ValueError(f"지원하지 않는 벡터 백엔드입니다: {self.vector_backend} (지원: chroma, numpy)")
+        if use_cloud and self.vector_backend != "chroma":
+            raise ValueError("ChromaDB Cloud 사용 시 벡터 백엔드는 chroma여야 합니다.")
+        self.vector_index = vector_index or os.getenv("VECTOR_INDEX", "flat")
+        self.vector_index_options = vector_index_options or {}
+        if self.vector_index != "flat" and self.vector_backend != "numpy":
+            raise ValueError("압축 인덱스(ivf-int8, ivf-pq)는 numpy 벡터 백엔드에서만 사용할 수 있습니다.")
         self.cloud_api_key = cloud_api_key
         self.cloud_tenant = cloud_tenant
         self.cloud_database = cloud_database
         self.collection_name = collection_name
+        self.upload_batch_tokens = upload_batch_tokens
+        self.upload_batch_max_size = upload_batch_max_size
+        self.upload_concurrency = max(1, upload_concurrency)
         
-        # OpenAI 임베딩 초기화
-        self.embeddings = OpenAIEmbeddings(model=embedding_model)
+        # 어휘 색인 (임베딩 API 없이 검색, 하이브리드 검색 및 장애 시 대체 검색용)
+        self.lexical_index: Optional[LexicalIndex] = None
+        self.lexical_index_path: Optional[str] = None
+        if use_lexical_index:
+            if lexical_index_path:
+                self.lexical_index_path = lexical_index_path
+            elif use_cloud:
+                self.lexical_index_path = f"./lexical_index_{collection_name}.json"
+            else:
+                self.lexical_index_path = os.path.join(persist_directory, "lexical_index.json")
         
-        # 텍스트 스플리터 초기화 (4% 오버랩)
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size,
-            chunk_overlap=self.chunk_overlap,
-            length_function=len,
-            separators=["\n\n", "\n", "。", ".", " ", ""]
-        )
+        # 임베딩 백엔드 초기화 (OpenAI API 또는 로컬 CPU 모델)
+        if embeddings is not None:
+            self.embeddings = embeddings
+        else:
+            self.embeddings = create_embeddings(
+                provider=self.embedding_provider,
+                model=self.embedding_model,
+                batch_size=embedding_batch_size,
+                threads=embedding_threads
+            )
+        self.embedding_model = getattr(self.embeddings, "model", self.embedding_model)
+        # 인덱스와 캐시에 기록하는 임베딩 식별자 (제공자가 다르면 벡터 공간도 다름)
+        if self.embedding_provider == "openai":
+            self.embedding_id = self.embedding_model
+        else:
+            self.embedding_id = f"{self.embedding_provider}:{self.embedding_model}"
+        logger.info(f"임베딩 백엔드: {self.embedding_id}")
+        
+        # 임베딩 캐시 초기화 (변경되지 않은 청크는 API를 호출하지 않음)
+        self.embedding_cache: Optional[EmbeddingCache] = None
+        if embedding_cache_path:
+            self.embedding_cache = EmbeddingCache(
+                path=embedding_cache_path,
+                max_size_mb=embedding_cache_max_mb
+            )
+            logger.info(f"임베딩 캐시 사용: {embedding_cache_path}")
         
-        logger.info(f"청크 설정: size={chunk_size}, overlap={self.chunk_overlap} ({chunk_overlap_percent}%)")
+        # 쿼리 임베딩 캐시 초기화 (같은 질문은 임베딩 API를 다시 호출하지 않음)
+        self.query_cache: Optional[QueryEmbeddingCache] = None
+        if query_cache_size > 0:
+            shared = EmbeddingCache(path=query_cache_path, max_size_mb=64.0) if query_cache_path else None
+            self.query_cache = QueryEmbeddingCache(max_entries=query_cache_size, shared=shared)
+        
+        if self.embedding_cache or self.query_cache:
+            self.embeddings = CachedEmbeddings(
+                embeddings=self.embeddings,
+                model=self.embedding_id,
+                dimensions=getattr(self.embeddings, "dimensions", None),
+                cache=self.embedding_cache,
+                query_cache=self.query_cache
+            )
+        
+        # 텍스트 스플리터 (질의 전용 프로세스는 사용하지 않으므로 처음 분할할 때 생성)
+        self._text_splitter = None
+        
+        if self.chunk_strategy == "regulation":
+            logger.info(
+                f"청크 설정: 조문 단위, 최대 {chunk_tokens} 토큰, "
+                f"overlap={int(chunk_tokens * chunk_overlap_percent / 100)} 토큰 ({chunk_overlap_percent}%)"
+            )
+        else:
+            logger.info(f"청크 설정: size={self.chunk_size}, overlap={self.chunk_overlap} ({chunk_overlap_percent}%)")
         
         # ChromaDB 클라이언트 초기화
         self.client = None
@@ -74,6 +204,8 @@ class VectorStoreManager:
                 raise ValueError("ChromaDB Cloud 사용 시 api_key, tenant, database가 필요합니다.")
             
             logger.info("ChromaDB Cloud 클라이언트를 초기화합니다...")
+            import chromadb
+            
             self.client = chromadb.CloudClient(
                 api_key=cloud_api_key,
                 tenant=cloud_tenant,
@@ -81,9 +213,113 @@ class VectorStoreManager:
             )
             logger.info(f"ChromaDB Cloud 연결 완료 (Tenant: {cloud_tenant}, DB: {cloud_database})")
         
-        self.vectorstore: Optional[Chroma] = None
+        self.vectorstore: Optional[VectorStore] = None
+        # 소스 파일별 청크 ID (인덱싱 매니페스트 기록용)
+        self.chunk_ids_by_source: Dict[str, List[str]] = {}
+    
+    @property
+    def text_splitter(self):
+        """텍스트 스플리터 (처음 분할할 때 생성, recursive 방식은 langchain_text_splitters를 이때 로드)"""
+        if self._text_splitter is None and self.chunk_strategy == "regulation":
+            self._text_splitter = RegulationTextSplitter(
+                chunk_tokens=self.chunk_tokens,
+                chunk_overlap_tokens=int(self.chunk_tokens * (self.chunk_overlap_percent / 100)),
+                model_name=self.embedding_model
+            )
+        elif self._text_splitter is None:
+            from langchain_text_splitters import RecursiveCharacterTextSplitter
+            
+            self._text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=self.chunk_size,
+                chunk_overlap=self.chunk_overlap,
+                length_function=len,
+                separators=["\n\n", "\n", "。", ".", " ", ""],
+                add_start_index=True  # 컨텍스트 구성 시 인접 청크 병합용
+            )
+        return self._text_splitter
+    
+    def get_chunk_settings(self) -> Dict[str, object]:
+        """
+        청크 분할 설정을 반환합니다. (설정이 바뀌면 기존 청크를 다시 만들어야 하는지 판단용)
+        
+        Returns:
+            chunk_strategy, chunk_size(regulation은 토큰 수, recursive는 글자 수), chunk_overlap 딕셔너리
+        """
+        if self.chunk_strategy == "regulation":
+            size = self.chunk_tokens
+            overlap = int(self.chunk_tokens * (self.chunk_overlap_percent / 100))
+        else:
+            size = self.chunk_size
+            overlap = self.chunk_overlap
+        return {"chunk_strategy": self.chunk_strategy, "chunk_size": size, "chunk_overlap": overlap}
+    
+    def split_documents(self, documents: List[Document]) -> List[Document]:
+        """
+        문서를 청크로 분할합니다.
+        
+        metadata["page_starts"]가 있는 문서(PDF)는 페이지별로 분할하여 청크가 페이지를 넘지 않게 하고,
+        청크마다 page(1부터) 번호를 기록합니다. start_index는 문서 전체 기준 위치로 유지됩니다.
+        regulation 방식은 조 번호/제목(article, article_title)도 기록합니다.
+        """
+        if self.chunk_strategy == "regulation":
+            return self.text_splitter.split_documents(documents)
+        
+        chunks = []
+        for document in documents:
+            if document.metadata.get("page_starts"):
+                chunks.extend(self._split_pages(document))
+            else:
+                chunks.extend(self.text_splitter.split_documents([document]))
+        return chunks
+    
+    def _split_pages(self, document: Document):
+        """페이지 단위로 청크를 생성합니다. (페이지 시작 위치 목록은 청크 메타데이터에서 제외)"""
+        metadata = {key: value for key, value in document.metadata.items() if key != "page_starts"}
+        page_starts = document.metadata["page_starts"]
+        content = document.page_content
+        
+        for page_index, start in enumerate(page_starts):
+            # 페이지 사이는 줄바꿈 한 글자로 이어져 있음
+            end = page_starts[page_index + 1] - 1 if page_index + 1 < len(page_starts) else len(content)
+            page_text = content[start:end]
+            if not page_text.strip():
+                continue
+            
+            page_document = Document(page_content=page_text, metadata={**metadata, "page": page_index + 1})
+            for chunk in self.text_splitter.split_documents([page_document]):
+                chunk.metadata["start_index"] = chunk.metadata.get("start_index", 0) + start
+                yield chunk
     
-    def create_vectorstore(self, documents: List[Document], force_recreate: bool = False) -> Chroma:
+    @staticmethod
+    def make_chunk_ids(chunks: List[Document]) -> List[str]:
+        """
+        청크마다 결정적인 ID를 생성합니다. (소스 경로 해시 + 파일 내 순번)
+        
+        Args:
+            chunks: 청크 리스트
+        
+        Returns:
+            청크 ID 리스트
+        """
+        ids = []
+        counters: Dict[str, int] = {}
+        for chunk in chunks:
+            source = chunk.metadata.get("source", "")
+            index = counters.get(source, 0)
+            counters[source] = index + 1
+            source_hash = hashlib.sha1(source.encode("utf-8")).hexdigest()[:16]
+            ids.append(f"{source_hash}-{index:05d}")
+        return ids
+    
+    @staticmethod
+    def _group_ids_by_source(chunks: List[Document], ids: List[str]) -> Dict[str, List[str]]:
+        """청크 ID를 소스 파일별로 묶습니다."""
+        grouped: Dict[str, List[str]] = {}
+        for chunk, chunk_id in zip(chunks, ids):
+            grouped.setdefault(chunk.metadata.get("source", ""), []).append(chunk_id)
+        return grouped
+    
+    def create_vectorstore(self, documents: List[Document], force_recreate: bool = False) -> VectorStore:
         """
         문서로부터 벡터 스토어를 생성합니다.
         
@@ -92,7 +328,7 @@ class VectorStoreManager:
             force_recreate: 기존 벡터 스토어를 강제로 재생성할지 여부
         
         Returns:
-            Chroma 벡터 스토어
+            벡터 스토어
         """
         # Cloud가 아니고 기존 벡터 스토어가 있고 재생성하지 않는 경우
         if not self.use_cloud and not force_recreate and os.path.exists(self.persist_directory):
@@ -103,91 +339,605 @@ class VectorStoreManager:
         
         # 문서를 청크로 분할
         logger.info("문서를 청크로 분할하는 중...")
-        chunks = self.text_splitter.split_documents(documents)
+        chunks = self.split_documents(documents)
+        ids = self.make_chunk_ids(chunks)
+        self.chunk_ids_by_source = self._group_ids_by_source(chunks, ids)
         logger.info(f"총 {len(chunks)}개의 청크가 생성되었습니다.")
         
+        if self.lexical_index_path:
+            self.lexical_index = LexicalIndex()
+            self.lexical_index.add(ids, chunks)
+        
         # 벡터 스토어 생성
         logger.info("벡터 임베딩을 생성하고 저장하는 중...")
         logger.info("(이 과정은 문서 크기에 따라 수 분이 걸릴 수 있습니다)")
         
         if self.use_cloud:
-            # ChromaDB Cloud 사용 - 배치 처리로 OpenAI API 토큰 제한 회피
+            # ChromaDB Cloud 사용 - 토큰 기준 배치를 여러 개 동시에 업로드
             logger.info(f"ChromaDB Cloud에 저장합니다 (Collection: {self.collection_name})")
             
-            # 배치 크기 설정 (OpenAI API 제한을 고려하여 작은 배치로 처리)
-            batch_size = 50  # 한 번에 50개씩 처리
-            total_chunks = len(chunks)
+            self.vectorstore = None
+            self._open_vectorstore()
+            self._upload_chunks(chunks, ids)
             
-            # 첫 번째 배치로 컬렉션 생성
-            logger.info(f"총 {total_chunks}개의 청크를 {batch_size}개씩 배치로 처리합니다...")
-            first_batch = chunks[:batch_size]
-            
-            self.vectorstore = Chroma.from_documents(
-                documents=first_batch,
-                embedding=self.embeddings,
-                client=self.client,
-                collection_name=self.collection_name
-            )
-            logger.info(f"✓ 배치 1/{(total_chunks + batch_size - 1) // batch_size} 완료 ({len(first_batch)}개 청크)")
-            
-            # 나머지 청크들을 배치로 추가
-            for i in range(batch_size, total_chunks, batch_size):
-                batch = chunks[i:i + batch_size]
-                batch_num = (i // batch_size) + 1
-                total_batches = (total_chunks + batch_size - 1) // batch_size
-                
-                # 텍스트와 메타데이터 추출
-                texts = [doc.page_content for doc in batch]
-                metadatas = [doc.metadata for doc in batch]
-                
-                # 배치 추가
-                self.vectorstore.add_texts(texts=texts, metadatas=metadatas)
-                logger.info(f"✓ 배치 {batch_num}/{total_batches} 완료 ({len(batch)}개 청크)")
-            
-            logger.info(f"벡터 스토어가 ChromaDB Cloud에 생성되었습니다 (총 {total_chunks}개 청크).")
+            logger.info(f"벡터 스토어가 ChromaDB Cloud에 생성되었습니다 (총 {len(chunks)}개 청크).")
+        elif self.vector_backend == "numpy":
+            # 로컬 NumPy 벡터 스토어 사용 - 배치 단위로 임베딩하여 추가
+            self.vectorstore = None
+            self._open_vectorstore()
+            with self._bulk_write():
+                self._upload_chunks(chunks, ids)
+            logger.info(f"벡터 스토어가 생성되었습니다 (NumPy): {self.persist_directory}")
         else:
             # 로컬 ChromaDB 사용
+            from langchain_community.vectorstores import Chroma
+            
             self.vectorstore = Chroma.from_documents(
                 documents=chunks,
                 embedding=self.embeddings,
+                ids=ids,
                 persist_directory=self.persist_directory,
                 collection_name=self.collection_name
             )
             logger.info(f"벡터 스토어가 생성되었습니다: {self.persist_directory}")
         
+        self._bump_index_version()
+        self._save_lexical_index()
+        self._log_embedding_cache_stats()
+        self._log_vector_memory()
+        
         return self.vectorstore
     
-    def load_vectorstore(self) -> Chroma:
+    def _log_embedding_cache_stats(self):
+        """임베딩 캐시 통계를 로그로 출력합니다."""
+        stats = self.get_embedding_cache_stats()
+        if stats is None:
+            return
+        
+        logger.info(
+            f"임베딩 캐시: 적중 {stats['hits']}개, 미스 {stats['misses']}개 "
+            f"(적중률 {stats['hit_rate']:.1%}), 항목 {stats['entries']}개, {stats['size_mb']:.1f}MB"
+        )
+    
+    def get_embedding_cache_stats(self) -> Optional[dict]:
+        """임베딩 캐시 통계를 반환합니다. (캐시 미사용 시 None)"""
+        if not self.embedding_cache:
+            return None
+        return self.embedding_cache.stats()
+    
+    def get_query_cache_stats(self) -> Optional[dict]:
+        """쿼리 임베딩 캐시 통계를 반환합니다. (캐시 미사용 시 None)"""
+        if not self.query_cache:
+            return None
+        return self.query_cache.stats()
+    
+    def create_vectorstore_from_stream(
+        self,
+        documents: Iterable[Document],
+        on_chunks: Optional[Callable[[List[Document]], None]] = None
+    ) -> VectorStore:
+        """
+        문서 스트림으로부터 벡터 스토어를 새로 생성합니다. (파일 → 텍스트 → 청크 → 임베딩 배치 → 저장)
+        
+        문서를 하나씩 받아 분할하고 토큰 기준 배치가 찰 때마다 업로드하므로, 파싱과 임베딩/업로드가
+        겹쳐 진행되고 전체 문서나 청크 목록을 메모리에 두지 않습니다.
+        (기존 데이터는 삭제하지 않으므로 호출 전에 비워 두어야 합니다.)
+        
+        Args:
+            documents: 문서 이터러블 (예: DocumentLoader.iter_documents())
+            on_chunks: 문서 하나의 청크가 만들어질 때마다 업로드 전에 호출할 함수 (리포트 기록용)
+        
+        Returns:
+            벡터 스토어
+        """
+        target = "ChromaDB Cloud" if self.use_cloud else f"{self.persist_directory} ({self.vector_backend})"
+        logger.info(f"문서를 스트리밍으로 분할/임베딩하여 저장합니다: {target}")
+        
+        self.vectorstore = None
+        self._open_vectorstore()
+        self.chunk_ids_by_source = {}
+        if self.lexical_index_path:
+            self.lexical_index = LexicalIndex()
+        
+        with self._bulk_write():
+            self._upload_batches(self._iter_upload_batches(
+                documents,
+                self.chunk_ids_by_source,
+                add_to_lexical_index=self.lexical_index is not None,
+                on_chunks=on_chunks
+            ))
+        
+        total_chunks = sum(len(ids) for ids in self.chunk_ids_by_source.values())
+        logger.info(f"벡터 스토어가 생성되었습니다 (문서 {len(self.chunk_ids_by_source)}개, 청크 {total_chunks}개).")
+        
+        self._bump_index_version()
+        self._save_lexical_index()
+        self._log_embedding_cache_stats()
+        self._log_vector_memory()
+        
+        return self.vectorstore
+    
+    def load_vectorstore(self) -> VectorStore:
         """
         기존 벡터 스토어를 로드합니다.
         
         Returns:
-            Chroma 벡터 스토어
+            벡터 스토어
         """
         if self.use_cloud:
             # ChromaDB Cloud에서 로드
             logger.info(f"ChromaDB Cloud에서 컬렉션을 로드합니다: {self.collection_name}")
-            self.vectorstore = Chroma(
-                client=self.client,
-                collection_name=self.collection_name,
-                embedding_function=self.embeddings
-            )
+            self.vectorstore = self._new_vectorstore()
             logger.info("ChromaDB Cloud에서 벡터 스토어를 로드했습니다.")
         else:
             # 로컬에서 로드
             if not os.path.exists(self.persist_directory):
                 raise ValueError(f"벡터 스토어가 존재하지 않습니다: {self.persist_directory}")
             
-            logger.info(f"벡터 스토어를 로드합니다: {self.persist_directory}")
-            self.vectorstore = Chroma(
+            logger.info(f"벡터 스토어를 로드합니다: {self.persist_directory} ({self.vector_backend})")
+            self.vectorstore = self._new_vectorstore()
+        
+        self._check_embedding_model()
+        self._ensure_lexical_index()
+        self._log_vector_memory()
+        
+        return self.vectorstore
+    
+    def check_index_compatibility(self):
+        """
+        기존 인덱스에 청크를 추가/삭제해도 되는지 확인합니다. (증분 인덱싱 전에 호출)
+        
+        임베딩 모델이나 청크 분할 설정이 인덱스를 만들 때와 다르면 ValueError를 발생시킵니다.
+        """
+        self._open_vectorstore()
+        self._check_embedding_model()
+        self._check_chunk_settings()
+    
+    def _check_chunk_settings(self):
+        """인덱스를 만든 청크 분할 설정과 현재 설정이 다르면 오류를 발생시킵니다."""
+        metadata = self._get_store_metadata()
+        current = self.get_chunk_settings()
+        indexed = {key: metadata.get(key) for key in current}
+        
+        if all(value is None for value in indexed.values()):
+            # 청크 설정을 기록하기 전에 만든 인덱스 (분할 방식을 알 수 없음)
+            if self._count_chunks():
+                logger.warning(
+                    "인덱스에 청크 분할 설정이 기록되어 있지 않습니다. 매니페스트에 있는 파일은 현재 설정으로 "
+                    "다시 인덱싱되지만, 그 외 청크는 이전 방식으로 남을 수 있으므로 인덱스를 다시 생성하는 것을 권장합니다."
+                )
+            return
+        
+        if indexed != current:
+            raise ValueError(
+                f"벡터 스토어가 다른 청크 분할 설정으로 생성되었습니다 (인덱스: {indexed}, 현재 설정: {current}). "
+                f"같은 설정(CHUNK_STRATEGY 등)을 사용하거나 인덱스를 다시 생성하세요."
+            )
+    
+    def _check_embedding_model(self):
+        """인덱스를 만든 임베딩 모델과 현재 설정이 다르면 오류를 발생시킵니다."""
+        indexed = self._get_store_metadata().get("embedding_model")
+        if indexed and indexed != self.embedding_id:
+            raise ValueError(
+                f"벡터 스토어가 다른 임베딩 모델로 생성되었습니다 (인덱스: {indexed}, 현재 설정: {self.embedding_id}). "
+                f"같은 모델을 설정하거나 인덱스를 다시 생성하세요."
+            )
+    
+    def _ensure_lexical_index(self) -> bool:
+        """
+        어휘 색인을 준비합니다.
+        
+        저장된 색인이 현재 인덱스 버전과 같으면 그대로 읽고, 없거나 오래되었으면
+        벡터 스토어에 저장된 청크로 다시 구성합니다. (임베딩 API 호출 없음)
+        
+        Returns:
+            어휘 색인 사용 가능 여부
+        """
+        if not self.lexical_index_path or self.vectorstore is None:
+            return False
+        
+        index_version = self.get_index_version()
+        if self.lexical_index is None:
+            self.lexical_index = LexicalIndex.load(self.lexical_index_path)
+        if self.lexical_index is not None and self.lexical_index.index_version == index_version:
+            return True
+        
+        try:
+            self.lexical_index = self._build_lexical_index_from_store()
+        except Exception as e:
+            logger.warning(f"어휘 색인을 구성할 수 없습니다: {e}")
+            self.lexical_index = None
+            return False
+        
+        self._save_lexical_index()
+        return True
+    
+    def _build_lexical_index_from_store(self, page_size: int = 1000) -> LexicalIndex:
+        """벡터 스토어에 저장된 청크로 어휘 색인을 구성합니다."""
+        logger.info("벡터 스토어의 청크로 어휘 색인을 구성하는 중...")
+        index = LexicalIndex()
+        
+        offset = 0
+        while True:
+            ids, texts, metadatas = self._get_stored_chunks(limit=page_size, offset=offset)
+            if not ids:
+                break
+            index.add(
+                ids,
+                [
+                    Document(page_content=text or "", metadata=metadata or {})
+                    for text, metadata in zip(texts, metadatas)
+                ]
+            )
+            offset += len(ids)
+        
+        logger.info(f"어휘 색인 구성 완료: {len(index)}개 청크")
+        return index
+    
+    def _save_lexical_index(self):
+        """어휘 색인을 현재 인덱스 버전과 함께 저장합니다."""
+        if not self.lexical_index_path or self.lexical_index is None:
+            return
+        
+        self.lexical_index.index_version = self.get_index_version()
+        try:
+            self.lexical_index.save(self.lexical_index_path)
+        except OSError as e:
+            logger.warning(f"어휘 색인 저장 실패: {e}")
+    
+    def has_lexical_index(self) -> bool:
+        """검색 가능한 어휘 색인이 있는지 여부를 반환합니다."""
+        return self.lexical_index is not None and len(self.lexical_index) > 0
+    
+    def lexical_search(
+        self,
+        query: str,
+        k: int = 4,
+        filter_dict: Optional[dict] = None
+    ) -> List[Tuple[Document, float, float]]:
+        """
+        어휘(BM25) 검색을 수행합니다. 네트워크 호출이 없습니다.
+        
+        Args:
+            query: 검색 쿼리
+            k: 반환할 문서 수
+            filter_dict: 메타데이터 필터
+        
+        Returns:
+            (문서, BM25 점수, 쿼리 용어 포함 비율) 튜플 리스트 (어휘 색인이 없으면 빈 리스트)
+        """
+        if not self.lexical_index:
+            return []
+        return self.lexical_index.search(query, k=k, filter_dict=filter_dict)
+    
+    def _new_vectorstore(self) -> VectorStore:
+        """설정에 맞는 벡터 스토어 객체를 생성합니다. (저장된 데이터가 있으면 연결)"""
+        if self.vector_backend == "numpy":
+            return FlatVectorStore(
                 persist_directory=self.persist_directory,
                 embedding_function=self.embeddings,
-                collection_name=self.collection_name
+                index_mode=self.vector_index,
+                index_options=self.vector_index_options
             )
         
+        # chromadb와 Chroma 래퍼는 로드 비용이 커서 Chroma 백엔드를 쓸 때만 로드
+        from langchain_community.vectorstores import Chroma
+        
+        if self.use_cloud:
+            return Chroma(
+                client=self.client,
+                collection_name=self.collection_name,
+                embedding_function=self.embeddings
+            )
+        
+        return Chroma(
+            persist_directory=self.persist_directory,
+            embedding_function=self.embeddings,
+            collection_name=self.collection_name
+        )
+    
+    def _open_vectorstore(self) -> VectorStore:
+        """벡터 스토어를 열거나, 없으면 빈 컬렉션을 생성합니다."""
+        if self.vectorstore is None:
+            self.vectorstore = self._new_vectorstore()
+        
         return self.vectorstore
     
-    def get_vectorstore(self) -> Optional[Chroma]:
+    def _bulk_write(self):
+        """numpy 백엔드는 블록 안의 배치 쓰기를 모아 한 번에 저장합니다. (Chroma는 그대로)"""
+        if isinstance(self.vectorstore, FlatVectorStore):
+            return self.vectorstore.bulk_write()
+        return nullcontext()
+    
+    def get_vector_memory_report(self) -> Optional[dict]:
+        """벡터 인덱스 메모리 사용량을 반환합니다. (numpy 백엔드가 아니면 None)"""
+        if not isinstance(self.vectorstore, FlatVectorStore):
+            return None
+        return self.vectorstore.memory_report()
+    
+    def _log_vector_memory(self):
+        """벡터 인덱스 메모리 사용량을 로그로 출력합니다."""
+        report = self.get_vector_memory_report()
+        if not report or not report["vectors"]:
+            return
+        
+        logger.info(
+            f"벡터 인덱스({report['index_mode']}): {report['vectors']}개 x {report['dim']}차원, "
+            f"상주 {report['resident_mb']:.1f}MB / 원본 {report['float32_mb']:.1f}MB "
+            f"({report['compression']:.1f}배 압축)"
+        )
+    
+    def _get_store_metadata(self) -> dict:
+        """벡터 스토어(컬렉션) 메타데이터를 반환합니다."""
+        if isinstance(self.vectorstore, FlatVectorStore):
+            return self.vectorstore.get_metadata()
+        return dict(self.vectorstore._collection.metadata or {})
+    
+    def _set_store_metadata(self, metadata: dict):
+        """벡터 스토어(컬렉션) 메타데이터를 교체합니다."""
+        if isinstance(self.vectorstore, FlatVectorStore):
+            self.vectorstore.set_metadata(metadata)
+            return
+        
+        # hnsw 설정 키는 수정할 수 없으므로 제외하고 나머지 메타데이터는 유지
+        self.vectorstore._collection.modify(metadata={
+            key: value for key, value in metadata.items()
+            if not key.startswith("hnsw:")
+        })
+    
+    def _count_chunks(self) -> int:
+        """저장된 청크 수를 반환합니다."""
+        if isinstance(self.vectorstore, FlatVectorStore):
+            return self.vectorstore.count()
+        return self.vectorstore._collection.count()
+    
+    def _get_stored_chunks(self, limit: int, offset: int = 0) -> Tuple[List[str], List[str], List[dict]]:
+        """저장된 청크를 순서대로 일부 반환합니다. (ID, 텍스트, 메타데이터)"""
+        if isinstance(self.vectorstore, FlatVectorStore):
+            return self.vectorstore.get_page(limit=limit, offset=offset)
+        
+        page = self.vectorstore._collection.get(include=["documents", "metadatas"], limit=limit, offset=offset)
+        return page["ids"], page["documents"], page["metadatas"]
+    
+    def add_documents(self, documents: Iterable[Document]) -> Dict[str, List[str]]:
+        """
+        문서를 청크로 분할하여 기존 벡터 스토어에 추가합니다. (증분 인덱싱용)
+        
+        문서를 하나씩 분할하여 배치가 찰 때마다 업로드하므로 제너레이터를 넘기면 파싱과 업로드가 겹칩니다.
+        
+        Args:
+            documents: 추가할 문서 이터러블
+        
+        Returns:
+            소스 파일별 추가된 청크 ID 딕셔너리
+        """
+        self.check_index_compatibility()
+        # 인덱스 버전이 바뀌기 전에 기존 어휘 색인을 읽어 둠
+        has_lexical_index = self._ensure_lexical_index()
+        
+        added: Dict[str, List[str]] = {}
+        with self._bulk_write():
+            self._upload_batches(self._iter_upload_batches(documents, added, add_to_lexical_index=has_lexical_index))
+        logger.info(f"{len(added)}개 문서에서 {sum(len(ids) for ids in added.values())}개의 청크를 추가했습니다.")
+        if not added:
+            return added
+        
+        self.chunk_ids_by_source.update(added)
+        self._bump_index_version()
+        
+        if has_lexical_index:
+            self._save_lexical_index()
+        
+        self._log_embedding_cache_stats()
+        
+        return added
+    
+    def _iter_upload_batches(
+        self,
+        documents: Iterable[Document],
+        ids_by_source: Dict[str, List[str]],
+        add_to_lexical_index: bool = False,
+        on_chunks: Optional[Callable[[List[Document]], None]] = None
+    ) -> Iterator[Tuple[List[Document], List[str], int]]:
+        """
+        문서를 하나씩 분할하여 토큰 기준 업로드 배치를 만드는 제너레이터
+        
+        Args:
+            documents: 문서 이터러블
+            ids_by_source: 소스 파일별 청크 ID를 기록할 딕셔너리
+            add_to_lexical_index: 청크를 어휘 색인에 추가할지 여부
+            on_chunks: 문서 하나의 청크가 만들어질 때마다 호출할 함수
+        
+        Yields:
+            (청크 리스트, ID 리스트, 토큰 수) 튜플
+        """
+        def chunk_stream() -> Iterator[Tuple[Document, str]]:
+            for document in documents:
+                chunks = self.split_documents([document])
+                if not chunks:
+                    continue
+                ids = self.make_chunk_ids(chunks)
+                ids_by_source.update(self._group_ids_by_source(chunks, ids))
+                if add_to_lexical_index:
+                    self.lexical_index.add(ids, chunks)
+                if on_chunks:
+                    on_chunks(chunks)
+                yield from zip(chunks, ids)
+        
+        return self._batch_by_tokens(chunk_stream())
+    
+    def _make_upload_batches(self, chunks: List[Document], ids: List[str]) -> List[Tuple[List[Document], List[str], int]]:
+        """
+        청크를 토큰 수 기준으로 배치로 묶습니다.
+        
+        Returns:
+            (청크 리스트, ID 리스트, 토큰 수) 튜플 리스트
+        """
+        return list(self._batch_by_tokens(zip(chunks, ids)))
+    
+    def _batch_by_tokens(self, chunk_ids: Iterable[Tuple[Document, str]]) -> Iterator[Tuple[List[Document], List[str], int]]:
+        """(청크, ID) 스트림을 upload_batch_tokens / upload_batch_max_size 기준 배치로 묶습니다."""
+        batch_chunks: List[Document] = []
+        batch_ids: List[str] = []
+        batch_tokens = 0
+        
+        for chunk, chunk_id in chunk_ids:
+            tokens = count_tokens(chunk.page_content, self.embedding_model)
+            if batch_chunks and (
+                batch_tokens + tokens > self.upload_batch_tokens
+                or len(batch_chunks) >= self.upload_batch_max_size
+            ):
+                yield batch_chunks, batch_ids, batch_tokens
+                batch_chunks, batch_ids, batch_tokens = [], [], 0
+            
+            batch_chunks.append(chunk)
+            batch_ids.append(chunk_id)
+            batch_tokens += tokens
+        
+        if batch_chunks:
+            yield batch_chunks, batch_ids, batch_tokens
+    
+    def _upload_batch(self, batch: List[Document], ids: List[str]):
+        """배치 하나를 임베딩하고 벡터 스토어에 저장합니다."""
+        self.vectorstore.add_texts(
+            texts=[doc.page_content for doc in batch],
+            metadatas=[doc.metadata for doc in batch],
+            ids=ids
+        )
+    
+    def _upload_chunks(self, chunks: List[Document], ids: List[str]):
+        """
+        청크를 토큰 기준 배치로 나누어 여러 배치를 동시에 업로드합니다.
+        
+        Args:
+            chunks: 청크 리스트
+            ids: 청크 ID 리스트
+        """
+        batches = self._make_upload_batches(chunks, ids)
+        total_tokens = sum(tokens for _, _, tokens in batches)
+        logger.info(
+            f"총 {len(chunks)}개의 청크({total_tokens:,} 토큰)를 {len(batches)}개 배치로 "
+            f"최대 {self.upload_concurrency}개씩 동시에 처리합니다..."
+        )
+        self._upload_batches(batches, total_chunks=len(chunks), total_batches=len(batches))
+    
+    def _upload_batches(
+        self,
+        batches: Iterable[Tuple[List[Document], List[str], int]],
+        total_chunks: Optional[int] = None,
+        total_batches: Optional[int] = None
+    ):
+        """
+        배치를 upload_concurrency개 스레드로 동시에 업로드합니다.
+        
+        배치마다 임베딩 요청과 저장이 순서대로 일어나므로, 여러 배치를 동시에 처리하면
+        한 배치의 임베딩과 다른 배치의 저장이 겹쳐 대기 시간이 줄어듭니다.
+        batches가 제너레이터이면 다음 배치를 만드는 작업(파싱, 분할)도 업로드와 겹쳐 진행되며,
+        대기 중인 배치는 upload_concurrency의 2배까지만 두어 메모리 사용량이 일정하게 유지됩니다.
+        
+        Args:
+            batches: (청크 리스트, ID 리스트, 토큰 수) 튜플 이터러블
+            total_chunks: 전체 청크 수 (진행률 표시용, 스트리밍이면 None)
+            total_batches: 전체 배치 수 (진행률 표시용, 스트리밍이면 None)
+        """
+        start = time.perf_counter()
+        done_batches = 0
+        done_chunks = 0
+        done_tokens = 0
+        max_pending = 2 * self.upload_concurrency
+        
+        def finish(future):
+            nonlocal done_batches, done_chunks, done_tokens
+            future.result()
+            batch_size, tokens = pending.pop(future)
+            done_batches += 1
+            done_chunks += batch_size
+            done_tokens += tokens
+            elapsed = time.perf_counter() - start
+            progress = f"{done_batches}/{total_batches}" if total_batches else f"{done_batches}"
+            percent = f"진행률 {done_chunks / total_chunks:.0%}, " if total_chunks else f"누적 {done_chunks}개 청크, "
+            logger.info(
+                f"✓ 배치 {progress} 완료 ({batch_size}개 청크, {tokens:,} 토큰) - {percent}"
+                f"{done_chunks / elapsed:.1f} 청크/초, {done_tokens / elapsed:,.0f} 토큰/초"
+            )
+        
+        pending: Dict[object, Tuple[int, int]] = {}
+        with ThreadPoolExecutor(max_workers=self.upload_concurrency) as executor:
+            try:
+                for batch, batch_ids, tokens in batches:
+                    while len(pending) >= max_pending:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            finish(future)
+                    pending[executor.submit(self._upload_batch, batch, batch_ids)] = (len(batch), tokens)
+                
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        finish(future)
+            except BaseException:
+                # 실패 시 아직 시작하지 않은 배치는 취소
+                for future in pending:
+                    future.cancel()
+                raise
+    
+    def delete_chunks(self, ids: List[str]):
+        """
+        청크 ID로 벡터 스토어에서 청크를 삭제합니다.
+        
+        Args:
+            ids: 삭제할 청크 ID 리스트
+        """
+        if not ids:
+            return
+        
+        vectorstore = self._open_vectorstore()
+        has_lexical_index = self._ensure_lexical_index()
+        vectorstore.delete(ids=ids)
+        self._bump_index_version()
+        
+        if has_lexical_index:
+            self.lexical_index.remove(ids)
+            self._save_lexical_index()
+        logger.info(f"{len(ids)}개의 청크를 삭제했습니다.")
+    
+    def _bump_index_version(self):
+        """
+        인덱스 내용이 바뀔 때마다 컬렉션 메타데이터에 새 버전을 기록합니다.
+        (답변 캐시 무효화에 사용, 임베딩 모델과 청크 분할 설정도 함께 기록)
+        """
+        metadata = self._get_store_metadata()
+        metadata["index_version"] = f"{int(time.time())}-{uuid.uuid4().hex[:8]}"
+        metadata["embedding_model"] = self.embedding_id
+        metadata.update(self.get_chunk_settings())
+        self._set_store_metadata(metadata)
+    
+    def get_index_version(self, refresh: bool = False) -> str:
+        """
+        현재 인덱스 버전을 반환합니다.
+    
+        버전이 기록되지 않은 기존 컬렉션은 청크 수로 대신합니다.
+    
+        Args:
+            refresh: 저장소에서 메타데이터를 다시 읽을지 여부
+                (다른 프로세스의 재인덱싱/업로드를 확인할 때 사용)
+        """
+        if self.vectorstore is None:
+            raise ValueError("벡터 스토어가 초기화되지 않았습니다.")
+    
+        metadata = self._read_store_metadata() if refresh else self._get_store_metadata()
+        version = metadata.get("index_version")
+        return version or f"count-{self._count_chunks()}"
+    
+    def _read_store_metadata(self) -> dict:
+        """저장소에서 벡터 스토어(컬렉션) 메타데이터를 다시 읽습니다."""
+        if isinstance(self.vectorstore, FlatVectorStore):
+            return self.vectorstore.read_stored_metadata()
+    
+        collection = self.vectorstore._client.get_collection(name=self.vectorstore._collection.name)
+        return dict(collection.metadata or {})
+    
+    def get_vectorstore(self) -> Optional[VectorStore]:
         """현재 벡터 스토어를 반환합니다."""
         return self.vectorstore
     
@@ -208,7 +958,7 @@ class VectorStoreManager:
         Returns:
             (문서, 유사도 점수) 튜플 리스트
         """
-        if not self.vectorstore:
+        if self.vectorstore is None:
             raise ValueError("벡터 스토어가 초기화되지 않았습니다.")
         
         # 유사도 점수와 함께 검색
@@ -220,6 +970,72 @@ class VectorStoreManager:
         
         return results
     
+    def embed_query(self, query: str) -> List[float]:
+        """쿼리 임베딩을 생성합니다. (쿼리 캐시 적중 시 API 호출 없음)"""
+        return self.embeddings.embed_query(query)
+    
+    async def aembed_query(self, query: str) -> List[float]:
+        """쿼리 임베딩을 비동기로 생성합니다. (쿼리 캐시 적중 시 API 호출 없음)"""
+        return await self.embeddings.aembed_query(query)
+    
+    def similarity_search_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter_dict: Optional[dict] = None
+    ) -> List[tuple]:
+        """
+        미리 계산한 쿼리 임베딩으로 유사도 검색을 수행합니다.
+        
+        Args:
+            embedding: 쿼리 임베딩
+            k: 반환할 문서 수
+            filter_dict: 메타데이터 필터
+        
+        Returns:
+            (문서, 유사도 점수) 튜플 리스트
+        """
+        if self.vectorstore is None:
+            raise ValueError("벡터 스토어가 초기화되지 않았습니다.")
+        
+        return self.vectorstore.similarity_search_by_vector_with_relevance_scores(
+            embedding=embedding,
+            k=k,
+            filter=filter_dict
+        )
+    
+    async def asimilarity_search(
+        self,
+        query: str,
+        k: int = 4,
+        filter_dict: Optional[dict] = None
+    ) -> List[tuple]:
+        """
+        유사도 검색을 비동기로 수행합니다.
+        
+        쿼리 임베딩은 비동기 OpenAI 클라이언트로 요청하고, 벡터 검색은 이벤트 루프를
+        막지 않도록 스레드에서 실행합니다.
+        
+        Args:
+            query: 검색 쿼리
+            k: 반환할 문서 수
+            filter_dict: 메타데이터 필터
+        
+        Returns:
+            (문서, 유사도 점수) 튜플 리스트
+        """
+        if self.vectorstore is None:
+            raise ValueError("벡터 스토어가 초기화되지 않았습니다.")
+        
+        embedding = await self.aembed_query(query)
+        
+        return await asyncio.to_thread(
+            self.vectorstore.similarity_search_by_vector_with_relevance_scores,
+            embedding=embedding,
+            k=k,
+            filter=filter_dict
+        )
+    
     def get_retriever(self, search_kwargs: Optional[dict] = None):
         """
         Retriever 객체를 반환합니다.
@@ -230,7 +1046,7 @@ class VectorStoreManager:
         Returns:
             VectorStoreRetriever
         """
-        if not self.vectorstore:
+        if self.vectorstore is None:
             raise ValueError("벡터 스토어가 초기화되지 않았습니다.")
         
         if search_kwargs is None:
@@ -246,6 +1062,9 @@ class VectorStoreManager:
                 self.client.delete_collection(name=self.collection_name)
                 logger.info(f"ChromaDB Cloud 컬렉션이 삭제되었습니다: {self.collection_name}")
                 self.vectorstore = None
+                self.lexical_index = None
+                if self.lexical_index_path and os.path.exists(self.lexical_index_path):
+                    os.remove(self.lexical_index_path)
             except Exception as e:
                 logger.warning(f"컬렉션 삭제 실패: {e}")
         else:
@@ -256,6 +1075,7 @@ class VectorStoreManager:
                 shutil.rmtree(self.persist_directory)
                 logger.info(f"벡터 스토어가 삭제되었습니다: {self.persist_directory}")
                 self.vectorstore = None
+                self.lexical_index = None
             else:
                 logger.warning("삭제할 벡터 스토어가 없습니다.")
 
@@ -2,12 +2,16 @@
 
 import os
 import sys
+import argparse
 from pathlib import Path
+import time
 import logging
 from dotenv import load_dotenv
 
 from src.document_loader import DocumentLoader
 from src.vector_store import VectorStoreManager
+from src.indexer import IndexManifest, full_index, incremental_index
+from src.indexing_report import IndexingReport, create_dry_run_manager, dry_run
 
 # 로깅 설정
 logging.basicConfig(
@@ -16,9 +20,93 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 파싱 결과 캐시 경로 (청크/임베딩 설정을 바꿔도 원본 문서를 다시 파싱하지 않음)
+PARSE_CACHE_DIR = "./.parse_cache"
+
+# 청크 최대 토큰 수 (regulation 분할 방식, CHUNK_STRATEGY=recursive면 1000자 단위)
+CHUNK_TOKENS = 1000
+
+
+def parse_args():
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="ChromaDB Cloud 문서 업로드")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="추가/변경/삭제된 문서만 컬렉션에 반영합니다"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="문서 파싱 병렬 프로세스 수 (기본: CPU 코어 수)"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="API를 호출하지 않고 파싱/분할만 하여 토큰 수, 예상 비용, 예상 소요 시간을 출력합니다"
+    )
+    parser.add_argument(
+        "--report",
+        nargs="?",
+        const="./indexing_report.json",
+        help="파일별 파싱 시간, 글자 수, 청크 수, 토큰 수, 최대 메모리를 JSON 리포트로 저장합니다 "
+             "(경로 생략 시 ./indexing_report.json)"
+    )
+    parser.add_argument(
+        "--no-parse-cache",
+        action="store_true",
+        help="파싱 캐시를 사용하지 않습니다 (리포트에 실제 파싱 시간을 기록할 때)"
+    )
+    parser.add_argument(
+        "--tokens-per-second",
+        type=float,
+        help="--dry-run 시간 추정에 사용할 임베딩 요청당 처리 속도 (토큰/초)"
+    )
+    return parser.parse_args()
+
+
+def get_manifest_path(collection_name: str) -> str:
+    """컬렉션별 인덱싱 매니페스트 경로"""
+    return f"./index_manifest_{collection_name}.json"
+
+
+def get_parse_cache_dir(args) -> str:
+    """파싱 캐시 경로 (--no-parse-cache면 None)"""
+    return None if args.no_parse_cache else PARSE_CACHE_DIR
+
+
+def run_dry_run(reference_dir: Path, args):
+    """API 호출 없이 토큰 수, 예상 비용, 예상 소요 시간 계산"""
+    print()
+    print("-" * 70)
+    print("드라이 런: 파싱/분할만 수행 (임베딩 API와 ChromaDB Cloud를 사용하지 않음)")
+    print("-" * 70)
+    
+    try:
+        loader = DocumentLoader(str(reference_dir), max_workers=args.workers, cache_dir=get_parse_cache_dir(args))
+        vs_manager = create_dry_run_manager(
+            chunk_overlap_percent=10.0,
+            chunk_strategy=os.getenv("CHUNK_STRATEGY", "regulation"),
+            chunk_tokens=CHUNK_TOKENS,
+            embedding_cache_path="./embedding_cache.db"
+        )
+        
+        report = dry_run(loader, vs_manager, tokens_per_second=args.tokens_per_second)
+        report.print_summary()
+        if args.report:
+            report.save(args.report)
+        report.stop()
+        
+    except Exception as e:
+        logger.error(f"❌ 드라이 런 중 오류 발생: {e}")
+        sys.exit(1)
+
 
 def main():
     """메인 함수"""
+    args = parse_args()
+    
     print("=" * 70)
     print("ChromaDB Cloud 문서 업로드 스크립트")
     print("=" * 70)
@@ -27,6 +115,15 @@ def main():
     # 환경 변수 로드
     load_dotenv()
     
+    # 드라이 런은 API 키와 ChromaDB Cloud 연결 없이 실행
+    if args.dry_run:
+        reference_dir = Path("./reference")
+        if not reference_dir.exists():
+            logger.error(f"❌ {reference_dir} 폴더가 존재하지 않습니다.")
+            sys.exit(1)
+        run_dry_run(reference_dir, args)
+        return
+    
     # API 키 확인
     openai_key = os.getenv("OPENAI_API_KEY")
     chroma_key = os.getenv("CHROMA_API_KEY")
@@ -34,7 +131,8 @@ def main():
     chroma_database = os.getenv("CHROMA_DATABASE")
     chroma_collection = os.getenv("CHROMA_COLLECTION", "niceinfo-rules")
     
-    if not openai_key:
+    # 로컬 임베딩을 사용하면 업로드에는 OpenAI API 키가 필요 없음
+    if os.getenv("EMBEDDING_PROVIDER", "openai") == "openai" and not openai_key:
         logger.error("❌ OPENAI_API_KEY가 설정되지 않았습니다.")
         logger.error("   .env 파일을 확인하세요.")
         sys.exit(1)
@@ -68,55 +166,68 @@ def main():
         logger.info("작업이 취소되었습니다.")
         sys.exit(0)
     
-    print()
-    print("-" * 70)
-    print("1단계: 문서 로딩")
-    print("-" * 70)
-    
-    try:
-        # 문서 로더 초기화
-        loader = DocumentLoader(str(reference_dir))
-        
-        # 문서 로드 (ZIP 파일 자동 제외)
-        logger.info("문서를 로드하는 중... (ZIP 파일은 자동으로 제외됩니다)")
-        documents = loader.load_documents()
+    if args.incremental:
+        if args.report:
+            logger.warning("--report는 전체 업로드와 --dry-run에서만 기록됩니다.")
+        print()
+        print("-" * 70)
+        print("증분 업로드: 변경된 문서만 반영")
+        print("-" * 70)
         
-        if not documents:
-            logger.error("❌ 로드된 문서가 없습니다.")
+        try:
+            vs_manager = VectorStoreManager(
+                chunk_strategy=os.getenv("CHUNK_STRATEGY", "regulation"),
+                chunk_tokens=CHUNK_TOKENS,
+                chunk_overlap_percent=10.0,
+                use_cloud=True,
+                cloud_api_key=chroma_key,
+                cloud_tenant=chroma_tenant,
+                cloud_database=chroma_database,
+                collection_name=chroma_collection,
+                embedding_cache_path="./embedding_cache.db"
+            )
+            manifest = IndexManifest(get_manifest_path(chroma_collection))
+            
+            summary = incremental_index(
+                DocumentLoader(str(reference_dir), max_workers=args.workers, cache_dir=get_parse_cache_dir(args)),
+                vs_manager,
+                manifest
+            )
+            
+            print(f"\n  - 추가된 파일: {summary['added']}개")
+            print(f"  - 변경된 파일: {summary['changed']}개")
+            print(f"  - 삭제된 파일: {summary['deleted']}개")
+            print(f"  - 변경 없는 파일: {summary['unchanged']}개")
+            print(f"  - 청크: +{summary['chunks_added']} / -{summary['chunks_deleted']}")
+            
+            logger.info("✓ 증분 업로드 완료!")
+            
+        except Exception as e:
+            logger.error(f"❌ 증분 업로드 중 오류 발생: {e}")
+            import traceback
+            traceback.print_exc()
             sys.exit(1)
         
-        logger.info(f"✓ 총 {len(documents)}개의 문서가 로드되었습니다.")
-        
-        # 카테고리별 통계
-        categories = {}
-        for doc in documents:
-            category = doc.metadata.get('category', '기타')
-            categories[category] = categories.get(category, 0) + 1
-        
-        print("\n[통계] 카테고리별 문서 수:")
-        for category, count in sorted(categories.items()):
-            print(f"  - {category}: {count}개")
-        
-    except Exception as e:
-        logger.error(f"❌ 문서 로딩 중 오류 발생: {e}")
-        sys.exit(1)
+        return
     
     print()
     print("-" * 70)
-    print("2단계: ChromaDB Cloud에 업로드")
+    print("1단계: ChromaDB Cloud 연결")
     print("-" * 70)
     
     try:
         # 벡터 스토어 관리자 초기화
         logger.info("ChromaDB Cloud 연결 중...")
         vs_manager = VectorStoreManager(
-            chunk_size=1500,  # 더 큰 청크로 변경 (1000 -> 1500)
+            chunk_strategy=os.getenv("CHUNK_STRATEGY", "regulation"),
+            chunk_tokens=CHUNK_TOKENS,
             chunk_overlap_percent=10.0,  # 더 많은 오버랩 (4% -> 10%)
             use_cloud=True,
             cloud_api_key=chroma_key,
             cloud_tenant=chroma_tenant,
             cloud_database=chroma_database,
-            collection_name=chroma_collection
+            collection_name=chroma_collection,
+            embedding_cache_path="./embedding_cache.db"  # 변경 없는 청크는 재임베딩하지 않음
         )
         
         logger.info("✓ ChromaDB Cloud 연결 완료")
@@ -135,20 +246,62 @@ def main():
             except Exception as e:
                 logger.warning(f"컬렉션 삭제 시 오류 (무시됨): {e}")
         
-        print()
-        # 벡터 스토어 생성 및 업로드
-        logger.info("벡터 임베딩 생성 및 ChromaDB Cloud에 업로드 중...")
-        logger.info("📝 청크 설정: 크기=1500자, 오버랩=150자 (10%)")
+    except Exception as e:
+        logger.error(f"❌ ChromaDB Cloud 연결 중 오류 발생: {e}")
+        sys.exit(1)
+    
+    print()
+    print("-" * 70)
+    print("2단계: 문서 로딩 및 ChromaDB Cloud에 업로드 (스트리밍)")
+    print("-" * 70)
+    
+    # 인덱싱 리포트 (파일별 파싱 시간/청크/토큰, 최대 메모리)
+    report = IndexingReport() if args.report else None
+    if report:
+        report.start()
+    
+    try:
+        # 문서 로더 초기화
+        loader = DocumentLoader(str(reference_dir), max_workers=args.workers, cache_dir=get_parse_cache_dir(args))
+        file_paths = loader.find_documents()
+        
+        # 파싱되는 문서를 바로 분할/임베딩하여 업로드 (ZIP 파일 자동 제외)
+        logger.info("문서를 로드하면서 벡터 임베딩 생성 및 ChromaDB Cloud에 업로드 중...")
+        chunk_settings = vs_manager.get_chunk_settings()
+        unit = "토큰" if chunk_settings["chunk_strategy"] == "regulation" else "자"
+        logger.info(
+            f"📝 청크 설정: 방식={chunk_settings['chunk_strategy']}, "
+            f"크기={chunk_settings['chunk_size']}{unit}, 오버랩={chunk_settings['chunk_overlap']}{unit}"
+        )
         logger.info("⏳ 이 작업은 문서 크기에 따라 수 분이 걸릴 수 있습니다...")
         print()
         
-        vectorstore = vs_manager.create_vectorstore(
-            documents, 
-            force_recreate=force_recreate
-        )
+        # 다음 증분 업로드를 위한 매니페스트 기록
+        # (기존 컬렉션을 유지한 경우 청크 구성을 알 수 없으므로 기록하지 않음)
+        manifest = IndexManifest(get_manifest_path(chroma_collection)) if force_recreate else None
+        
+        start = time.perf_counter()
+        stats = full_index(loader, vs_manager, file_paths, manifest=manifest, report=report)
+        
+        if not stats["documents"]:
+            logger.error("❌ 로드된 문서가 없습니다.")
+            sys.exit(1)
+        
+        logger.info(f"✓ 총 {stats['documents']}개의 문서, {stats['chunks']}개의 청크를 업로드했습니다.")
+        
+        # 카테고리별 통계
+        print("\n[통계] 카테고리별 문서 수:")
+        for category, count in sorted(stats["categories"].items()):
+            print(f"  - {category}: {count}개")
         
         logger.info("✓ ChromaDB Cloud에 업로드 완료!")
         
+        if report:
+            report.record_stage("parse_split_embed_upload", time.perf_counter() - start)
+            report.print_summary()
+            report.save(args.report)
+            report.stop()
+        
     except Exception as e:
         logger.error(f"❌ ChromaDB Cloud 업로드 중 오류 발생: {e}")
         import traceback